@@ -0,0 +1,56 @@
+"""Group balance ledger
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create group_balances table
+    op.create_table(
+        'group_balances',
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('currency_code', sa.String(length=3), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('balance_cents', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['currency_code'], ['currencies.code'], ),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('group_id', 'currency_code', 'user_id')
+    )
+
+    # Backfill the ledger from existing expenses and settlements
+    op.execute(
+        """
+        INSERT INTO group_balances (group_id, currency_code, user_id, balance_cents)
+        SELECT group_id, currency_code, user_id, SUM(delta)
+        FROM (
+            SELECT e.group_id, e.currency_code, e.payer_user_id AS user_id, e.amount_cents AS delta
+            FROM expenses e
+            WHERE e.group_id IS NOT NULL AND e.deleted_at IS NULL
+            UNION ALL
+            SELECT e.group_id, e.currency_code, s.user_id, -s.amount_cents
+            FROM expense_splits s JOIN expenses e ON e.id = s.expense_id
+            WHERE e.group_id IS NOT NULL AND e.deleted_at IS NULL
+            UNION ALL
+            SELECT group_id, currency_code, from_user_id, amount_cents FROM settlements
+            UNION ALL
+            SELECT group_id, currency_code, to_user_id, -amount_cents FROM settlements
+        ) deltas
+        GROUP BY group_id, currency_code, user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('group_balances')
@@ -0,0 +1,35 @@
+"""Balance checkpoints
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create balance_checkpoints table
+    op.create_table(
+        'balance_checkpoints',
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('period_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('currency_code', sa.String(length=3), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('balance_cents', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['currency_code'], ['currencies.code'], ),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('group_id', 'period_start', 'currency_code', 'user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('balance_checkpoints')
@@ -0,0 +1,33 @@
+"""FX rates
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create fx_rates table
+    op.create_table(
+        'fx_rates',
+        sa.Column('base_code', sa.String(length=3), nullable=False),
+        sa.Column('quote_code', sa.String(length=3), nullable=False),
+        sa.Column('effective_date', sa.Date(), nullable=False),
+        sa.Column('rate', sa.Numeric(precision=20, scale=10), nullable=False),
+        sa.ForeignKeyConstraint(['base_code'], ['currencies.code'], ),
+        sa.ForeignKeyConstraint(['quote_code'], ['currencies.code'], ),
+        sa.PrimaryKeyConstraint('base_code', 'quote_code', 'effective_date')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('fx_rates')
@@ -0,0 +1,47 @@
+"""Hot path indexes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    # Live expense listing (keyset on occurred_at, id) and balance windows
+    ('ix_expenses_group_id_occurred_at', 'expenses',
+     ['group_id', sa.text('occurred_at DESC'), sa.text('id DESC')], sa.text('deleted_at IS NULL')),
+    ('ix_expense_splits_expense_id', 'expense_splits', ['expense_id'], None),
+    ('ix_expense_splits_item_id', 'expense_splits', ['item_id'], sa.text('item_id IS NOT NULL')),
+    ('ix_expense_items_expense_id', 'expense_items', ['expense_id'], None),
+    ('ix_group_members_group_id_user_id', 'group_members', ['group_id', 'user_id'], None),
+    ('ix_group_members_user_id', 'group_members', ['user_id'], None),
+    ('ix_settlements_group_id_created_at', 'settlements', ['group_id', 'created_at'], None),
+    # Activity feed (keyset on created_at, id)
+    ('ix_activity_events_group_id_created_at', 'activity_events',
+     ['group_id', sa.text('created_at DESC'), sa.text('id DESC')], None),
+]
+
+
+def upgrade() -> None:
+    # Build concurrently so writes to these tables are not blocked on large databases
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_where=where, postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,30 @@
+"""Partitioned expenses, expense splits and activity events
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+from app.infrastructure.db import partitioning
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Copies every row under lock; on large databases run scripts/partition_tables.py
+    # first, in a maintenance window, and this becomes a no-op
+    conn = op.get_bind()
+    partitioning.partition_expense_tables(conn)
+    partitioning.partition_activity_events(conn)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    partitioning.unpartition_activity_events(conn)
+    partitioning.unpartition_expense_tables(conn)
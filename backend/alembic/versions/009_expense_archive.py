@@ -0,0 +1,52 @@
+"""expense archive
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create archived_expenses table
+    op.create_table(
+        'archived_expenses',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('payer_user_id', sa.Integer(), nullable=False),
+        sa.Column('amount_cents', sa.BigInteger(), nullable=False),
+        sa.Column('currency_code', sa.String(length=3), nullable=False),
+        sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ),
+        sa.ForeignKeyConstraint(['payer_user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['currency_code'], ['currencies.code'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_archived_expenses_group_id_occurred_at', 'archived_expenses',
+        ['group_id', sa.text('occurred_at DESC'), sa.text('id DESC')], unique=False,
+    )
+    # Soft-deleted expenses waiting to be archived. Partitioned tables cannot
+    # be indexed concurrently; the index only covers deleted rows, so it is small
+    op.create_index(
+        'ix_expenses_deleted_at', 'expenses', ['deleted_at'], unique=False,
+        postgresql_where=sa.text('deleted_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_expenses_deleted_at', table_name='expenses')
+    op.drop_index('ix_archived_expenses_group_id_occurred_at', table_name='archived_expenses')
+    op.drop_table('archived_expenses')
@@ -0,0 +1,48 @@
+"""activity outbox
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create outbox_events table; the activityeventtype enum already exists
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('group_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column(
+            'type',
+            postgresql.ENUM(
+                'EXPENSE_CREATED', 'EXPENSE_UPDATED', 'EXPENSE_DELETED', 'SETTLEMENT_CREATED',
+                'USER_JOINED', 'USER_LEFT', name='activityeventtype', create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    # Deliver whatever the worker has not yet, so no activity is lost
+    op.execute(
+        "INSERT INTO activity_events (group_id, user_id, type, payload, created_at) "
+        "SELECT group_id, user_id, type, payload, created_at FROM outbox_events ORDER BY id"
+    )
+    op.drop_table('outbox_events')
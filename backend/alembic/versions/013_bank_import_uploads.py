@@ -0,0 +1,30 @@
+"""bank import uploads
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Where a pending import's upload is spooled, so any process can claim it
+    op.add_column('bank_imports', sa.Column('upload_path', sa.String(length=1024), nullable=True))
+    # Imports left pending by a process that stopped before running them
+    op.create_index(
+        'ix_bank_imports_pending_created_at', 'bank_imports', ['created_at'], unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bank_imports_pending_created_at', table_name='bank_imports')
+    op.drop_column('bank_imports', 'upload_path')
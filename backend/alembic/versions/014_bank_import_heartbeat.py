@@ -0,0 +1,32 @@
+"""bank import heartbeat
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # When the runner of an import last claimed it or committed a chunk
+    op.add_column('bank_imports', sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True))
+    # Imports already running have no heartbeat; let the sweep reclaim them
+    op.execute("UPDATE bank_imports SET claimed_at = created_at WHERE status = 'RUNNING'")
+    # Imports whose runner stopped mid-way
+    op.create_index(
+        'ix_bank_imports_running_claimed_at', 'bank_imports', ['claimed_at'], unique=False,
+        postgresql_where=sa.text("status = 'RUNNING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bank_imports_running_claimed_at', table_name='bank_imports')
+    op.drop_column('bank_imports', 'claimed_at')
@@ -0,0 +1,24 @@
+"""activity sync cursor
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A group's activity after an event id (sync and stream resume), in every month's
+    # partition; partitioned tables cannot be indexed concurrently
+    op.create_index('ix_activity_events_group_id_id', 'activity_events', ['group_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_activity_events_group_id_id', table_name='activity_events')
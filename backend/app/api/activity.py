@@ -1,33 +1,128 @@
 """
 Activity feed API routes.
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
-from sqlalchemy.orm import Session
+import asyncio
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Path, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
-from app.core.database import get_db
-from app.api.dependencies import get_current_user
-from app.api.schemas import ActivityEventResponse
-from app.infrastructure.db.models import User
-from app.infrastructure.repositories.activity_repository import ActivityRepository
-from app.infrastructure.repositories.group_repository import GroupRepository
+from app.api.dependencies import Principal, get_current_principal, get_read_db, group_etag
+from app.api.schemas import ActivityEventResponse, ActivityPageResponse, GroupStreamEvent
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.pagination import decode_cursor, paginate
+from app.core.pubsub import OVERFLOW, Subscription, group_events
+from app.infrastructure.repositories.activity_repository import AsyncActivityRepository
+from app.infrastructure.repositories.group_repository import AsyncGroupRepository
 
 router = APIRouter()
 
 
-@router.get("/{group_id}/activity", response_model=List[ActivityEventResponse])
+@router.get("/{group_id}/activity", response_model=ActivityPageResponse, dependencies=[Depends(group_etag)])
 async def get_group_activity(
     group_id: int = Path(...),
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get paginated activity feed for a group."""
-    group_repo = GroupRepository(db)
-    if not group_repo.is_member(group_id, current_user.id):
+    """Get a page of the activity feed for a group, newest first. Membership is checked by group_etag."""
+    try:
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    activity_repo = AsyncActivityRepository(db)
+    events = await activity_repo.get_group_activity(group_id, limit + 1, before)
+    events, next_cursor = paginate(events, limit, lambda e: (e.created_at, e.id))
+    return ActivityPageResponse(
+        items=[ActivityEventResponse.model_validate(e) for e in events],
+        next_cursor=next_cursor,
+    )
+
+
+def _sse_activity(event: Row) -> str:
+    return f"id: {event.id}\nevent: activity\ndata: {GroupStreamEvent.model_validate(event).model_dump_json()}\n\n"
+
+
+async def _group_stream(
+    subscription: Subscription, missed: Optional[List[Row]], last_event_id: Optional[int]
+) -> AsyncIterator[str]:
+    """Replay missed events, then relay live ones with heartbeats until the client leaves or falls behind."""
+    if missed is not None and len(missed) > settings.STREAM_RESUME_LIMIT:
+        # Too much was missed to replay: the client refetches the feed and balances
+        yield "event: resync\ndata: {}\n\n"
+        last_event_id = None
+    elif missed:
+        for event in missed:
+            yield _sse_activity(event)
+        last_event_id = missed[-1].id
+
+    while True:
+        try:
+            event = await asyncio.wait_for(subscription.get(), settings.STREAM_HEARTBEAT_SECONDS)
+        except asyncio.TimeoutError:
+            yield ": heartbeat\n\n"
+            continue
+        if event is OVERFLOW:
+            # Ending the stream makes the client reconnect with Last-Event-ID and replay from the database
+            return
+        if last_event_id is not None and event.id <= last_event_id:
+            continue  # Already replayed
+        yield _sse_activity(event)
+
+
+@router.get("/{group_id}/stream")
+async def stream_group_events(
+    request: Request,
+    group_id: int = Path(...),
+    last_event_id: Optional[int] = Query(
+        None, description="Resume after this event id; the Last-Event-ID header is used when absent"
+    ),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Server-sent events for a group, replacing polling of /activity and /balances.
+
+    Each new activity event is sent as an `activity` event whose id is the
+    activity event id; clients refetch balances when one arrives. A `resync`
+    event means too much was missed to replay, so the client refetches
+    everything. Comment lines are sent as heartbeats while idle. Reconnecting
+    with Last-Event-ID (or ?last_event_id=) replays what was missed.
+    """
+    group_repo = AsyncGroupRepository(db)
+    if not await group_repo.is_member(group_id, current_user.id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
 
-    activity_repo = ActivityRepository(db)
-    events = activity_repo.get_group_activity(group_id, limit, offset)
-    return [ActivityEventResponse.model_validate(e) for e in events]
+    if last_event_id is None and request.headers.get("last-event-id"):
+        try:
+            last_event_id = int(request.headers["last-event-id"])
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Last-Event-ID")
+
+    # Subscribe before reading missed events, so none can fall between the two. They are
+    # read from the primary: a lagging replica could lack events published before subscribing
+    subscription = group_events.subscribe(group_id)
+    try:
+        missed = None
+        if last_event_id is not None:
+            activity_repo = AsyncActivityRepository(db)
+            missed = await activity_repo.get_events_after(
+                group_id, last_event_id, settings.STREAM_RESUME_LIMIT + 1
+            )
+        # Streams are long-lived: hand the connection back to the pool now
+        await db.close()
+    except BaseException:
+        group_events.unsubscribe(subscription)
+        raise
+
+    return StreamingResponse(
+        _group_stream(subscription, missed, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(group_events.unsubscribe, subscription),
+    )
@@ -12,8 +12,8 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserRegister, db: Session = Depends(get_db)):
-    """Register a new user."""
+def register(user_data: UserRegister, db: Session = Depends(get_db)):
+    """Register a new user. A plain def, so password hashing runs in the threadpool."""
     auth_service = AuthService(db)
     try:
         user, token = auth_service.register(
@@ -32,8 +32,8 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=AuthResponse)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
-    """Login and get JWT token."""
+def login(credentials: UserLogin, db: Session = Depends(get_db)):
+    """Login and get JWT token. A plain def, so password hashing runs in the threadpool."""
     auth_service = AuthService(db)
     result = auth_service.login(email=credentials.email, password=credentials.password)
     if result is None:
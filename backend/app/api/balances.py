@@ -1,28 +1,56 @@
 """
 Balance API routes.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Path
+from typing import Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.dependencies import get_current_user
-from app.api.schemas import BalanceResponse
-from app.infrastructure.db.models import User
+from app.api.dependencies import Principal, get_current_principal, get_read_db, group_etag
+from app.api.schemas import BalanceResponse, SettlePlanResponse
 from app.application.balance_service import BalanceServiceApp
 
 router = APIRouter()
 
 
-@router.get("/{group_id}/balances", response_model=BalanceResponse)
+@router.get("/{group_id}/balances", response_model=BalanceResponse, dependencies=[Depends(group_etag)])
 async def get_group_balances(
     group_id: int = Path(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    as_of: Optional[datetime] = Query(None),
+    convert: bool = Query(False, description="Convert all balances into the group's default currency"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get balances for all users in a group."""
-    balance_service = BalanceServiceApp(db)
-    try:
-        result = balance_service.get_group_balances(group_id, current_user.id)
+    """Get balances for all users in a group, optionally as of a past point in time."""
+    user_id = current_user.id
+
+    def get(session: Session) -> BalanceResponse:
+        result = BalanceServiceApp(session).get_group_balances(group_id, user_id, as_of, convert)
         return BalanceResponse(**result)
+
+    try:
+        return await db.run_sync(get)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get("/{group_id}/settle-plan", response_model=SettlePlanResponse)
+async def get_settle_plan(
+    group_id: int = Path(...),
+    as_of: Optional[datetime] = Query(None),
+    convert: bool = Query(False, description="Settle everything in the group's default currency"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get a minimal list of transfers that settles up the group, optionally as of a past time."""
+    user_id = current_user.id
+
+    def get(session: Session) -> SettlePlanResponse:
+        result = BalanceServiceApp(session).get_settle_plan(group_id, user_id, as_of, convert)
+        return SettlePlanResponse(**result)
+
+    try:
+        return await db.run_sync(get)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -1,24 +1,37 @@
 """
 FastAPI dependencies for authentication and database access.
 """
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+import hmac
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+from fastapi import Depends, Header, HTTPException, Path, Query, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_async_db, open_read_session, record_write
 from app.core.security import decode_access_token
-from app.infrastructure.repositories.user_repository import UserRepository
-from app.infrastructure.db.models import User
+from app.infrastructure.repositories.group_repository import AsyncGroupRepository
+from app.infrastructure.repositories.views import UserView
+from app.infrastructure.repositories.user_repository import AsyncUserRepository
 
 security = HTTPBearer()
 
+# Methods that never write; any other authenticated request opens the read-your-writes window
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 
-def get_current_user(
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The authenticated caller, built from the JWT claims alone."""
+    id: int
+    email: Optional[str] = None
+
+
+def get_principal(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    """Dependency to get current authenticated user."""
+) -> Principal:
+    """Dependency to get the caller from the bearer token, without a database lookup."""
     token = credentials.credentials
     payload = decode_access_token(token)
     if payload is None:
@@ -36,8 +49,46 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_id(int(user_id))
+    return Principal(id=int(user_id), email=payload.get("email"))
+
+
+def get_token_user_id(principal: Principal = Depends(get_principal)) -> int:
+    """Dependency to get the user id from the bearer token, without a database lookup."""
+    return principal.id
+
+
+def get_current_principal(
+    request: Request,
+    principal: Principal = Depends(get_principal),
+) -> Principal:
+    """
+    Dependency for routes that only need the caller's id: no user lookup at all.
+    Tokens are signed and users are never deleted, so the claims are trusted as is.
+    """
+    if request.method not in SAFE_METHODS:
+        # Opened before the write commits, so the window covers it
+        record_write(principal.id)
+    return principal
+
+
+async def get_read_db(
+    user_id: int = Depends(get_token_user_id),
+) -> AsyncIterator[AsyncSession]:
+    """
+    Dependency for read-only routes: a replica session when one is configured,
+    falling back to the primary when the replica is down or the user wrote recently.
+    """
+    db = await open_read_session(user_id)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def _load_user(db: AsyncSession, user_id: int) -> UserView:
+    """Load the authenticated user through the user cache, or reject the request."""
+    user_repo = AsyncUserRepository(db)
+    user = await user_repo.get_cached(user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -46,3 +97,74 @@ def get_current_user(
         )
 
     return user
+
+
+async def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserView:
+    """Dependency to get current authenticated user's profile; cached, so usually no query."""
+    return await _load_user(db, principal.id)
+
+
+async def get_current_reader(
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> UserView:
+    """Dependency to get current authenticated user's profile, through the read session on a cache miss."""
+    return await _load_user(db, user_id)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against one ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+async def group_etag(
+    request: Request,
+    response: Response,
+    group_id: int = Path(...),
+    convert: bool = Query(False, include_in_schema=False),
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> None:
+    """
+    Conditional GET for group reads; declare it before the route's other dependencies.
+
+    Looks up the group's version, which also checks membership, and answers
+    304 Not Modified when If-None-Match holds the current ETag, so a polling
+    client costs one indexed lookup. Otherwise tags the response and lets the
+    route run. The version is read before the route's own queries, so a write
+    landing in between only makes the ETag older than the data, never newer.
+    Responses converted with FX rates (`?convert=true` on /balances) are not
+    tagged: rate imports do not bump group versions.
+    """
+    version = await AsyncGroupRepository(db).get_member_version(group_id, user_id)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    if convert:
+        return
+
+    # Per user as well: group reads include the caller's own balance
+    etag = f'W/"{group_id}-{version}-{user_id}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+def require_internal_token(x_internal_token: Optional[str] = Header(None)) -> None:
+    """
+    Dependency for internal routes: the X-Internal-Token header must match
+    INTERNAL_API_TOKEN. Without a configured token the routes do not exist.
+    """
+    if not settings.INTERNAL_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_internal_token is None or not hmac.compare_digest(
+        x_internal_token.encode(), settings.INTERNAL_API_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid internal token")
@@ -1,107 +1,246 @@
 """
 Expense API routes.
 """
-from typing import List
+from typing import Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.dependencies import get_current_user
-from app.api.schemas import ExpenseCreate, ExpenseResponse, ExpenseUpdate
-from app.infrastructure.db.models import User, SplitType
+from app.core.database import get_async_db
+from app.api.dependencies import Principal, get_current_principal, get_read_db, group_etag
+from app.api.schemas import (
+    ExpenseCreate, ExpenseResponse, ExpenseUpdate, ExpenseSplitData,
+    ExpenseBatchCreate, ExpenseBatchResponse, ExpensePageResponse,
+    SplitPreviewRequest, SplitPreviewResponse, ArchivedExpenseResponse, ArchivedExpensePageResponse,
+)
+from app.core.pagination import decode_cursor, paginate
+from app.infrastructure.db.models import SplitType
+from app.infrastructure.repositories.archive_repository import AsyncArchiveRepository
+from app.infrastructure.repositories.expense_repository import AsyncExpenseRepository
+from app.infrastructure.repositories.group_repository import AsyncGroupRepository
 from app.application.expense_service import ExpenseServiceApp
 
 router = APIRouter()
 
 
-@router.get("/{group_id}/expenses", response_model=List[ExpenseResponse])
+def _split_data_to_dict(split_data: ExpenseSplitData) -> Dict:
+    """Convert split_data to dict format expected by services."""
+    split_data_dict = {}
+    if split_data.participants:
+        split_data_dict["participants"] = split_data.participants
+    if split_data.splits:
+        split_data_dict["splits"] = split_data.splits
+    if split_data.shares:
+        split_data_dict["shares"] = split_data.shares
+    if split_data.percents:
+        split_data_dict["percents"] = split_data.percents
+    return split_data_dict
+
+
+def expense_create_kwargs(expense_data: ExpenseCreate) -> Dict:
+    """Convert an ExpenseCreate to keyword arguments of ExpenseServiceApp.create_expense."""
+    items = None
+    if expense_data.items:
+        items = [
+            {"description": i.description, "amount_cents": i.amount_cents, "category_id": i.category_id}
+            for i in expense_data.items
+        ]
+    return {
+        "payer_user_id": expense_data.payer_id,
+        "amount_cents": expense_data.amount_cents,
+        "currency_code": expense_data.currency_code,
+        "description": expense_data.description,
+        "notes": expense_data.notes,
+        "category_id": expense_data.category_id,
+        "split_type": expense_data.split_mode,
+        "split_data": _split_data_to_dict(expense_data.split_data),
+        "items": items,
+    }
+
+
+def expense_update_kwargs(expense_data: ExpenseUpdate) -> Dict:
+    """Convert an ExpenseUpdate to keyword arguments of ExpenseServiceApp.update_expense."""
+    split_data_dict = None
+    if expense_data.split_data:
+        if expense_data.split_data.participants:
+            split_data_dict = {"participants": expense_data.split_data.participants}
+        elif expense_data.split_data.splits:
+            split_data_dict = {"splits": expense_data.split_data.splits}
+        elif expense_data.split_data.shares:
+            split_data_dict = {"shares": expense_data.split_data.shares}
+        elif expense_data.split_data.percents:
+            split_data_dict = {"percents": expense_data.split_data.percents}
+    return {
+        "amount_cents": expense_data.amount_cents,
+        "description": expense_data.description,
+        "notes": expense_data.notes,
+        "split_type": expense_data.split_mode,
+        "split_data": split_data_dict,
+    }
+
+
+@router.get("/{group_id}/expenses", response_model=ExpensePageResponse, dependencies=[Depends(group_etag)])
 async def list_expenses(
     group_id: int = Path(...),
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get paginated expenses for a group."""
-    expense_service = ExpenseServiceApp(db)
-    expenses = expense_service.get_group_expenses(group_id, limit, offset)
-    return [ExpenseResponse.model_validate(e) for e in expenses]
+    """Get a page of expenses for a group, newest first."""
+    try:
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    expense_repo = AsyncExpenseRepository(db)
+    expenses = await expense_repo.get_group_expenses(group_id, limit + 1, before)
+    expenses, next_cursor = paginate(expenses, limit, lambda e: (e.occurred_at, e.id))
+    return ExpensePageResponse(
+        items=[ExpenseResponse.model_validate(e) for e in expenses],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/{group_id}/archived-expenses", response_model=ArchivedExpensePageResponse)
+async def list_archived_expenses(
+    group_id: int = Path(...),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get a page of a group's archived expenses, deleted ones included, newest first. Read-only."""
+    group_repo = AsyncGroupRepository(db)
+    if not await group_repo.is_member(group_id, current_user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+
+    try:
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    archive_repo = AsyncArchiveRepository(db)
+    expenses = await archive_repo.get_group_expenses(group_id, limit + 1, before)
+    expenses, next_cursor = paginate(expenses, limit, lambda e: (e.occurred_at, e.id))
+    return ArchivedExpensePageResponse(
+        items=[ArchivedExpenseResponse.model_validate(e) for e in expenses],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/{group_id}/archived-expenses/{expense_id}", response_model=ArchivedExpenseResponse)
+async def get_archived_expense(
+    group_id: int = Path(...),
+    expense_id: int = Path(...),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get one archived expense of a group. Read-only."""
+    group_repo = AsyncGroupRepository(db)
+    if not await group_repo.is_member(group_id, current_user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+
+    expense = await AsyncArchiveRepository(db).get_by_id(group_id, expense_id)
+    if expense is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Archived expense not found")
+    return ArchivedExpenseResponse.model_validate(expense)
 
 
 @router.post("/{group_id}/expenses", response_model=ExpenseResponse, status_code=status.HTTP_201_CREATED)
 async def create_expense(
     expense_data: ExpenseCreate,
     group_id: int = Path(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new expense."""
-    expense_service = ExpenseServiceApp(db)
-    try:
-        # Convert split_data to dict format expected by service
-        split_data_dict = {}
-        if expense_data.split_data.participants:
-            split_data_dict["participants"] = expense_data.split_data.participants
-        if expense_data.split_data.splits:
-            split_data_dict["splits"] = expense_data.split_data.splits
-        if expense_data.split_data.shares:
-            split_data_dict["shares"] = expense_data.split_data.shares
-        if expense_data.split_data.percents:
-            split_data_dict["percents"] = expense_data.split_data.percents
-
-        items_dict = None
-        if expense_data.items:
-            items_dict = [{"description": i.description, "amount_cents": i.amount_cents, "category_id": i.category_id} for i in expense_data.items]
-
-        expense = expense_service.create_expense(
-            group_id=group_id,
-            payer_user_id=expense_data.payer_id,
-            created_by_user_id=current_user.id,
-            amount_cents=expense_data.amount_cents,
-            currency_code=expense_data.currency_code,
-            description=expense_data.description,
-            notes=expense_data.notes,
-            category_id=expense_data.category_id,
-            split_type=expense_data.split_mode,
-            split_data=split_data_dict,
-            items=items_dict,
+    user_id = current_user.id
+    kwargs = expense_create_kwargs(expense_data)
+
+    def create(session: Session) -> ExpenseResponse:
+        expense = ExpenseServiceApp(session).create_expense(
+            group_id=group_id, created_by_user_id=user_id, **kwargs
         )
         return ExpenseResponse.model_validate(expense)
+
+    try:
+        return await db.run_sync(create)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post("/{group_id}/expenses:batch", response_model=ExpenseBatchResponse)
+async def create_expenses_batch(
+    batch_data: ExpenseBatchCreate,
+    group_id: int = Path(...),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Create up to 1000 expenses at once; invalid ones are reported per item."""
+    user_id = current_user.id
+    requests = [expense_create_kwargs(e) for e in batch_data.expenses]
+
+    def create(session: Session) -> List[Dict]:
+        return ExpenseServiceApp(session).create_expenses_batch(group_id, user_id, requests)
+
+    try:
+        results = await db.run_sync(create)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    failed = sum(1 for r in results if "error" in r)
+    return ExpenseBatchResponse(
+        created=len(results) - failed,
+        failed=failed,
+        results=[{"index": i, **r} for i, r in enumerate(results)],
+    )
+
+
+@router.post("/{group_id}/expenses/split-preview", response_model=SplitPreviewResponse)
+async def preview_expense_splits(
+    preview_data: SplitPreviewRequest,
+    group_id: int = Path(...),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Preview how many expenses would be split, without creating them."""
+    user_id = current_user.id
+    requests = [
+        {
+            "amount_cents": item.amount_cents,
+            "split_type": item.split_mode,
+            "split_data": _split_data_to_dict(item.split_data),
+        }
+        for item in preview_data.expenses
+    ]
+
+    def preview(session: Session) -> List[Dict]:
+        return ExpenseServiceApp(session).preview_splits(group_id, user_id, requests)
+
+    try:
+        return SplitPreviewResponse(previews=await db.run_sync(preview))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
 @router.put("/expenses/{expense_id}", response_model=ExpenseResponse)
 async def update_expense(
     expense_data: ExpenseUpdate,
     expense_id: int = Path(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update an expense."""
-    expense_service = ExpenseServiceApp(db)
-    try:
-        split_data_dict = None
-        if expense_data.split_data:
-            if expense_data.split_data.participants:
-                split_data_dict = {"participants": expense_data.split_data.participants}
-            elif expense_data.split_data.splits:
-                split_data_dict = {"splits": expense_data.split_data.splits}
-            elif expense_data.split_data.shares:
-                split_data_dict = {"shares": expense_data.split_data.shares}
-            elif expense_data.split_data.percents:
-                split_data_dict = {"percents": expense_data.split_data.percents}
-
-        expense = expense_service.update_expense(
-            expense_id=expense_id,
-            user_id=current_user.id,
-            amount_cents=expense_data.amount_cents,
-            description=expense_data.description,
-            notes=expense_data.notes,
-            split_type=expense_data.split_mode,
-            split_data=split_data_dict,
-        )
+    user_id = current_user.id
+    kwargs = expense_update_kwargs(expense_data)
+
+    def update(session: Session) -> ExpenseResponse:
+        expense = ExpenseServiceApp(session).update_expense(expense_id=expense_id, user_id=user_id, **kwargs)
         return ExpenseResponse.model_validate(expense)
+
+    try:
+        return await db.run_sync(update)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -109,12 +248,16 @@ async def update_expense(
 @router.delete("/expenses/{expense_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_expense(
     expense_id: int = Path(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete an expense."""
-    expense_service = ExpenseServiceApp(db)
+    user_id = current_user.id
+
+    def delete(session: Session) -> None:
+        ExpenseServiceApp(session).delete_expense(expense_id, user_id)
+
     try:
-        expense_service.delete_expense(expense_id, current_user.id)
+        await db.run_sync(delete)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
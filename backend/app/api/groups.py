@@ -3,14 +3,14 @@ Group API routes.
 """
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, Path
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.core.database import get_async_db
+from app.api.dependencies import Principal, get_current_principal, get_read_db, group_etag
 from app.api.schemas import (
     GroupCreate, GroupResponse, GroupAddMember, GroupWithBalancesResponse
 )
-from app.infrastructure.db.models import User
 from app.application.group_service import GroupService
 
 router = APIRouter()
@@ -18,49 +18,61 @@ router = APIRouter()
 
 @router.get("", response_model=List[GroupResponse])
 async def list_groups(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all groups the current user belongs to."""
-    group_service = GroupService(db)
-    groups = group_service.get_user_groups(current_user.id)
-    return [GroupResponse.model_validate(g) for g in groups]
+    user_id = current_user.id
+
+    def list_user_groups(session: Session) -> List[GroupResponse]:
+        groups = GroupService(session).get_user_groups(user_id)
+        return [GroupResponse.model_validate(g) for g in groups]
+
+    return await db.run_sync(list_user_groups)
 
 
 @router.post("", response_model=GroupResponse, status_code=status.HTTP_201_CREATED)
 async def create_group(
     group_data: GroupCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new group."""
-    group_service = GroupService(db)
-    try:
-        group = group_service.create_group(
+    user_id = current_user.id
+
+    def create(session: Session) -> GroupResponse:
+        group = GroupService(session).create_group(
             name=group_data.name,
-            created_by_user_id=current_user.id,
+            created_by_user_id=user_id,
             default_currency=group_data.default_currency,
         )
         return GroupResponse.model_validate(group)
+
+    try:
+        return await db.run_sync(create)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/{group_id}", response_model=GroupWithBalancesResponse)
+@router.get("/{group_id}", response_model=GroupWithBalancesResponse, dependencies=[Depends(group_etag)])
 async def get_group(
     group_id: int = Path(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get group details with balances."""
-    group_service = GroupService(db)
-    try:
-        result = group_service.get_group_with_balances(group_id, current_user.id)
+    user_id = current_user.id
+
+    def get(session: Session) -> GroupWithBalancesResponse:
+        result = GroupService(session).get_group_with_balances(group_id, user_id)
         return GroupWithBalancesResponse(
             group=GroupResponse.model_validate(result["group"]),
             balances=result["balances"],
             user_balance=result["user_balance"],
         )
+
+    try:
+        return await db.run_sync(get)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -69,13 +81,17 @@ async def get_group(
 async def add_group_member(
     member_data: GroupAddMember,
     group_id: int = Path(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Add a member to a group."""
-    group_service = GroupService(db)
-    try:
-        group = group_service.add_member(group_id, member_data.email, current_user.id)
+    user_id = current_user.id
+
+    def add_member(session: Session) -> GroupResponse:
+        group = GroupService(session).add_member(group_id, member_data.email, user_id)
         return GroupResponse.model_validate(group)
+
+    try:
+        return await db.run_sync(add_member)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -0,0 +1,94 @@
+"""
+Bank statement import API routes.
+"""
+import os
+import shutil
+import tempfile
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, File, HTTPException, Path, UploadFile, status
+)
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.api.dependencies import Principal, get_current_principal
+from app.api.schemas import BankImportResponse
+from app.application.bank_import_service import BankImportService, run_bank_import
+
+router = APIRouter()
+
+
+@router.post(
+    "/{group_id}/imports/bank",
+    response_model=BankImportResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def import_bank_statement(
+    background_tasks: BackgroundTasks,
+    group_id: int = Path(...),
+    file: UploadFile = File(...),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Upload a CSV or OFX bank statement; debits are imported as expenses in the background."""
+    user_id = current_user.id
+    filename = os.path.basename(file.filename or "statement.csv")
+
+    # Spool the upload to disk before recording the import, so a pending import
+    # always has its file: the background task streams it after the response
+    spooled_path = await run_in_threadpool(_spool_upload, file, os.path.splitext(filename)[1])
+
+    recorded = False
+
+    def start(session: Session) -> BankImportResponse:
+        nonlocal recorded
+        bank_import = BankImportService(session).start_import(group_id, user_id, filename, spooled_path)
+        # Committed: from here the import owns the upload, and the sweep runs it if this request does not
+        recorded = True
+        return BankImportResponse.model_validate(bank_import)
+
+    try:
+        bank_import = await db.run_sync(start)
+    except BaseException as e:
+        if recorded:
+            raise
+        os.remove(spooled_path)
+        if isinstance(e, ValueError):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        raise
+    background_tasks.add_task(run_bank_import, bank_import.id)
+
+    return bank_import
+
+
+def _spool_upload(file: UploadFile, suffix: str) -> str:
+    """Copy an upload to a file in BANK_IMPORT_SPOOL_DIR and return its path."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=settings.BANK_IMPORT_SPOOL_DIR) as spooled:
+        try:
+            shutil.copyfileobj(file.file, spooled)
+        except BaseException:
+            os.remove(spooled.name)
+            raise
+    return spooled.name
+
+
+@router.get("/{group_id}/imports/{import_id}", response_model=BankImportResponse)
+async def get_bank_import(
+    group_id: int = Path(...),
+    import_id: int = Path(...),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get the progress of a bank statement import."""
+    user_id = current_user.id
+
+    def get(session: Session) -> BankImportResponse:
+        bank_import = BankImportService(session).get_import(group_id, import_id, user_id)
+        return BankImportResponse.model_validate(bank_import)
+
+    try:
+        return await db.run_sync(get)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -0,0 +1,43 @@
+"""
+Internal metrics routes, for operators only.
+"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import require_internal_token
+from app.application.group_event_listener import group_event_listener
+from app.application.outbox_worker import outbox_worker
+from app.core.database import (
+    async_engine, engine, get_async_db, pool_stats, replica_engine, replica_health
+)
+from app.core.pubsub import group_events
+from app.infrastructure.repositories.outbox_repository import OutboxRepository
+
+router = APIRouter(include_in_schema=False, dependencies=[Depends(require_internal_token)])
+
+
+@router.get("/db-pool")
+async def db_pool_metrics():
+    """Connection pool occupancy and checkout waits for this process."""
+    metrics = {"sync": pool_stats(engine), "async": pool_stats(async_engine.sync_engine)}
+    if replica_engine is not None:
+        metrics["replica"] = {
+            **pool_stats(replica_engine.sync_engine),
+            "down": replica_health.is_down(),
+            "failures": replica_health.failures,
+        }
+    return metrics
+
+
+@router.get("/outbox")
+async def outbox_metrics(db: AsyncSession = Depends(get_async_db)):
+    """
+    Activity outbox lag. `backlog` covers every process; `worker` is this
+    process's worker (lag is measured from outbox commit to delivery commit).
+    """
+    backlog = await db.run_sync(lambda session: OutboxRepository(session).get_backlog())
+    return {
+        "backlog": backlog,
+        "worker": {"running": outbox_worker.running, **outbox_worker.stats.snapshot()},
+        "streams": {"listening": group_event_listener.running, **group_events.stats()},
+    }
@@ -1,11 +1,11 @@
 """
 Pydantic schemas for request/response validation.
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 from pydantic import BaseModel, EmailStr, Field
 
-from app.infrastructure.db.models import SplitType
+from app.infrastructure.db.models import SplitType, BankImportStatus
 
 
 # Auth schemas
@@ -106,6 +106,22 @@ class ExpenseCreate(BaseModel):
     items: Optional[List[ExpenseItemCreate]] = None
 
 
+class ExpenseBatchCreate(BaseModel):
+    expenses: List[ExpenseCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class ExpenseBatchResult(BaseModel):
+    index: int
+    expense_id: Optional[int] = None
+    error: Optional[str] = None  # Set instead of expense_id when this expense was rejected
+
+
+class ExpenseBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[ExpenseBatchResult]
+
+
 class ExpenseSplitResponse(BaseModel):
     id: int
     user_id: int
@@ -143,6 +159,46 @@ class ExpenseResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ExpensePageResponse(BaseModel):
+    items: List[ExpenseResponse]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to get the next page; None on the last page
+
+
+class ArchivedExpenseResponse(ExpenseResponse):
+    deleted_at: Optional[datetime] = None  # Set when the expense was deleted before it was archived
+    archived_at: datetime
+
+
+class ArchivedExpensePageResponse(BaseModel):
+    items: List[ArchivedExpenseResponse]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to get the next page; None on the last page
+
+
+class SplitPreviewItem(BaseModel):
+    amount_cents: int
+    split_mode: SplitType = SplitType.EQUAL
+    split_data: ExpenseSplitData
+
+
+class SplitPreviewRequest(BaseModel):
+    expenses: List[SplitPreviewItem] = Field(..., max_length=1000)
+
+
+class SplitPreviewSplit(BaseModel):
+    user_id: int
+    amount_cents: int
+    share_value: Optional[str] = None
+
+
+class SplitPreviewResult(BaseModel):
+    splits: List[SplitPreviewSplit] = []
+    error: Optional[str] = None  # Set instead of splits when this expense's split data is invalid
+
+
+class SplitPreviewResponse(BaseModel):
+    previews: List[SplitPreviewResult]
+
+
 class ExpenseUpdate(BaseModel):
     amount_cents: Optional[int] = None
     description: Optional[str] = None
@@ -156,6 +212,27 @@ class BalanceResponse(BaseModel):
     balances: Dict[str, Dict[int, int]]  # currency -> user_id -> balance_cents
 
 
+class UserGroupBalance(BaseModel):
+    group_id: int
+    group_name: str
+    balances: Dict[str, int]  # currency -> balance_cents
+
+
+class UserBalanceSummaryResponse(BaseModel):
+    groups: List[UserGroupBalance]
+    total: Dict[str, int]  # currency -> balance_cents across all groups
+
+
+class SettlePlanTransfer(BaseModel):
+    from_user_id: int
+    to_user_id: int
+    amount_cents: int
+
+
+class SettlePlanResponse(BaseModel):
+    transfers: Dict[str, List[SettlePlanTransfer]]  # currency -> transfers that settle the group
+
+
 # Settlement schemas
 class SettlementCreate(BaseModel):
     from_user_id: int
@@ -190,3 +267,86 @@ class ActivityEventResponse(BaseModel):
     user: UserResponse
 
     model_config = {"from_attributes": True}
+
+
+class ActivityPageResponse(BaseModel):
+    items: List[ActivityEventResponse]
+    next_cursor: Optional[str] = None
+
+
+class GroupStreamEvent(BaseModel):
+    """`data` of an `activity` event on GET /groups/{id}/stream."""
+    id: int
+    group_id: int
+    user_id: int
+    type: str
+    payload: Optional[Dict[str, Any]] = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+# Sync schemas
+class SyncResponse(BaseModel):
+    """Changes since the `since` token of GET /sync; pass `token` as `since` next time."""
+    token: str
+    groups: List[GroupResponse]  # Changed or newly joined groups, with their members
+    expenses: List[ExpenseResponse]  # Created or updated; may repeat ones already sent
+    deleted_expense_ids: List[int]
+    settlements: List[SettlementResponse]
+    activity: List[ActivityEventResponse]
+    has_more_activity: bool  # Activity was cut at SYNC_ACTIVITY_LIMIT; sync again with `token` for the rest
+    resync_group_ids: List[int]  # Joined since the token; fetch their expenses and activity in full
+    removed_group_ids: List[int]
+
+
+class SyncMutation(BaseModel):
+    idempotency_key: str = Field(..., min_length=1, max_length=100)
+    type: Literal["create_expense", "update_expense", "delete_expense", "create_settlement"]
+    group_id: Optional[int] = None  # create_expense, create_settlement
+    expense_id: Optional[int] = None  # update_expense, delete_expense
+    expense: Optional[ExpenseCreate] = None
+    expense_update: Optional[ExpenseUpdate] = None
+    settlement: Optional[SettlementCreate] = None
+
+
+class SyncMutationBatch(BaseModel):
+    mutations: List[SyncMutation] = Field(..., min_length=1, max_length=500)
+
+
+class SyncMutationResult(BaseModel):
+    index: int
+    idempotency_key: str
+    status: Literal["applied", "duplicate", "error"]  # duplicate: applied by an earlier upload
+    expense_id: Optional[int] = None
+    settlement_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class SyncMutationResponse(BaseModel):
+    applied: int
+    duplicates: int
+    failed: int
+    results: List[SyncMutationResult]
+
+
+# Bank import schemas
+class BankImportError(BaseModel):
+    line: Optional[int] = None
+    error: str
+
+
+class BankImportResponse(BaseModel):
+    id: int
+    group_id: int
+    filename: str
+    status: BankImportStatus
+    rows_read: int
+    rows_imported: int
+    rows_skipped: int
+    rows_failed: int
+    errors: Optional[List[BankImportError]] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
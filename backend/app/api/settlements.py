@@ -3,12 +3,12 @@ Settlement API routes.
 """
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, Path
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.core.database import get_async_db
+from app.api.dependencies import Principal, get_current_principal, get_read_db
 from app.api.schemas import SettlementCreate, SettlementResponse
-from app.infrastructure.db.models import User
 from app.application.settlement_service import SettlementService
 
 router = APIRouter()
@@ -18,22 +18,26 @@ router = APIRouter()
 async def create_settlement(
     settlement_data: SettlementCreate,
     group_id: int = Path(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new settlement."""
-    settlement_service = SettlementService(db)
-    try:
-        settlement = settlement_service.create_settlement(
+    user_id = current_user.id
+
+    def create(session: Session) -> SettlementResponse:
+        settlement = SettlementService(session).create_settlement(
             group_id=group_id,
             from_user_id=settlement_data.from_user_id,
             to_user_id=settlement_data.to_user_id,
             amount_cents=settlement_data.amount_cents,
             currency_code=settlement_data.currency_code,
-            created_by_user_id=current_user.id,
+            created_by_user_id=user_id,
             notes=settlement_data.notes,
         )
         return SettlementResponse.model_validate(settlement)
+
+    try:
+        return await db.run_sync(create)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -41,13 +45,17 @@ async def create_settlement(
 @router.get("/{group_id}/settlements", response_model=List[SettlementResponse])
 async def list_settlements(
     group_id: int = Path(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all settlements for a group."""
-    settlement_service = SettlementService(db)
-    try:
-        settlements = settlement_service.get_group_settlements(group_id, current_user.id)
+    user_id = current_user.id
+
+    def list_group_settlements(session: Session) -> List[SettlementResponse]:
+        settlements = SettlementService(session).get_group_settlements(group_id, user_id)
         return [SettlementResponse.model_validate(s) for s in settlements]
+
+    try:
+        return await db.run_sync(list_group_settlements)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
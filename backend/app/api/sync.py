@@ -0,0 +1,85 @@
+"""
+Sync API routes for offline clients.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import Principal, get_current_principal
+from app.api.expenses import expense_create_kwargs, expense_update_kwargs
+from app.api.schemas import SyncMutationBatch, SyncMutationResponse, SyncResponse
+from app.application.sync_service import SyncService, decode_sync_token, encode_sync_token
+from app.core.config import settings
+from app.core.database import get_async_db
+
+router = APIRouter()
+
+
+@router.get("", response_model=SyncResponse)
+async def sync_changes(
+    since: Optional[str] = Query(None, description="token from the previous sync; omit on first sync"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get everything that changed in the user's groups since a token.
+    Served from the primary, so a token never runs ahead of what a replica has applied.
+    """
+    try:
+        token = decode_sync_token(since) if since else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    max_age = timedelta(days=settings.SYNC_TOKEN_MAX_AGE_DAYS)
+    if token is not None and token.synced_at < datetime.now(timezone.utc) - max_age:
+        # Deletions this old may already be archived; the client must fetch everything again
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Sync token expired")
+
+    user_id = current_user.id
+
+    def get_changes(session: Session) -> SyncResponse:
+        changes = SyncService(session).get_changes(user_id, token)
+        return SyncResponse.model_validate({**changes, "token": encode_sync_token(changes["token"])})
+
+    return await db.run_sync(get_changes)
+
+
+@router.post("/mutations", response_model=SyncMutationResponse)
+async def upload_mutations(
+    batch_data: SyncMutationBatch,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Apply up to 500 queued offline writes in order. Each is applied once per
+    idempotency key, so an upload can be retried safely; results are reported per item.
+    """
+    user_id = current_user.id
+    mutations = [
+        {
+            "idempotency_key": m.idempotency_key,
+            "type": m.type,
+            "group_id": m.group_id,
+            "expense_id": m.expense_id,
+            "expense": expense_create_kwargs(m.expense) if m.expense else None,
+            "expense_update": expense_update_kwargs(m.expense_update) if m.expense_update else None,
+            "settlement": m.settlement.model_dump() if m.settlement else None,
+        }
+        for m in batch_data.mutations
+    ]
+
+    def apply(session: Session) -> List[Dict]:
+        return SyncService(session).apply_mutations(user_id, mutations)
+
+    results = await db.run_sync(apply)
+    statuses = [r["status"] for r in results]
+    return SyncMutationResponse(
+        applied=statuses.count("applied"),
+        duplicates=statuses.count("duplicate"),
+        failed=statuses.count("error"),
+        results=[
+            {"index": i, "idempotency_key": m["idempotency_key"], **r}
+            for i, (m, r) in enumerate(zip(mutations, results))
+        ],
+    )
@@ -2,16 +2,33 @@
 User API routes.
 """
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.dependencies import get_current_user
-from app.api.schemas import UserResponse
-from app.infrastructure.db.models import User
+from app.api.dependencies import Principal, get_current_principal, get_current_reader, get_read_db
+from app.api.schemas import UserResponse, UserBalanceSummaryResponse
+from app.infrastructure.repositories.views import UserView
+from app.application.balance_service import BalanceServiceApp
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_profile(current_user: User = Depends(get_current_user)):
+async def get_current_user_profile(current_user: UserView = Depends(get_current_reader)):
     """Get current user profile."""
     return UserResponse.model_validate(current_user)
+
+
+@router.get("/me/balances", response_model=UserBalanceSummaryResponse)
+async def get_current_user_balances(
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get current user's net balances per group and overall."""
+    user_id = current_user.id
+
+    def get(session: Session) -> UserBalanceSummaryResponse:
+        result = BalanceServiceApp(session).get_user_balances(user_id)
+        return UserBalanceSummaryResponse(**result)
+
+    return await db.run_sync(get)
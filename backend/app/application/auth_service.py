@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.core.security import verify_password, get_password_hash, create_access_token
 from app.core.config import settings
-from app.infrastructure.repositories.user_repository import UserRepository
+from app.infrastructure.unit_of_work import UnitOfWork
 from app.infrastructure.db.models import User
 
 
@@ -15,7 +15,8 @@ class AuthService:
     """Application service for authentication."""
 
     def __init__(self, db: Session):
-        self.user_repo = UserRepository(db)
+        self.uow = UnitOfWork(db)
+        self.user_repo = self.uow.users
         self.db = db
 
     def register(self, email: str, password: str, name: str, default_currency: str = "USD") -> tuple[User, str]:
@@ -27,7 +28,8 @@ class AuthService:
 
         # Create user
         password_hash = get_password_hash(password)
-        user = self.user_repo.create(email, password_hash, name, default_currency)
+        with self.uow:
+            user = self.user_repo.create(email, password_hash, name, default_currency)
 
         # Generate token
         token = create_access_token(data={"sub": str(user.id), "email": user.email})
@@ -1,13 +1,22 @@
 """
 Application service for balance operations.
 """
-from typing import Dict
+from typing import Dict, Optional
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.infrastructure.repositories.group_repository import GroupRepository
-from app.infrastructure.repositories.expense_repository import ExpenseRepository
-from app.infrastructure.repositories.settlement_repository import SettlementRepository
+from app.infrastructure.repositories.balance_repository import BalanceRepository
+from app.application.fx_service import FxService
 from app.domain.balance_service import BalanceService
+from app.domain.debt_simplification import DebtSimplificationService
+
+# Settle plans by (group_id, version, as_of, convert). Every write that changes
+# a group's balances bumps its version, so only FX rate imports, which do not,
+# can leave a cached (converted) plan stale
+settle_plan_cache = TTLCache(maxsize=settings.SETTLE_PLAN_CACHE_SIZE, ttl=settings.SETTLE_PLAN_CACHE_TTL_SECONDS)
 
 
 class BalanceServiceApp:
@@ -15,21 +24,89 @@ class BalanceServiceApp:
 
     def __init__(self, db: Session):
         self.group_repo = GroupRepository(db)
-        self.expense_repo = ExpenseRepository(db)
-        self.settlement_repo = SettlementRepository(db)
+        self.balance_repo = BalanceRepository(db)
         self.db = db
 
-    def get_group_balances(self, group_id: int, user_id: int) -> Dict:
-        """Get balances for all users in a group."""
+    def get_group_balances(
+        self,
+        group_id: int,
+        user_id: int,
+        as_of: Optional[datetime] = None,
+        convert: bool = False,
+    ) -> Dict:
+        """
+        Get balances for all users in a group, currently or as of a point in time.
+        With `convert`, all currencies are converted into the group's default currency.
+        """
         # Validate membership
         if not self.group_repo.is_member(group_id, user_id):
             raise ValueError("User is not a member of this group")
 
-        # Get expenses and settlements
-        expenses = self.expense_repo.get_group_expenses(group_id, limit=1000)
-        settlements = self.settlement_repo.get_group_settlements(group_id)
+        if as_of is None:
+            # Read materialized balances from the ledger
+            balances = self.balance_repo.get_group_balances(group_id)
+        else:
+            balances = self._get_group_balances_as_of(group_id, as_of)
 
-        # Calculate balances
-        balances = BalanceService.calculate_group_balances(expenses, settlements)
+        if convert:
+            target_currency = self.group_repo.get_default_currency(group_id)
+            balances = FxService(self.db).convert_balances(balances, target_currency)
 
         return {"balances": balances}
+
+    def _get_group_balances_as_of(
+        self, group_id: int, as_of: datetime
+    ) -> Dict[str, Dict[int, int]]:
+        """Nearest checkpoint at or before `as_of`, rolled forward by the history after it."""
+        if as_of.tzinfo is None:
+            as_of = as_of.replace(tzinfo=timezone.utc)
+
+        period_start, checkpoint = self.balance_repo.get_latest_checkpoint(group_id, as_of)
+        delta = self.balance_repo.compute_group_balances(group_id, since=period_start, until=as_of)
+
+        return BalanceService.add_balances(checkpoint, delta)
+
+    def get_settle_plan(
+        self,
+        group_id: int,
+        user_id: int,
+        as_of: Optional[datetime] = None,
+        convert: bool = False,
+    ) -> Dict:
+        """
+        Get the transfers that settle up all users in a group.
+        Cached by group version, so a repeat request costs one indexed lookup;
+        the first request after each write computes the plan (about 1 ms per
+        1000 members, see scripts/bench_settle_plan.py).
+        """
+        # Also checks membership. Read before the balances: a write in between
+        # caches newer balances under the older version, which is never asked for again
+        version = self.group_repo.get_member_version(group_id, user_id)
+        if version is None:
+            raise ValueError("User is not a member of this group")
+        key = (group_id, version, as_of, convert)
+        result = settle_plan_cache.get(key)
+        if result is not None:
+            return result
+
+        balances = self.get_group_balances(group_id, user_id, as_of, convert)["balances"]
+
+        transfers = DebtSimplificationService.simplify_group_balances(balances)
+
+        result = {"transfers": {currency: plan for currency, plan in transfers.items() if plan}}
+        settle_plan_cache.set(key, result)
+        return result
+
+    def get_user_balances(self, user_id: int) -> Dict:
+        """Get a user's net position per currency in each of their groups and overall."""
+        groups: Dict[int, Dict] = {}
+        rows = self.balance_repo.get_user_balances(user_id)
+        for group_id, group_name, currency, balance_cents in rows:
+            group = groups.setdefault(
+                group_id, {"group_id": group_id, "group_name": group_name, "balances": {}}
+            )
+            group["balances"][currency] = balance_cents
+
+        total = BalanceService.sum_user_balances([g["balances"] for g in groups.values()])
+
+        return {"groups": list(groups.values()), "total": total}
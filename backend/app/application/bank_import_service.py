@@ -0,0 +1,304 @@
+"""
+Application service for bank statement imports.
+"""
+import logging
+import os
+import threading
+from itertools import islice
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.infrastructure.unit_of_work import UnitOfWork
+from app.domain.bank_statement_parser import BankStatementParser
+from app.domain.balance_service import BalanceService
+from app.domain.expense_service import ExpenseService
+from app.infrastructure.db.models import (
+    BankImport, BankImportStatus, Expense, ExpenseSource, SplitType
+)
+from app.infrastructure.repositories.bank_import_repository import BankImportRepository
+
+logger = logging.getLogger(__name__)
+
+# Row errors kept on the import record; the rest are only counted
+MAX_RECORDED_ERRORS = 100
+
+
+class _ClaimLost(Exception):
+    """Another runner took the import over; this one must not commit."""
+
+
+class BankImportService:
+    """Application service for bank statement imports."""
+
+    def __init__(self, db: Session):
+        self.uow = UnitOfWork(db)
+        self.import_repo = self.uow.bank_imports
+        self.expense_repo = self.uow.expenses
+        self.group_repo = self.uow.groups
+        self.balance_repo = self.uow.balances
+        self.db = db
+
+    def start_import(self, group_id: int, user_id: int, filename: str, upload_path: str) -> BankImport:
+        """Record a pending import of an already spooled upload; run_import processes it later."""
+        if not self.group_repo.is_member(group_id, user_id):
+            raise ValueError("User is not a member of the group")
+
+        with self.uow:
+            return self.import_repo.create(
+                BankImport(
+                    group_id=group_id,
+                    user_id=user_id,
+                    filename=filename,
+                    status=BankImportStatus.PENDING,
+                    rows_read=0,
+                    rows_imported=0,
+                    rows_skipped=0,
+                    rows_failed=0,
+                    upload_path=upload_path,
+                )
+            )
+
+    def get_import(self, group_id: int, import_id: int, user_id: int) -> BankImport:
+        """Get an import's progress."""
+        if not self.group_repo.is_member(group_id, user_id):
+            raise ValueError("User is not a member of the group")
+
+        bank_import = self.import_repo.get_by_id(import_id)
+        if not bank_import or bank_import.group_id != group_id:
+            raise ValueError("Import not found")
+        return bank_import
+
+    def run_import(
+        self, import_id: int, claimed_at: Optional[datetime] = None, chunk_size: Optional[int] = None
+    ) -> bool:
+        """
+        Claim an import and stream its upload into expenses, committing every
+        `chunk_size` rows. Returns False if another runner claimed it.
+
+        Each debit becomes an expense with source=BANK, paid by and split
+        entirely to the uploader, so the import leaves balances unchanged until
+        someone edits the split. Credits are skipped. Only the current chunk is
+        held in memory, and progress is visible after every commit.
+
+        Without `claimed_at` a pending import is claimed. With the claim time of
+        a runner that stopped, its running import is taken over and resumed
+        after the rows it committed. Each commit renews the claim and fails if
+        the import was taken over meanwhile, so two runners never both commit.
+        The upload is deleted once the import finishes.
+        """
+        chunk_size = chunk_size or settings.BANK_IMPORT_CHUNK_SIZE
+        with self.uow:
+            claimed_at = self.import_repo.claim(import_id, claimed_at)
+            if claimed_at is None:
+                return False
+            bank_import = self.import_repo.get_by_id(import_id)
+        path = bank_import.upload_path
+        # Rows of a previous runner's committed chunks
+        resume_after = bank_import.rows_read
+
+        default_currency = self.group_repo.get_default_currency(bank_import.group_id)
+        known_currencies: Dict[str, bool] = {}
+        errors: List[Dict] = list(bank_import.errors or [])
+        chunk: List[Expense] = []
+
+        try:
+            if path is None:
+                # Recorded before uploads were kept on the import
+                raise FileNotFoundError(import_id)
+            with open(path, newline="", encoding="utf-8-sig") as statement:
+                rows = BankStatementParser.parse(bank_import.filename, statement)
+                for row in islice(rows, resume_after, None):
+                    bank_import.rows_read += 1
+                    try:
+                        expense = self._row_to_expense(
+                            bank_import, row, default_currency, known_currencies
+                        )
+                    except ValueError as e:
+                        bank_import.rows_failed += 1
+                        if len(errors) < MAX_RECORDED_ERRORS:
+                            errors.append({"line": row["line"], "error": str(e)})
+                    else:
+                        if expense is None:
+                            bank_import.rows_skipped += 1
+                        else:
+                            chunk.append(expense)
+
+                    # By rows read, not expenses, so the claim is renewed even through credits
+                    if bank_import.rows_read % chunk_size == 0:
+                        claimed_at = self._save_chunk(bank_import, claimed_at, chunk, errors)
+                        chunk = []
+
+            claimed_at = self._save_chunk(bank_import, claimed_at, chunk, errors)
+            bank_import.status = BankImportStatus.COMPLETED
+        except _ClaimLost:
+            self.db.rollback()
+            logger.warning("Bank import %s was taken over by another runner", import_id)
+            return False
+        except FileNotFoundError:
+            # Spooled by a process on another host, or lost with it
+            self.db.rollback()
+            errors.append({"line": None, "error": "Upload is no longer available; upload the statement again"})
+            bank_import.status = BankImportStatus.FAILED
+        except Exception as e:
+            # Chunks already committed stay imported; the record says where it stopped
+            self.db.rollback()
+            errors.append({"line": None, "error": str(e)})
+            bank_import.status = BankImportStatus.FAILED
+
+        try:
+            with self.uow:
+                if self.import_repo.heartbeat(import_id, claimed_at) is None:
+                    raise _ClaimLost
+                bank_import.errors = list(errors)
+                bank_import.upload_path = None
+                bank_import.finished_at = datetime.now(timezone.utc)
+        except _ClaimLost:
+            logger.warning("Bank import %s was taken over by another runner", import_id)
+            return False
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+        return True
+
+    def _row_to_expense(
+        self,
+        bank_import: BankImport,
+        row: Dict,
+        default_currency: str,
+        known_currencies: Dict[str, bool],
+    ) -> Optional[Expense]:
+        """Build the expense for one parsed row, or None for credits."""
+        if "error" in row:
+            raise ValueError(row["error"])
+        if row["amount_cents"] >= 0:
+            return None
+
+        currency_code = row["currency_code"] or default_currency
+        if currency_code not in known_currencies:
+            known_currencies[currency_code] = bool(
+                self.expense_repo.get_existing_currency_codes([currency_code])
+            )
+        if not known_currencies[currency_code]:
+            raise ValueError(f"Unknown currency {currency_code}")
+
+        expense = Expense(
+            group_id=bank_import.group_id,
+            payer_user_id=bank_import.user_id,
+            created_by_user_id=bank_import.user_id,
+            amount_cents=-row["amount_cents"],
+            currency_code=currency_code,
+            description=row["description"][:500],
+            notes=f"Bank reference {row['reference']}" if row["reference"] else None,
+            source=ExpenseSource.BANK,
+            occurred_at=row["occurred_at"],
+        )
+        expense.splits = ExpenseService.create_expense_splits(
+            expense, SplitType.EQUAL, {"participants": [bank_import.user_id]}
+        )
+        return expense
+
+    def _save_chunk(
+        self, bank_import: BankImport, claimed_at: datetime, chunk: List[Expense], errors: List[Dict]
+    ) -> datetime:
+        """
+        Insert one chunk of expenses and commit it together with the progress
+        counters and a renewed claim; returns the new claim time.
+        """
+        with self.uow:
+            # First, so the import row stays locked against a takeover until the commit
+            claimed_at = self.import_repo.heartbeat(bank_import.id, claimed_at)
+            if claimed_at is None:
+                raise _ClaimLost
+            if chunk:
+                self.group_repo.bump_version(bank_import.group_id)
+                self.balance_repo.apply_deltas(
+                    bank_import.group_id, BalanceService.calculate_group_balances(chunk, [])
+                )
+                self.expense_repo.create_many(chunk)
+                bank_import.rows_imported += len(chunk)
+            bank_import.errors = list(errors)
+        return claimed_at
+
+
+def run_bank_import(import_id: int, claimed_at: Optional[datetime] = None) -> bool:
+    """Background task entry point: run an import in its own session; False if already claimed."""
+    db = SessionLocal()
+    try:
+        return BankImportService(db).run_import(import_id, claimed_at)
+    finally:
+        db.close()
+
+
+class BankImportSweeper:
+    """
+    Runs imports whose process stopped, on a background thread.
+
+    An import is recorded once its upload is spooled, and the request's
+    background task runs it right after the response. If the process stops
+    before or during the run, the import would stay pending or running
+    forever: every BANK_IMPORT_SWEEP_SECONDS, each API process claims the
+    imports pending, or running without a heartbeat, for over
+    BANK_IMPORT_STALE_SECONDS and runs them, resuming after the committed
+    chunks. Claims are compare-and-set, so one runner commits at a time.
+    Unless BANK_IMPORT_SPOOL_DIR is shared between hosts, an upload spooled on
+    another host is missing and the import fails.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[int, Optional[datetime]], bool] = run_bank_import,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval_seconds: float = settings.BANK_IMPORT_SWEEP_SECONDS,
+    ):
+        self.run_import = run
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def sweep(self) -> int:
+        """Claim and run stale imports; returns how many this process ran."""
+        db = self.session_factory()
+        try:
+            stale = BankImportRepository(db).get_stale(timedelta(seconds=settings.BANK_IMPORT_STALE_SECONDS))
+        finally:
+            db.close()
+        claimed = 0
+        for import_id, claimed_at in stale:
+            if self._stop.is_set():
+                break
+            if self.run_import(import_id, claimed_at):
+                logger.info("Ran stale bank import %s", import_id)
+                claimed += 1
+        return claimed
+
+    def run(self) -> None:
+        """Sweep until stopped."""
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("Bank import sweep failed; retrying in %ss", self.interval_seconds)
+
+    def start(self) -> None:
+        """Start sweeping on a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="bank-import-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        """Stop after the import in progress, if any."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+# The sweeper of this API process, started with the app
+bank_import_sweeper = BankImportSweeper()
@@ -1,16 +1,17 @@
 """
 Application service for expense operations.
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
 
-from app.infrastructure.repositories.expense_repository import ExpenseRepository
-from app.infrastructure.repositories.group_repository import GroupRepository
-from app.infrastructure.repositories.activity_repository import ActivityRepository
+from app.core.pagination import decode_cursor, paginate
+from app.infrastructure.repositories.views import ExpenseView
+from app.infrastructure.unit_of_work import UnitOfWork
 from app.domain.expense_service import ExpenseService
+from app.domain.balance_service import BalanceService
 from app.infrastructure.db.models import (
-    Expense, ExpenseItem, ExpenseSplit, SplitType, ActivityEventType
+    Expense, ExpenseItem, ExpenseSplit, SplitType, OutboxEvent, ActivityEventType
 )
 
 
@@ -18,9 +19,11 @@ class ExpenseServiceApp:
     """Application service for expense operations."""
 
     def __init__(self, db: Session):
-        self.expense_repo = ExpenseRepository(db)
-        self.group_repo = GroupRepository(db)
-        self.activity_repo = ActivityRepository(db)
+        self.uow = UnitOfWork(db)
+        self.expense_repo = self.uow.expenses
+        self.group_repo = self.uow.groups
+        self.outbox_repo = self.uow.outbox
+        self.balance_repo = self.uow.balances
         self.db = db
 
     def create_expense(
@@ -41,8 +44,134 @@ class ExpenseServiceApp:
         # Validate group membership
         if not self.group_repo.is_member(group_id, payer_user_id):
             raise ValueError("Payer must be a member of the group")
+        # Checked up front, as in create_expenses_batch: an unknown code would fail the
+        # balance ledger's foreign key at commit instead of being reported
+        if not self.expense_repo.get_existing_currency_codes([currency_code]):
+            raise ValueError(f"Unknown currency {currency_code}")
+        if category_id is not None and not self.expense_repo.get_existing_category_ids([category_id]):
+            raise ValueError(f"Category {category_id} not found")
 
-        # Create expense
+        expense = self._build_expense(
+            group_id, payer_user_id, created_by_user_id, amount_cents, currency_code,
+            description, notes, category_id, split_type, split_data, items,
+        )
+
+        # Validate all participants are group members (one cached query for the whole split)
+        non_members = {s.user_id for s in expense.splits} - self.group_repo.get_member_ids(group_id)
+        if non_members:
+            raise ValueError(f"User {min(non_members)} is not a member of the group")
+
+        # Balance ledger, expense and outbox event in one transaction
+        with self.uow:
+            self.group_repo.bump_version(group_id)
+            self.balance_repo.apply_deltas(
+                group_id, BalanceService.calculate_group_balances([expense], [])
+            )
+            expense = self.expense_repo.create(expense)
+
+            # Append activity event to the outbox
+            activity_event = OutboxEvent(
+                group_id=group_id,
+                user_id=created_by_user_id,
+                type=ActivityEventType.EXPENSE_CREATED,
+                payload={"expense_id": expense.id, "description": description, "amount_cents": amount_cents},
+            )
+            self.outbox_repo.add(activity_event)
+
+        return expense
+
+    def create_expenses_batch(
+        self, group_id: int, created_by_user_id: int, requests: List[Dict]
+    ) -> List[Dict]:
+        """
+        Create many expenses in a single transaction.
+        requests: list of create_expense keyword arguments without group_id/created_by_user_id
+        Returns one {expense_id} or {error} dict per request, in order. Invalid
+        requests are reported and skipped; the valid ones are still created.
+        """
+        member_ids = self.group_repo.get_member_ids(group_id)
+        if created_by_user_id not in member_ids:
+            raise ValueError("User is not a member of the group")
+
+        currency_codes = self.expense_repo.get_existing_currency_codes(
+            {r["currency_code"] for r in requests}
+        )
+        category_ids = self.expense_repo.get_existing_category_ids(
+            {r["category_id"] for r in requests if r.get("category_id") is not None}
+        )
+
+        results = []
+        expenses = []
+        for request in requests:
+            try:
+                if request["payer_user_id"] not in member_ids:
+                    raise ValueError("Payer must be a member of the group")
+                if request["currency_code"] not in currency_codes:
+                    raise ValueError(f"Unknown currency {request['currency_code']}")
+                category_id = request.get("category_id")
+                if category_id is not None and category_id not in category_ids:
+                    raise ValueError(f"Category {category_id} not found")
+
+                try:
+                    expense = self._build_expense(
+                        group_id, created_by_user_id=created_by_user_id, **request
+                    )
+                except (KeyError, TypeError):
+                    split_type = request.get("split_type", SplitType.EQUAL)
+                    raise ValueError(f"Missing split data for {split_type.value} split")
+
+                non_members = {s.user_id for s in expense.splits} - member_ids
+                if non_members:
+                    raise ValueError(f"User {min(non_members)} is not a member of the group")
+            except ValueError as e:
+                results.append({"error": str(e)})
+                continue
+
+            expenses.append(expense)
+            results.append({"expense": expense})
+
+        if expenses:
+            # Ledger, expenses, splits and outbox events all land in one commit
+            with self.uow:
+                self.group_repo.bump_version(group_id)
+                self.balance_repo.apply_deltas(
+                    group_id, BalanceService.calculate_group_balances(expenses, [])
+                )
+                self.expense_repo.create_many(expenses)
+                self.outbox_repo.add_many([
+                    {
+                        "group_id": group_id,
+                        "user_id": created_by_user_id,
+                        "type": ActivityEventType.EXPENSE_CREATED,
+                        "payload": {
+                            "expense_id": expense.id,
+                            "description": expense.description,
+                            "amount_cents": expense.amount_cents,
+                        },
+                    }
+                    for expense in expenses
+                ])
+
+        for result in results:
+            if "expense" in result:
+                result["expense_id"] = result.pop("expense").id
+        return results
+
+    def _build_expense(
+        self,
+        group_id: int,
+        payer_user_id: int,
+        created_by_user_id: int,
+        amount_cents: int,
+        currency_code: str,
+        description: str,
+        notes: Optional[str] = None,
+        category_id: Optional[int] = None,
+        split_type: SplitType = SplitType.EQUAL,
+        split_data: Dict = None,
+        items: Optional[List[Dict]] = None,
+    ) -> Expense:
+        """Build an unsaved expense with its items and splits."""
         expense = Expense(
             group_id=group_id,
             payer_user_id=payer_user_id,
@@ -59,13 +188,13 @@ class ExpenseServiceApp:
             # Create items and their splits
             total_items_cents = 0
             for item_data in items:
-                item = ExpenseItem(
+                # The expense backref appends the item to expense.items
+                ExpenseItem(
                     expense=expense,
                     description=item_data["description"],
                     amount_cents=item_data["amount_cents"],
                     category_id=item_data.get("category_id"),
                 )
-                expense.items.append(item)
                 total_items_cents += item_data["amount_cents"]
 
             # Validate total matches
@@ -81,24 +210,6 @@ class ExpenseServiceApp:
             splits = ExpenseService.create_expense_splits(expense, split_type, split_data)
             expense.splits = splits
 
-        # Validate all participants are group members
-        participant_ids = {s.user_id for s in expense.splits}
-        for user_id in participant_ids:
-            if not self.group_repo.is_member(group_id, user_id):
-                raise ValueError(f"User {user_id} is not a member of the group")
-
-        # Save expense
-        expense = self.expense_repo.create(expense)
-
-        # Create activity event
-        activity_event = ActivityEvent(
-            group_id=group_id,
-            user_id=created_by_user_id,
-            type=ActivityEventType.EXPENSE_CREATED,
-            payload={"expense_id": expense.id, "description": description, "amount_cents": amount_cents},
-        )
-        self.activity_repo.create(activity_event)
-
         return expense
 
     def update_expense(
@@ -120,38 +231,51 @@ class ExpenseServiceApp:
         if not self.group_repo.is_member(expense.group_id, user_id):
             raise ValueError("User is not a member of the group")
 
-        # Update fields
-        if amount_cents is not None:
-            expense.amount_cents = amount_cents
-        if description is not None:
-            expense.description = description
-        if notes is not None:
-            expense.notes = notes
-
-        # Update splits if provided
-        if split_type and split_data:
-            # Clear existing splits
-            self.db.query(ExpenseSplit).filter(ExpenseSplit.expense_id == expense_id).delete()
-
-            # Create new splits
-            if expense.items:
-                for item in expense.items:
-                    item_splits = ExpenseService.create_item_splits(item, split_type, split_data)
-                    expense.splits.extend(item_splits)
-            else:
-                splits = ExpenseService.create_expense_splits(expense, split_type, split_data)
-                expense.splits = splits
-
-        expense = self.expense_repo.update(expense)
-
-        # Create activity event
-        activity_event = ActivityEvent(
-            group_id=expense.group_id,
-            user_id=user_id,
-            type=ActivityEventType.EXPENSE_UPDATED,
-            payload={"expense_id": expense.id},
-        )
-        self.activity_repo.create(activity_event)
+        old_balances = BalanceService.calculate_group_balances([expense], [])
+
+        with self.uow:
+            self.group_repo.bump_version(expense.group_id)
+            # Update fields
+            if amount_cents is not None:
+                expense.amount_cents = amount_cents
+            if description is not None:
+                expense.description = description
+            if notes is not None:
+                expense.notes = notes
+
+            # Update splits if provided
+            if split_type and split_data:
+                # Clear existing splits
+                self.db.query(ExpenseSplit).filter(
+                    ExpenseSplit.group_id == expense.group_id, ExpenseSplit.expense_id == expense_id
+                ).delete()
+
+                # Create new splits
+                if expense.items:
+                    expense.splits = [
+                        split
+                        for item in expense.items
+                        for split in ExpenseService.create_item_splits(item, split_type, split_data)
+                    ]
+                else:
+                    splits = ExpenseService.create_expense_splits(expense, split_type, split_data)
+                    expense.splits = splits
+
+            new_balances = BalanceService.calculate_group_balances([expense], [])
+            self.balance_repo.apply_deltas(
+                expense.group_id, BalanceService.diff_balances(new_balances, old_balances)
+            )
+            self.balance_repo.invalidate_checkpoints(expense.group_id, expense.occurred_at)
+            expense = self.expense_repo.update(expense)
+
+            # Append activity event to the outbox
+            activity_event = OutboxEvent(
+                group_id=expense.group_id,
+                user_id=user_id,
+                type=ActivityEventType.EXPENSE_UPDATED,
+                payload={"expense_id": expense.id},
+            )
+            self.outbox_repo.add(activity_event)
 
         return expense
 
@@ -165,17 +289,38 @@ class ExpenseServiceApp:
         if not self.group_repo.is_member(expense.group_id, user_id):
             raise ValueError("User is not a member of the group")
 
-        self.expense_repo.soft_delete(expense_id)
+        with self.uow:
+            self.group_repo.bump_version(expense.group_id)
+            self.balance_repo.apply_deltas(
+                expense.group_id,
+                BalanceService.diff_balances({}, BalanceService.calculate_group_balances([expense], [])),
+            )
+            self.balance_repo.invalidate_checkpoints(expense.group_id, expense.occurred_at)
+            self.expense_repo.soft_delete(expense_id)
 
-        # Create activity event
-        activity_event = ActivityEvent(
-            group_id=expense.group_id,
-            user_id=user_id,
-            type=ActivityEventType.EXPENSE_DELETED,
-            payload={"expense_id": expense.id},
-        )
-        self.activity_repo.create(activity_event)
+            # Append activity event to the outbox
+            activity_event = OutboxEvent(
+                group_id=expense.group_id,
+                user_id=user_id,
+                type=ActivityEventType.EXPENSE_DELETED,
+                payload={"expense_id": expense.id},
+            )
+            self.outbox_repo.add(activity_event)
+
+    def preview_splits(self, group_id: int, user_id: int, requests: List[Dict]) -> List[Dict]:
+        """
+        Calculate splits for many prospective expenses without saving anything.
+        requests: list of {amount_cents, split_type, split_data}
+        """
+        if not self.group_repo.is_member(group_id, user_id):
+            raise ValueError("User is not a member of the group")
+
+        return ExpenseService.calculate_splits_batch(requests)
 
-    def get_group_expenses(self, group_id: int, limit: int = 50, offset: int = 0) -> List[Expense]:
-        """Get paginated expenses for a group."""
-        return self.expense_repo.get_group_expenses(group_id, limit, offset)
+    def get_group_expenses(
+        self, group_id: int, limit: int = 50, cursor: Optional[str] = None
+    ) -> Tuple[List[ExpenseView], Optional[str]]:
+        """Get a page of expenses for a group and the cursor for the next page."""
+        before = decode_cursor(cursor) if cursor else None
+        expenses = self.expense_repo.get_group_expenses(group_id, limit + 1, before)
+        return paginate(expenses, limit, lambda e: (e.occurred_at, e.id))
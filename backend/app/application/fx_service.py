@@ -0,0 +1,39 @@
+"""
+Application service for currency conversion.
+"""
+from typing import Dict
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.infrastructure.repositories.fx_rate_repository import FxRateRepository
+from app.domain.currency_conversion import CurrencyConversionService
+
+# Latest rates and currency precisions, shared by all requests in the process
+_rate_cache = TTLCache(maxsize=1, ttl=settings.FX_RATE_CACHE_TTL_SECONDS)
+
+
+class FxService:
+    """Application service for converting balances between currencies."""
+
+    def __init__(self, db: Session):
+        self.fx_repo = FxRateRepository(db)
+        self.db = db
+
+    def _get_rate_snapshot(self):
+        """Get (rates, precisions), loading them at most once per cache TTL."""
+        snapshot = _rate_cache.get("latest")
+        if snapshot is None:
+            snapshot = (self.fx_repo.get_latest_rates(), self.fx_repo.get_precisions())
+            _rate_cache.set("latest", snapshot)
+        return snapshot
+
+    def convert_balances(
+        self, balances: Dict[str, Dict[int, int]], target_currency: str
+    ) -> Dict[str, Dict[int, int]]:
+        """Convert {currency: {user_id: cents}} balances into the target currency."""
+        rates, precisions = self._get_rate_snapshot()
+        converted = CurrencyConversionService.convert_balances(
+            balances, target_currency, rates, precisions
+        )
+        return {target_currency: converted} if converted else {}
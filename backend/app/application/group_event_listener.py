@@ -0,0 +1,111 @@
+"""
+Group event listener: feeds this process's live group streams from Postgres NOTIFY.
+"""
+import logging
+import select
+import threading
+from typing import Callable, List, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.pubsub import GROUP_EVENTS_CHANNEL, GroupEventBroker, group_events
+from app.infrastructure.repositories.activity_repository import ActivityRepository
+
+logger = logging.getLogger(__name__)
+
+
+class GroupEventListener:
+    """
+    LISTENs on GROUP_EVENTS_CHANNEL on a background thread and publishes the
+    notified activity events to the broker.
+
+    Outbox delivery NOTIFYs the ids of each batch when it commits, whichever
+    process delivered it, so every process's streams see every event, in
+    commit order. The listener holds one connection outside the pool and loads
+    each burst of ids in one query. If the connection drops, notifications sent
+    meanwhile are lost: every subscriber is then made to resume from the
+    database, and the listener reconnects after STREAM_LISTENER_RETRY_SECONDS.
+    """
+
+    def __init__(
+        self,
+        broker: GroupEventBroker = group_events,
+        bind: Engine = engine,
+        session_factory: Callable[[], Session] = SessionLocal,
+        poll_seconds: float = 1,
+    ):
+        self.broker = broker
+        self.bind = bind
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def publish(self, event_ids: List[int]) -> None:
+        """Load notified events and publish them to their groups' subscribers."""
+        db = self.session_factory()
+        try:
+            rows = ActivityRepository(db).get_by_ids(event_ids)
+        finally:
+            db.close()
+        self.broker.publish_many((row.group_id, row) for row in rows)
+
+    def listen(self) -> None:
+        """Listen on one connection until stopped or the connection fails."""
+        connection = self.bind.raw_connection()
+        driver_connection = connection.driver_connection
+        # Held for as long as the listener runs, so it does not count against the pool
+        connection.detach()
+        try:
+            driver_connection.autocommit = True
+            with driver_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {GROUP_EVENTS_CHANNEL}")
+            while not self._stop.is_set():
+                if not select.select([driver_connection], [], [], self.poll_seconds)[0]:
+                    continue
+                driver_connection.poll()
+                event_ids = []
+                while driver_connection.notifies:
+                    notify = driver_connection.notifies.pop(0)
+                    event_ids.extend(int(event_id) for event_id in notify.payload.split(","))
+                if event_ids:
+                    self.publish(event_ids)
+        finally:
+            driver_connection.close()
+
+    def run(self) -> None:
+        """Listen until stopped, reconnecting after failures."""
+        while not self._stop.is_set():
+            try:
+                self.listen()
+            except Exception:
+                logger.exception(
+                    "Group event listener failed; reconnecting in %ss", settings.STREAM_LISTENER_RETRY_SECONDS
+                )
+                # Events may have been missed: streams resume from their Last-Event-ID
+                self.broker.overflow_all()
+                self._stop.wait(settings.STREAM_LISTENER_RETRY_SECONDS)
+
+    def start(self) -> None:
+        """Start listening on a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="group-event-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        """Stop within poll_seconds."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+# The listener of this API process, started with the app
+group_event_listener = GroupEventListener()
@@ -4,11 +4,7 @@ Application service for group operations.
 from typing import List
 from sqlalchemy.orm import Session
 
-from app.infrastructure.repositories.group_repository import GroupRepository
-from app.infrastructure.repositories.user_repository import UserRepository
-from app.infrastructure.repositories.expense_repository import ExpenseRepository
-from app.infrastructure.repositories.settlement_repository import SettlementRepository
-from app.domain.balance_service import BalanceService
+from app.infrastructure.unit_of_work import UnitOfWork
 from app.infrastructure.db.models import Group
 
 
@@ -16,10 +12,10 @@ class GroupService:
     """Application service for group operations."""
 
     def __init__(self, db: Session):
-        self.group_repo = GroupRepository(db)
-        self.user_repo = UserRepository(db)
-        self.expense_repo = ExpenseRepository(db)
-        self.settlement_repo = SettlementRepository(db)
+        self.uow = UnitOfWork(db)
+        self.group_repo = self.uow.groups
+        self.user_repo = self.uow.users
+        self.balance_repo = self.uow.balances
         self.db = db
 
     def get_user_groups(self, user_id: int) -> List[Group]:
@@ -35,12 +31,8 @@ class GroupService:
         if not self.group_repo.is_member(group_id, user_id):
             raise ValueError("User is not a member of this group")
 
-        # Get expenses and settlements for balance calculation
-        expenses = self.expense_repo.get_group_expenses(group_id, limit=1000)  # Get all for balance calc
-        settlements = self.settlement_repo.get_group_settlements(group_id)
-
-        # Calculate balances
-        balances = BalanceService.calculate_group_balances(expenses, settlements)
+        # Read materialized balances from the ledger
+        balances = self.balance_repo.get_group_balances(group_id)
 
         # Get user's balance summary
         user_balance_summary = {}
@@ -55,7 +47,8 @@ class GroupService:
 
     def create_group(self, name: str, created_by_user_id: int, default_currency: str = "USD") -> Group:
         """Create a new group."""
-        return self.group_repo.create(name, created_by_user_id, default_currency)
+        with self.uow:
+            return self.group_repo.create(name, created_by_user_id, default_currency)
 
     def add_member(self, group_id: int, user_email: str, added_by_user_id: int) -> Group:
         """Add a user to a group by email."""
@@ -76,6 +69,8 @@ class GroupService:
         if self.group_repo.is_member(group_id, user.id):
             raise ValueError("User is already a member of this group")
 
-        # Add member
-        self.group_repo.add_member(group_id, user.id)
-        return self.group_repo.get_by_id(group_id)
+        # Add member; the loaded group picks it up, so no reload is needed
+        with self.uow:
+            self.group_repo.bump_version(group_id)
+            self.group_repo.add_member(group_id, user.id)
+        return group
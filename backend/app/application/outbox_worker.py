@@ -0,0 +1,212 @@
+"""
+Outbox worker: delivers the activity events services append to the outbox.
+"""
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.pubsub import GROUP_EVENTS_CHANNEL
+from app.infrastructure.repositories.activity_repository import ActivityRepository
+from app.infrastructure.repositories.group_repository import GroupRepository
+from app.infrastructure.repositories.outbox_repository import OUTBOX_WRITTEN, OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+# Receives each batch, in id order, inside the delivery transaction. It may return
+# a callable to run once the batch has committed, e.g. to notify in-process listeners
+OutboxConsumer = Callable[[Session, List[Row]], Optional[Callable[[], None]]]
+
+
+def write_activity_events(db: Session, events: List[Row]) -> None:
+    """
+    Consumer: copy a batch into activity_events, keeping each event's original
+    created_at. The new ids are NOTIFYed on commit, so the group event listener
+    of every API process publishes them to its live group streams.
+    """
+    activity_repo = ActivityRepository(db)
+    rows = activity_repo.create_many([
+        {
+            "group_id": e.group_id,
+            "user_id": e.user_id,
+            "type": e.type,
+            "payload": e.payload,
+            "created_at": e.created_at,
+        }
+        for e in events
+    ])
+    # The activity feed of these groups changed
+    GroupRepository(db).bump_versions(row.group_id for row in rows if row.group_id is not None)
+    activity_repo.notify_delivered([row.id for row in rows if row.group_id is not None], GROUP_EVENTS_CHANNEL)
+
+
+class OutboxStats:
+    """Delivery counters of one worker; shared by the worker thread and the metrics route."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.delivered = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_delivered_at: Optional[datetime] = None
+        # Lag: from an event's commit in the outbox to the commit of its delivery
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+
+    def record(self, events: List[Row]) -> None:
+        """Record one committed batch; its lag is that of its oldest event."""
+        now = datetime.now(timezone.utc)
+        lag = max((now - events[0].created_at).total_seconds(), 0.0)
+        with self._lock:
+            self.batches += 1
+            self.delivered += len(events)
+            self.last_delivered_at = now
+            self.last_lag_seconds = lag
+            self.max_lag_seconds = max(self.max_lag_seconds, lag)
+
+    def record_failure(self, error: Exception) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = repr(error)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "delivered": self.delivered,
+                "failures": self.failures,
+                "last_error": self.last_error,
+                "last_delivered_at": self.last_delivered_at,
+                "last_lag_seconds": round(self.last_lag_seconds, 3),
+                "max_lag_seconds": round(self.max_lag_seconds, 3),
+            }
+
+
+class OutboxWorker:
+    """
+    Moves outbox events to their consumers in batches, on a background thread.
+
+    Each batch is taken (deleted) from the outbox, handed to every consumer and
+    committed in one transaction. If a consumer raises, the transaction rolls
+    back, the events return to the outbox and the batch is retried after
+    OUTBOX_RETRY_SECONDS. Delivery is therefore at-least-once: a consumer with
+    side effects outside the transaction must tolerate seeing a batch twice.
+    activity_events is written inside it, so each event lands there exactly once.
+
+    Delivery is single-writer: every batch is delivered under a transaction-level
+    advisory lock, so with a worker in each API process (and perhaps the script)
+    batches still commit one at a time. An activity event id is drawn inside that
+    transaction, so once an id is visible every lower id is too. Readers that
+    resume after an id rely on this: stream Last-Event-ID and sync tokens.
+
+    Full batches are delivered back to back. Otherwise the worker sleeps for
+    OUTBOX_POLL_SECONDS, or until a session of this process commits outbox events.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        consumers: Optional[List[OutboxConsumer]] = None,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        poll_seconds: float = settings.OUTBOX_POLL_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.consumers = list(consumers) if consumers is not None else [write_activity_events]
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.stats = OutboxStats()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_consumer(self, consumer: OutboxConsumer) -> None:
+        """Register another consumer; it receives every batch delivered from now on."""
+        self.consumers.append(consumer)
+
+    def deliver_batch(self) -> int:
+        """Deliver one batch in one transaction; returns how many events it held."""
+        db = self.session_factory()
+        try:
+            outbox_repo = OutboxRepository(db)
+            outbox_repo.lock_delivery()
+            events = outbox_repo.take_batch(self.batch_size)
+            if not events:
+                db.rollback()
+                return 0
+            after_commit = [consumer(db, events) for consumer in self.consumers]
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.stats.record_failure(e)
+            raise
+        finally:
+            db.close()
+        self.stats.record(events)
+        for action in after_commit:
+            if action is None:
+                continue
+            try:
+                action()
+            except Exception:
+                # The batch is delivered; retrying it would duplicate it in activity_events
+                logger.exception("Outbox after-commit action failed")
+        return len(events)
+
+    def drain(self) -> int:
+        """Deliver batches until the outbox is empty; returns how many events were delivered."""
+        delivered = 0
+        while True:
+            count = self.deliver_batch()
+            delivered += count
+            if count < self.batch_size:
+                return delivered
+
+    def run(self) -> None:
+        """Deliver until stopped."""
+        while not self._stop.is_set():
+            # Cleared before taking the batch, so a commit during delivery still wakes the next wait
+            self._wake.clear()
+            try:
+                delivered = self.deliver_batch()
+            except Exception:
+                logger.exception("Outbox delivery failed; retrying in %ss", settings.OUTBOX_RETRY_SECONDS)
+                self._stop.wait(settings.OUTBOX_RETRY_SECONDS)
+                continue
+            if delivered < self.batch_size:
+                self._wake.wait(self.poll_seconds)
+
+    def _after_commit(self, session: Session) -> None:
+        if session.info.pop(OUTBOX_WRITTEN, False):
+            self._wake.set()
+
+    def start(self) -> None:
+        """Start delivering on a daemon thread."""
+        self._stop.clear()
+        event.listen(Session, "after_commit", self._after_commit)
+        self._thread = threading.Thread(target=self.run, name="outbox-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        """Stop after the batch in progress, if any."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if event.contains(Session, "after_commit", self._after_commit):
+            event.remove(Session, "after_commit", self._after_commit)
+
+
+# The worker of this API process, started with the app when OUTBOX_WORKER_ENABLED
+outbox_worker = OutboxWorker()
@@ -4,19 +4,21 @@ Application service for settlement operations.
 from typing import List
 from sqlalchemy.orm import Session
 
-from app.infrastructure.repositories.settlement_repository import SettlementRepository
-from app.infrastructure.repositories.group_repository import GroupRepository
-from app.infrastructure.repositories.activity_repository import ActivityRepository
-from app.infrastructure.db.models import Settlement, ActivityEventType
+from app.infrastructure.unit_of_work import UnitOfWork
+from app.domain.balance_service import BalanceService
+from app.infrastructure.db.models import Settlement, OutboxEvent, ActivityEventType
 
 
 class SettlementService:
     """Application service for settlement operations."""
 
     def __init__(self, db: Session):
-        self.settlement_repo = SettlementRepository(db)
-        self.group_repo = GroupRepository(db)
-        self.activity_repo = ActivityRepository(db)
+        self.uow = UnitOfWork(db)
+        self.settlement_repo = self.uow.settlements
+        self.expense_repo = self.uow.expenses
+        self.group_repo = self.uow.groups
+        self.outbox_repo = self.uow.outbox
+        self.balance_repo = self.uow.balances
         self.db = db
 
     def create_settlement(
@@ -39,6 +41,11 @@ class SettlementService:
         if from_user_id == to_user_id:
             raise ValueError("Cannot settle with yourself")
 
+        # Checked up front, as in create_expense: an unknown code would fail the
+        # settlement's foreign key at commit instead of being reported
+        if not self.expense_repo.get_existing_currency_codes([currency_code]):
+            raise ValueError(f"Unknown currency {currency_code}")
+
         # Create settlement
         settlement = Settlement(
             group_id=group_id,
@@ -50,21 +57,26 @@ class SettlementService:
             notes=notes,
         )
 
-        settlement = self.settlement_repo.create(settlement)
+        with self.uow:
+            self.group_repo.bump_version(group_id)
+            self.balance_repo.apply_deltas(
+                group_id, BalanceService.calculate_group_balances([], [settlement])
+            )
+            settlement = self.settlement_repo.create(settlement)
 
-        # Create activity event
-        activity_event = ActivityEvent(
-            group_id=group_id,
-            user_id=created_by_user_id,
-            type=ActivityEventType.SETTLEMENT_CREATED,
-            payload={
-                "settlement_id": settlement.id,
-                "from_user_id": from_user_id,
-                "to_user_id": to_user_id,
-                "amount_cents": amount_cents,
-            },
-        )
-        self.activity_repo.create(activity_event)
+            # Append activity event to the outbox
+            activity_event = OutboxEvent(
+                group_id=group_id,
+                user_id=created_by_user_id,
+                type=ActivityEventType.SETTLEMENT_CREATED,
+                payload={
+                    "settlement_id": settlement.id,
+                    "from_user_id": from_user_id,
+                    "to_user_id": to_user_id,
+                    "amount_cents": amount_cents,
+                },
+            )
+            self.outbox_repo.add(activity_event)
 
         return settlement
 
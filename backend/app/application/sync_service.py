@@ -0,0 +1,204 @@
+"""
+Application service for offline clients: delta sync and replayed mutations.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import logging
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.infrastructure.unit_of_work import UnitOfWork
+from app.application.expense_service import ExpenseServiceApp
+from app.application.settlement_service import SettlementService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SyncToken:
+    """Where a client's last sync left off."""
+    synced_at: datetime  # Database time of the sync
+    activity_id: int  # Activity event id the client has read up to; lower ids were all committed by then
+    versions: Dict[int, int] = field(default_factory=dict)  # group_id -> version the client holds
+
+
+def encode_sync_token(token: SyncToken) -> str:
+    """Encode a sync position as an opaque URL-safe token."""
+    raw = json.dumps({
+        "t": token.synced_at.isoformat(),
+        "a": token.activity_id,
+        "v": {str(group_id): version for group_id, version in token.versions.items()},
+    }, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sync_token(value: str) -> SyncToken:
+    """Decode a token from encode_sync_token; raises ValueError if it is malformed."""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+        synced_at = datetime.fromisoformat(raw["t"])
+        if synced_at.tzinfo is None:
+            raise ValueError
+        return SyncToken(
+            synced_at=synced_at,
+            activity_id=int(raw["a"]),
+            versions={int(group_id): int(version) for group_id, version in raw["v"].items()},
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError, AttributeError):
+        raise ValueError("Invalid sync token")
+
+
+class SyncService:
+    """Application service for delta sync and batched offline mutations."""
+
+    def __init__(self, db: Session):
+        self.uow = UnitOfWork(db)
+        self.group_repo = self.uow.groups
+        self.expense_repo = self.uow.expenses
+        self.settlement_repo = self.uow.settlements
+        self.activity_repo = self.uow.activity
+        self.idempotency_repo = self.uow.idempotency_keys
+        self.db = db
+
+    def get_changes(self, user_id: int, since: Optional[SyncToken]) -> Dict[str, Any]:
+        """
+        Get what changed in the user's groups since a token, and the next token.
+
+        Every write bumps its group's version, so only groups whose version
+        differs from the token are queried. Changes are read from
+        SYNC_OVERLAP_SECONDS before the token's time, since a transaction that
+        was still open at the last sync commits rows stamped earlier; rows may
+        therefore be sent twice. Activity is paged by event id after the
+        token's, which misses nothing however late it was delivered: outbox
+        delivery is single-writer, so event ids commit in increasing order. At
+        most SYNC_ACTIVITY_LIMIT events are sent; with has_more_activity, the
+        token stops at the last one and keeps those groups marked changed, so
+        the client syncs again for the rest. Groups the user joined since the
+        token are listed in resync_group_ids, to be fetched in full. Without a
+        token, only the token is returned: the client fetches everything, then
+        syncs from it.
+        """
+        # Transaction start; read first, so everything below is at least this new
+        synced_at = self.db.scalar(select(func.now()))
+        versions = self.group_repo.get_user_group_versions(user_id)
+        token = SyncToken(synced_at, self.activity_repo.get_max_id(), versions)
+        changes: Dict[str, Any] = {
+            "token": token,
+            "groups": [],
+            "expenses": [],
+            "deleted_expense_ids": [],
+            "settlements": [],
+            "activity": [],
+            "has_more_activity": False,
+            "resync_group_ids": [],
+            "removed_group_ids": [],
+        }
+        if since is None:
+            return changes
+
+        changed_ids = sorted(
+            group_id for group_id, version in versions.items()
+            if group_id in since.versions and since.versions[group_id] != version
+        )
+        joined_ids = sorted(set(versions) - set(since.versions))
+        changes["resync_group_ids"] = joined_ids
+        changes["removed_group_ids"] = sorted(set(since.versions) - set(versions))
+        if changed_ids or joined_ids:
+            changes["groups"] = self.group_repo.get_by_ids(changed_ids + joined_ids)
+
+        changed_since = since.synced_at - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)
+        for group_id in changed_ids:
+            expenses, deleted_ids = self.expense_repo.get_changed_expenses(group_id, changed_since)
+            changes["expenses"].extend(expenses)
+            changes["deleted_expense_ids"].extend(deleted_ids)
+            changes["settlements"].extend(self.settlement_repo.get_created_since(group_id, changed_since))
+
+        # One extra event tells whether the page is the last
+        limit = settings.SYNC_ACTIVITY_LIMIT
+        activity = self.activity_repo.get_events_after(changed_ids, since.activity_id, limit + 1)
+        if len(activity) > limit:
+            activity = activity[:limit]
+            changes["has_more_activity"] = True
+            # Resume after the last event sent, and query these groups again next time
+            token.activity_id = activity[-1].id
+            token.versions = {**versions, **{group_id: since.versions[group_id] for group_id in changed_ids}}
+        changes["activity"] = activity
+        return changes
+
+    def apply_mutations(self, user_id: int, mutations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply a client's queued mutations in order, each in its own transaction.
+
+        Each mutation carries a key chosen by the client. The key is claimed,
+        the mutation applied and its result stored in one transaction (the
+        service's unit of work nests inside this one), so a key is recorded
+        with its result exactly when the mutation commits: a replayed key is
+        reported as a duplicate with the original result and not applied again.
+        A rejected mutation records nothing and does not stop the ones after
+        it; neither does an unexpected error (e.g. a database constraint),
+        which is logged and reported the same way, so one bad mutation cannot
+        wedge a client's queue.
+        """
+        results = []
+        for mutation in mutations:
+            key = mutation["idempotency_key"]
+            try:
+                with self.uow:
+                    claimed, stored = self.idempotency_repo.claim(user_id, key)
+                    if not claimed:
+                        results.append({"status": "duplicate", **(stored or {})})
+                        continue
+                    result = self._apply(user_id, mutation)
+                    self.idempotency_repo.save_result(user_id, key, result)
+            except ValueError as e:
+                results.append({"status": "error", "error": str(e)})
+                continue
+            except Exception:
+                logger.exception("Sync mutation %r of user %s failed", key, user_id)
+                results.append({"status": "error", "error": "Mutation could not be applied"})
+                continue
+            results.append({"status": "applied", **result})
+        return results
+
+    def _apply(self, user_id: int, mutation: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply one mutation through the service that owns it; returns the ids it touched."""
+        kind = mutation["type"]
+        if kind in ("create_expense", "create_settlement"):
+            group_id = mutation.get("group_id")
+            if group_id is None:
+                raise ValueError(f"group_id is required for {kind}")
+            if not self.group_repo.is_member(group_id, user_id):
+                raise ValueError("User is not a member of the group")
+        elif mutation.get("expense_id") is None:
+            raise ValueError(f"expense_id is required for {kind}")
+
+        if kind == "create_expense":
+            if mutation.get("expense") is None:
+                raise ValueError("expense is required for create_expense")
+            expense = ExpenseServiceApp(self.db).create_expense(
+                group_id=group_id, created_by_user_id=user_id, **mutation["expense"]
+            )
+            return {"expense_id": expense.id}
+        if kind == "update_expense":
+            if mutation.get("expense_update") is None:
+                raise ValueError("expense_update is required for update_expense")
+            expense = ExpenseServiceApp(self.db).update_expense(
+                expense_id=mutation["expense_id"], user_id=user_id, **mutation["expense_update"]
+            )
+            return {"expense_id": expense.id}
+        if kind == "delete_expense":
+            ExpenseServiceApp(self.db).delete_expense(mutation["expense_id"], user_id)
+            return {"expense_id": mutation["expense_id"]}
+        if kind == "create_settlement":
+            if mutation.get("settlement") is None:
+                raise ValueError("settlement is required for create_settlement")
+            settlement = SettlementService(self.db).create_settlement(
+                group_id=group_id, created_by_user_id=user_id, **mutation["settlement"]
+            )
+            return {"settlement_id": settlement.id}
+        raise ValueError(f"Unknown mutation type {kind}")
@@ -1,13 +1,148 @@
 """
 Database session management.
 """
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Dict, Hashable, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, echo=False)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class PoolWaitStats:
+    """Cumulative checkout wait times for one pool; shared by all threads of the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, wait_seconds: float, timed_out: bool = False) -> None:
+        """Record one checkout attempt."""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+
+class _TimedPoolMixin:
+    """Times how long each checkout waits for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # Keep the counters across engine.dispose()
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """QueuePool that records checkout wait times."""
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait times."""
+
+
+def _pool_options(poolclass) -> Dict:
+    """Engine keyword arguments for the configured pool."""
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        # Drop connections the server closed (restarts, idle timeouts) instead of failing a request
+        "pool_pre_ping": True,
+    }
+
+
+def _statement_timeout() -> str:
+    return f"{settings.DB_STATEMENT_TIMEOUT_MS}ms"
+
+
+# Sync engine: scripts, background tasks and CPU-bound routes (password hashing)
+engine = create_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    connect_args={"options": f"-c statement_timeout={_statement_timeout()}"},
+    **_pool_options(TimedQueuePool),
+)
+# Objects stay loaded after commit, so services return what they wrote without reloading it
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Async engine for API routes: the same database through asyncpg, so queries
+# never block the event loop
+async_engine = create_async_engine(
+    make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    echo=False,
+    connect_args={"server_settings": {"statement_timeout": _statement_timeout()}},
+    **_pool_options(TimedAsyncQueuePool),
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Optional read replica for GET routes (see open_read_session)
+replica_engine = create_async_engine(
+    make_url(settings.DATABASE_REPLICA_URL).set(drivername="postgresql+asyncpg"),
+    echo=False,
+    connect_args={
+        "server_settings": {"statement_timeout": _statement_timeout()},
+        "timeout": settings.DB_REPLICA_CONNECT_TIMEOUT_SECONDS,
+    },
+    **_pool_options(TimedAsyncQueuePool),
+) if settings.DATABASE_REPLICA_URL else None
+ReplicaSessionLocal = (
+    async_sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False)
+    if replica_engine else None
+)
+
+# Users who wrote within READ_YOUR_WRITES_SECONDS, so their reads skip the lagging replica.
+# In-process: with several workers, a read may land on a worker that did not see the write.
+recent_writers = TTLCache(maxsize=100_000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+class _ReplicaHealth:
+    """Backs off from the replica for a while after it fails."""
+
+    def __init__(self):
+        self.down_until = 0.0
+        self.failures = 0
+
+    def is_down(self) -> bool:
+        return time.monotonic() < self.down_until
+
+    def mark_down(self) -> None:
+        self.failures += 1
+        self.down_until = time.monotonic() + settings.DB_REPLICA_RETRY_SECONDS
+
+
+replica_health = _ReplicaHealth()
 
 
 def get_db() -> Session:
@@ -19,3 +154,60 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency for FastAPI routes to get an async database session.
+    Sync application services run on it through `await db.run_sync(...)`.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def record_write(user_id: Hashable) -> None:
+    """Send the user's reads to the primary for the read-your-writes window."""
+    if settings.READ_YOUR_WRITES_SECONDS > 0:
+        recent_writers.set(user_id, True)
+
+
+async def open_read_session(user_id: Optional[Hashable] = None) -> AsyncSession:
+    """
+    Open a session for read-only work: on the replica when one is configured,
+    healthy, and the user has not written recently; otherwise on the primary.
+    The replica connection is checked out up front, so a replica that is down
+    falls back to the primary instead of failing the request.
+    """
+    if (
+        ReplicaSessionLocal is None
+        or replica_health.is_down()
+        or (user_id is not None and recent_writers.get(user_id))
+    ):
+        return AsyncSessionLocal()
+
+    db = ReplicaSessionLocal()
+    try:
+        await db.connection()
+    except (DBAPIError, OSError, asyncio.TimeoutError):
+        await db.close()
+        replica_health.mark_down()
+        return AsyncSessionLocal()
+    return db
+
+
+def pool_stats(pool_engine: Engine) -> Dict:
+    """Current occupancy and cumulative checkout waits of an engine's pool."""
+    pool = pool_engine.pool
+    wait_stats = pool.wait_stats
+    attempts = wait_stats.checkouts + wait_stats.timeouts
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checkouts": wait_stats.checkouts,
+        "timeouts": wait_stats.timeouts,
+        "wait_ms_avg": round(wait_stats.wait_seconds_total / attempts * 1000, 3) if attempts else 0.0,
+        "wait_ms_max": round(wait_stats.wait_seconds_max * 1000, 3),
+    }
@@ -0,0 +1,114 @@
+"""
+In-process publish/subscribe of group events, for the live group streams.
+
+Events reach every API process through Postgres NOTIFY on GROUP_EVENTS_CHANNEL
+(see app/application/group_event_listener.py), then fan out in-process here.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Set, Tuple
+
+from app.core.config import settings
+
+# Queued after the last event a slow subscriber was sent before falling behind
+OVERFLOW = object()
+
+# Postgres NOTIFY channel carrying the ids of delivered activity events
+GROUP_EVENTS_CHANNEL = "group_events"
+
+
+class Subscription:
+    """One stream's queue of events for one group, owned by the event loop that subscribed."""
+
+    def __init__(self, group_id: int, max_pending: int):
+        self.group_id = group_id
+        self.max_pending = max_pending
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.overflowed = False
+
+    def _offer(self, event: Any) -> None:
+        """Queue an event, or mark the subscription overflowed once max_pending are waiting."""
+        if self.overflowed:
+            return
+        if self.queue.qsize() >= self.max_pending:
+            self.overflowed = True
+            self.queue.put_nowait(OVERFLOW)
+        else:
+            self.queue.put_nowait(event)
+
+    def _overflow(self) -> None:
+        """End the subscription as if it fell behind, so the client resumes from the database."""
+        if not self.overflowed:
+            self.overflowed = True
+            self.queue.put_nowait(OVERFLOW)
+
+    async def get(self) -> Any:
+        """Wait for the next event, or OVERFLOW if the subscriber fell too far behind."""
+        return await self.queue.get()
+
+
+class GroupEventBroker:
+    """
+    Fans events out to the subscribers of each group in this process.
+
+    publish() never blocks and is safe from any thread: each event is handed
+    to the subscriber's event loop. A subscriber that lets STREAM_MAX_PENDING
+    events pile up gets OVERFLOW instead of further events, so one slow
+    client costs bounded memory and never slows publishing; it is expected
+    to drop the subscription and resume from its last event.
+    """
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+
+    def subscribe(self, group_id: int) -> Subscription:
+        """Subscribe to a group's events; call from the event loop that will consume them."""
+        subscription = Subscription(group_id, self.max_pending)
+        with self._lock:
+            self._subscribers[group_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.group_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.group_id]
+
+    def publish_many(self, events: Iterable[Tuple[int, Any]]) -> None:
+        """Publish (group_id, event) pairs, in order."""
+        for group_id, event in events:
+            with self._lock:
+                subscribers = list(self._subscribers.get(group_id, ()))
+            for subscription in subscribers:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription._offer, event)
+                except RuntimeError:
+                    # The subscriber's loop has closed; the stream is gone
+                    self.unsubscribe(subscription)
+
+    def overflow_all(self) -> None:
+        """Make every subscriber resume, e.g. after events may have been lost upstream."""
+        with self._lock:
+            subscribers = [s for group in self._subscribers.values() for s in group]
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._overflow)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "groups": len(self._subscribers),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+            }
+
+
+# Activity events of each group, published by the group event listener once delivered
+group_events = GroupEventBroker(settings.STREAM_MAX_PENDING)
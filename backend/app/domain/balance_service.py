@@ -30,7 +30,7 @@ class BalanceService:
         
         Logic:
         - For each expense split: user owes amount to payer
-        - For each settlement: from_user pays to_user
+        - For each settlement: from_user pays to_user, reducing what from_user owes
         - Net balance = sum(amounts owed to user) - sum(amounts user owes)
         """
         balances: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
@@ -59,13 +59,49 @@ class BalanceService:
             to_user_id = settlement.to_user_id
             amount = settlement.amount_cents
 
-            # from_user pays to_user
-            balances[currency][from_user_id] -= amount
-            balances[currency][to_user_id] += amount
+            # from_user pays to_user: from_user owes less, to_user is owed less
+            balances[currency][from_user_id] += amount
+            balances[currency][to_user_id] -= amount
 
         # Convert defaultdict to regular dict
         return {currency: dict(balances[currency]) for currency in balances}
 
+    @staticmethod
+    def diff_balances(
+        new: Dict[str, Dict[int, int]],
+        old: Dict[str, Dict[int, int]],
+    ) -> Dict[str, Dict[int, int]]:
+        """
+        Compute the per-user delta that turns `old` balances into `new` ones.
+        Used to update the balance ledger when an expense is edited or removed.
+        """
+        deltas: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        for currency, user_balances in new.items():
+            for user_id, amount in user_balances.items():
+                deltas[currency][user_id] += amount
+        for currency, user_balances in old.items():
+            for user_id, amount in user_balances.items():
+                deltas[currency][user_id] -= amount
+
+        return {currency: dict(deltas[currency]) for currency in deltas}
+
+    @staticmethod
+    def add_balances(
+        base: Dict[str, Dict[int, int]],
+        delta: Dict[str, Dict[int, int]],
+    ) -> Dict[str, Dict[int, int]]:
+        """
+        Add a balance delta onto base balances.
+        Used to roll a balance checkpoint forward to a later point in time.
+        """
+        totals: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        for balances in (base, delta):
+            for currency, user_balances in balances.items():
+                for user_id, amount in user_balances.items():
+                    totals[currency][user_id] += amount
+
+        return {currency: dict(totals[currency]) for currency in totals}
+
     @staticmethod
     def get_user_balance_in_group(
         expenses: List[Expense],
@@ -92,3 +128,16 @@ class BalanceService:
         """
         balances = BalanceService.calculate_group_balances(expenses, settlements)
         return {currency: balances.get(currency, {}).get(user_id, 0) for currency in balances}
+
+    @staticmethod
+    def sum_user_balances(group_balances: List[Dict[str, int]]) -> Dict[str, int]:
+        """
+        Sum one user's per-group balances into an overall position per currency.
+        group_balances: list of {currency_code: balance_cents}, one per group
+        Returns: {currency_code: balance_cents}
+        """
+        totals: Dict[str, int] = defaultdict(int)
+        for balances in group_balances:
+            for currency, amount in balances.items():
+                totals[currency] += amount
+        return dict(totals)
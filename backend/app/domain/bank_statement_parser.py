@@ -0,0 +1,178 @@
+"""
+Domain parsers for bank statement exports.
+Streaming CSV and OFX parsing: lines go in one at a time, transactions come out
+one at a time, so statements of any size parse in constant memory.
+"""
+import csv
+import re
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Dict, Iterable, Iterator, Optional
+
+# Accepted CSV header names per field (compared lowercased)
+_CSV_COLUMNS = {
+    "date": ("date", "posted", "posting date", "transaction date"),
+    "description": ("description", "payee", "name", "memo"),
+    "amount": ("amount",),
+    "debit": ("debit", "withdrawal"),
+    "credit": ("credit", "deposit"),
+    "currency": ("currency", "currency code"),
+    "reference": ("reference", "id", "transaction id"),
+}
+_CSV_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y")
+
+_OFX_TAG = re.compile(r"<(/?[A-Za-z0-9.]+)>([^<\r\n]*)")
+_OFX_DATE = re.compile(r"(\d{8})(\d{6})?(?:\.\d+)?(?:\[([+-]?\d+(?:\.\d+)?)(?::\w+)?\])?")
+
+
+class BankStatementParser:
+    """
+    Domain service for parsing bank statements.
+
+    Each parser yields one dict per transaction:
+        {line, occurred_at, amount_cents, description, currency_code, reference}
+    where amount_cents is negative for money leaving the account and
+    currency_code is None when the statement does not say. Rows that cannot be
+    parsed yield {line, error} instead, so one bad row does not stop the import.
+    """
+
+    @staticmethod
+    def parse(filename: str, lines: Iterable[str]) -> Iterator[Dict]:
+        """Parse a statement, choosing OFX or CSV by file extension."""
+        if filename.lower().endswith((".ofx", ".qfx")):
+            return BankStatementParser.parse_ofx(lines)
+        return BankStatementParser.parse_csv(lines)
+
+    @staticmethod
+    def parse_csv(lines: Iterable[str]) -> Iterator[Dict]:
+        """
+        Parse a CSV export with a header row.
+        Needs date and description columns, plus either a signed amount column
+        or separate debit/credit columns. Dates are YYYY-MM-DD or MM/DD/YYYY.
+        """
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = BankStatementParser._csv_columns(header)
+
+        def cell(row: list, field: str) -> str:
+            return row[columns[field]].strip() if field in columns else ""
+
+        for row in reader:
+            if not any(value.strip() for value in row):
+                continue
+            line = reader.line_num
+            try:
+                if "amount" in columns:
+                    amount_cents = BankStatementParser.parse_amount(cell(row, "amount"))
+                else:
+                    debit, credit = cell(row, "debit"), cell(row, "credit")
+                    amount_cents = (
+                        BankStatementParser.parse_amount(credit) if credit else 0
+                    ) - abs(BankStatementParser.parse_amount(debit) if debit else 0)
+
+                yield {
+                    "line": line,
+                    "occurred_at": BankStatementParser._parse_csv_date(cell(row, "date")),
+                    "amount_cents": amount_cents,
+                    "description": cell(row, "description") or "Bank transaction",
+                    "currency_code": cell(row, "currency").upper() or None,
+                    "reference": cell(row, "reference") or None,
+                }
+            except (ValueError, IndexError) as e:
+                yield {"line": line, "error": str(e) or "Malformed row"}
+
+    @staticmethod
+    def _csv_columns(header: list) -> Dict[str, int]:
+        """Map field names to column positions from a CSV header row."""
+        names = [name.strip().lower() for name in header]
+        columns = {}
+        for field, aliases in _CSV_COLUMNS.items():
+            for alias in aliases:
+                if alias in names:
+                    columns[field] = names.index(alias)
+                    break
+
+        if "date" not in columns or "description" not in columns:
+            raise ValueError("CSV header must have date and description columns")
+        if "amount" not in columns and "debit" not in columns:
+            raise ValueError("CSV header must have an amount column or debit/credit columns")
+        return columns
+
+    @staticmethod
+    def _parse_csv_date(value: str) -> datetime:
+        """Parse a CSV date as midnight UTC."""
+        for date_format in _CSV_DATE_FORMATS:
+            try:
+                return datetime.strptime(value, date_format).replace(tzinfo=timezone.utc)
+            except ValueError:
+                continue
+        raise ValueError(f"Unrecognized date {value!r}")
+
+    @staticmethod
+    def parse_ofx(lines: Iterable[str]) -> Iterator[Dict]:
+        """
+        Parse an OFX/QFX export (SGML or XML flavour).
+        Tags are read as they stream past; only the transaction being built is held.
+        """
+        currency_code = None
+        transaction: Optional[Dict[str, str]] = None
+        start_line = 0
+
+        for line_number, line in enumerate(lines, 1):
+            for tag, value in _OFX_TAG.findall(line):
+                tag = tag.upper()
+                if tag == "CURDEF":
+                    currency_code = value.strip().upper() or None
+                elif tag == "STMTTRN":
+                    transaction, start_line = {}, line_number
+                elif tag == "/STMTTRN" and transaction is not None:
+                    yield BankStatementParser._ofx_transaction(transaction, start_line, currency_code)
+                    transaction = None
+                elif transaction is not None and not tag.startswith("/"):
+                    transaction[tag] = value.strip()
+
+    @staticmethod
+    def _ofx_transaction(fields: Dict[str, str], line: int, currency_code: Optional[str]) -> Dict:
+        """Turn the tags of one STMTTRN block into a transaction dict."""
+        try:
+            description = " - ".join(
+                part for part in (fields.get("NAME"), fields.get("MEMO")) if part
+            )
+            return {
+                "line": line,
+                "occurred_at": BankStatementParser._parse_ofx_date(fields.get("DTPOSTED", "")),
+                "amount_cents": BankStatementParser.parse_amount(fields.get("TRNAMT", "")),
+                "description": description or "Bank transaction",
+                "currency_code": currency_code,
+                "reference": fields.get("FITID") or None,
+            }
+        except ValueError as e:
+            return {"line": line, "error": str(e)}
+
+    @staticmethod
+    def _parse_ofx_date(value: str) -> datetime:
+        """Parse an OFX date such as 20240105120000.000[-5:EST] into UTC."""
+        match = _OFX_DATE.fullmatch(value)
+        if not match:
+            raise ValueError(f"Unrecognized date {value!r}")
+        day, time_of_day, offset_hours = match.groups()
+        local = datetime.strptime(day + (time_of_day or "000000"), "%Y%m%d%H%M%S")
+        offset = timedelta(hours=float(offset_hours or 0))
+        return (local - offset).replace(tzinfo=timezone.utc)
+
+    @staticmethod
+    def parse_amount(value: str) -> int:
+        """Parse a decimal amount such as -1,234.56 or (12.00) into signed cents."""
+        text = value.strip().replace(",", "").replace("$", "")
+        negative = text.startswith("(") and text.endswith(")")
+        try:
+            amount = Decimal(text.strip("()"))
+        except InvalidOperation:
+            raise ValueError(f"Unrecognized amount {value!r}")
+        if not amount.is_finite():
+            raise ValueError(f"Unrecognized amount {value!r}")
+
+        cents = int((amount * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+        return -cents if negative else cents
@@ -0,0 +1,65 @@
+"""
+Domain service for currency conversion.
+Pure business logic for converting integer minor-unit amounts between currencies.
+"""
+from typing import Dict, Tuple
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+
+class CurrencyConversionService:
+    """
+    Domain service for currency conversion.
+    Works on a snapshot of rates, so converting never touches the database.
+    """
+
+    @staticmethod
+    def get_rate(
+        rates: Dict[Tuple[str, str], Decimal],
+        source_currency: str,
+        target_currency: str,
+    ) -> Decimal:
+        """
+        Get the rate that converts one unit of source into target currency.
+        Uses the direct pair if known, otherwise the inverse of the reverse pair.
+        """
+        if source_currency == target_currency:
+            return Decimal(1)
+        direct = rates.get((source_currency, target_currency))
+        if direct:
+            return Decimal(direct)
+        reverse = rates.get((target_currency, source_currency))
+        if reverse:
+            return Decimal(1) / Decimal(reverse)
+        raise ValueError(f"No FX rate from {source_currency} to {target_currency}")
+
+    @staticmethod
+    def convert_balances(
+        balances: Dict[str, Dict[int, int]],
+        target_currency: str,
+        rates: Dict[Tuple[str, str], Decimal],
+        precisions: Dict[str, int],
+    ) -> Dict[int, int]:
+        """
+        Convert per-currency balances into a single currency.
+
+        balances: {currency_code: {user_id: balance_cents}}
+        Returns: {user_id: balance in target currency minor units}
+
+        Amounts are scaled for the difference in minor units between currencies
+        (e.g. JPY has none) and each user's total is rounded half-up once, so
+        converted balances may not sum to exactly zero.
+        """
+        target_precision = precisions.get(target_currency, 2)
+        totals: Dict[int, Decimal] = defaultdict(Decimal)
+
+        for currency, user_balances in balances.items():
+            rate = CurrencyConversionService.get_rate(rates, currency, target_currency)
+            scale = rate.scaleb(target_precision - precisions.get(currency, 2))
+            for user_id, amount in user_balances.items():
+                totals[user_id] += Decimal(amount) * scale
+
+        return {
+            user_id: int(amount.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+            for user_id, amount in totals.items()
+        }
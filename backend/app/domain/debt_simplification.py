@@ -0,0 +1,102 @@
+"""
+Domain service for debt simplification.
+Turns net balances into a short list of transfers that settles everyone up.
+"""
+import heapq
+from typing import Dict, List
+
+
+class DebtSimplificationService:
+    """
+    Domain service for settle-up planning.
+    Matches debtors against creditors with a greedy heap-based matcher.
+    """
+
+    @staticmethod
+    def simplify_debts(balances: Dict[int, int]) -> List[Dict[str, int]]:
+        """
+        Compute transfers that settle the given net balances for one currency.
+
+        balances: {user_id: balance_cents} (positive = owed to user, negative = user owes)
+        Returns list of {from_user_id, to_user_id, amount_cents} dicts.
+
+        Logic:
+        - Debtors and creditors with exactly opposite balances are paired first,
+          settling both with a single transfer
+        - The largest remaining debtor then pays the largest remaining creditor,
+          and whoever is left with a remainder goes back on its heap
+        - Produces at most (participants - 1) transfers in O(n log n); if the
+          balances do not sum to zero the leftover stays unsettled
+        """
+        transfers: List[Dict[str, int]] = []
+
+        # Pair exact opposites first: each pair closes with one transfer
+        creditors_by_amount: Dict[int, List[int]] = {}
+        for user_id, cents in balances.items():
+            if cents > 0:
+                creditors_by_amount.setdefault(cents, []).append(user_id)
+
+        debtors = []
+        for user_id, cents in balances.items():
+            if cents >= 0:
+                continue
+            matches = creditors_by_amount.get(-cents)
+            if matches:
+                transfers.append(
+                    {"from_user_id": user_id, "to_user_id": matches.pop(), "amount_cents": -cents}
+                )
+            else:
+                # Min-heap on negative balance pops the largest debt first
+                debtors.append((cents, user_id))
+
+        # Negated so the min-heap pops the largest credit first
+        creditors = [
+            (-cents, user_id)
+            for cents, user_ids in creditors_by_amount.items()
+            for user_id in user_ids
+        ]
+
+        heapq.heapify(debtors)
+        heapq.heapify(creditors)
+
+        # Each round settles one side completely, so it is popped and only the
+        # other side's remainder is pushed back
+        while debtors and creditors:
+            debt, debtor_id = debtors[0]
+            credit, creditor_id = creditors[0]
+
+            if debt < credit:
+                # Debt is larger: creditor is paid in full
+                transfers.append(
+                    {"from_user_id": debtor_id, "to_user_id": creditor_id, "amount_cents": -credit}
+                )
+                heapq.heappop(creditors)
+                heapq.heapreplace(debtors, (debt - credit, debtor_id))
+            elif debt > credit:
+                # Credit is larger: debtor pays off everything
+                transfers.append(
+                    {"from_user_id": debtor_id, "to_user_id": creditor_id, "amount_cents": -debt}
+                )
+                heapq.heappop(debtors)
+                heapq.heapreplace(creditors, (credit - debt, creditor_id))
+            else:
+                transfers.append(
+                    {"from_user_id": debtor_id, "to_user_id": creditor_id, "amount_cents": -debt}
+                )
+                heapq.heappop(debtors)
+                heapq.heappop(creditors)
+
+        return transfers
+
+    @staticmethod
+    def simplify_group_balances(
+        balances: Dict[str, Dict[int, int]],
+    ) -> Dict[str, List[Dict[str, int]]]:
+        """
+        Compute settle-up transfers for every currency of a group.
+        Returns: {currency_code: [{from_user_id, to_user_id, amount_cents}, ...]}
+        """
+        return {
+            currency: DebtSimplificationService.simplify_debts(user_balances)
+            for currency, user_balances in balances.items()
+        }
@@ -3,8 +3,8 @@ Domain service for expense creation and split calculation.
 Pure business logic, framework-agnostic.
 """
 from typing import List, Dict
-from decimal import Decimal, ROUND_HALF_UP
 
+from app.domain.split_allocator import SplitAllocator
 from app.infrastructure.db.models import Expense, ExpenseSplit, ExpenseItem, SplitType
 
 
@@ -63,30 +63,16 @@ class ExpenseService:
         if total_shares == 0:
             raise ValueError("Total shares must be greater than 0")
 
-        result = []
-        allocated = 0
-
-        for i, share_data in enumerate(shares):
-            user_id = share_data["user_id"]
-            share_count = share_data["share_count"]
-
-            # Calculate proportional amount
-            if i == len(shares) - 1:
-                # Last person gets remainder to avoid rounding errors
-                amount = amount_cents - allocated
-            else:
-                # Calculate: (share_count / total_shares) * amount_cents
-                amount_decimal = Decimal(share_count) / Decimal(total_shares) * Decimal(amount_cents)
-                amount = int(amount_decimal.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
-                allocated += amount
-
-            result.append({
-                "user_id": user_id,
-                "amount_cents": amount,
-                "share_value": str(share_count),
-            })
+        amounts = SplitAllocator.allocate(amount_cents, [s["share_count"] for s in shares])
 
-        return result
+        return [
+            {
+                "user_id": share_data["user_id"],
+                "amount_cents": amount,
+                "share_value": str(share_data["share_count"]),
+            }
+            for share_data, amount in zip(shares, amounts)
+        ]
 
     @staticmethod
     def calculate_percent_splits(
@@ -101,30 +87,107 @@ class ExpenseService:
         if abs(total_percent - 100.0) > 0.01:  # Allow small floating point error
             raise ValueError(f"Percentages must sum to 100, got {total_percent}")
 
-        result = []
-        allocated = 0
-
-        for i, percent_data in enumerate(percents):
-            user_id = percent_data["user_id"]
-            percent = percent_data["percent"]
-
-            # Calculate proportional amount
-            if i == len(percents) - 1:
-                # Last person gets remainder to avoid rounding errors
-                amount = amount_cents - allocated
-            else:
-                # Calculate: (percent / 100) * amount_cents
-                amount_decimal = Decimal(percent) / Decimal(100) * Decimal(amount_cents)
-                amount = int(amount_decimal.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
-                allocated += amount
-
-            result.append({
-                "user_id": user_id,
+        weights = SplitAllocator.percent_weights([p["percent"] for p in percents])
+        amounts = SplitAllocator.allocate(amount_cents, weights)
+
+        return [
+            {
+                "user_id": percent_data["user_id"],
                 "amount_cents": amount,
-                "share_value": f"{percent}%",
-            })
+                "share_value": f"{percent_data['percent']}%",
+            }
+            for percent_data, amount in zip(percents, amounts)
+        ]
+
+    @staticmethod
+    def _split_weights(split_type: SplitType, split_data: Dict) -> List[Dict]:
+        """
+        Validate weighted split data and return [{user_id, weight, share_value}].
+        Same rules as the per-expense EQUAL, SHARES and PERCENT calculations.
+        """
+        if split_type == SplitType.EQUAL:
+            participant_ids = split_data["participants"]
+            if not participant_ids:
+                raise ValueError("At least one participant required")
+            return [
+                {"user_id": user_id, "weight": 1, "share_value": None} for user_id in participant_ids
+            ]
 
-        return result
+        if split_type == SplitType.SHARES:
+            shares = split_data["shares"]
+            if sum(s["share_count"] for s in shares) == 0:
+                raise ValueError("Total shares must be greater than 0")
+            weighted = [
+                {
+                    "user_id": s["user_id"],
+                    "weight": s["share_count"],
+                    "share_value": str(s["share_count"]),
+                }
+                for s in shares
+            ]
+        else:
+            percents = split_data["percents"]
+            total_percent = sum(p["percent"] for p in percents)
+            if abs(total_percent - 100.0) > 0.01:
+                raise ValueError(f"Percentages must sum to 100, got {total_percent}")
+            weights = SplitAllocator.percent_weights([p["percent"] for p in percents])
+            weighted = [
+                {"user_id": p["user_id"], "weight": weight, "share_value": f"{p['percent']}%"}
+                for p, weight in zip(percents, weights)
+            ]
+
+        if any(w["weight"] < 0 for w in weighted):
+            raise ValueError("Split weights must not be negative")
+        return weighted
+
+    @staticmethod
+    def calculate_splits_batch(requests: List[Dict]) -> List[Dict]:
+        """
+        Calculate splits for many expenses in one call.
+
+        requests: list of {amount_cents, split_type, split_data}
+        Returns one {"splits": [{user_id, amount_cents, share_value}, ...]} or
+        {"error": str} per request, in order. All weighted splits (equal, shares,
+        percent) are allocated together in a single vectorized pass.
+        """
+        results: List[Dict] = [{} for _ in requests]
+        weighted_indexes, amounts, participants = [], [], []
+
+        for i, request in enumerate(requests):
+            amount_cents = request["amount_cents"]
+            split_type = request["split_type"]
+            split_data = request["split_data"]
+            try:
+                if split_type == SplitType.UNEQUAL:
+                    splits = ExpenseService.calculate_unequal_splits(amount_cents, split_data["splits"])
+                    results[i] = {"splits": [{**s, "share_value": None} for s in splits]}
+                    continue
+                participants.append(ExpenseService._split_weights(split_type, split_data))
+            except (KeyError, TypeError):
+                results[i] = {"error": f"Missing split data for {split_type.value} split"}
+                continue
+            except ValueError as e:
+                results[i] = {"error": str(e)}
+                continue
+            weighted_indexes.append(i)
+            amounts.append(amount_cents)
+
+        allocations = SplitAllocator.allocate_many(
+            amounts, [[p["weight"] for p in people] for people in participants]
+        )
+        for i, people, allocated in zip(weighted_indexes, participants, allocations):
+            results[i] = {
+                "splits": [
+                    {
+                        "user_id": p["user_id"],
+                        "amount_cents": amount,
+                        "share_value": p["share_value"],
+                    }
+                    for p, amount in zip(people, allocated)
+                ]
+            }
+
+        return results
 
     @staticmethod
     def create_expense_splits(
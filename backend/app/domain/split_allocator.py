@@ -0,0 +1,95 @@
+"""
+Domain service for proportional split allocation.
+Integer-only largest-remainder allocation of amounts in cents by weight.
+"""
+from typing import List, Sequence
+from decimal import Decimal
+
+import numpy as np
+
+# Weighted products above this are computed with Python ints to avoid int64 overflow
+_INT64_SAFE = 2 ** 62
+
+
+class SplitAllocator:
+    """
+    Domain service for allocating an amount across participants by weight.
+
+    Each participant gets floor(amount * weight / total_weight) cents; the cents
+    left over go one each to the participants with the largest remainders
+    (earlier participants win ties). Allocations always sum to the amount.
+    """
+
+    @staticmethod
+    def percent_weights(percents: Sequence[float]) -> List[int]:
+        """Turn percentages into integer weights, exact to four decimal places."""
+        return [int(Decimal(str(percent)).scaleb(4).to_integral_value()) for percent in percents]
+
+    @staticmethod
+    def allocate(amount_cents: int, weights: Sequence[int]) -> List[int]:
+        """Allocate one amount across the given integer weights."""
+        if not weights:
+            raise ValueError("At least one participant required")
+        if any(weight < 0 for weight in weights):
+            raise ValueError("Weights must not be negative")
+        total_weight = sum(weights)
+        if total_weight == 0:
+            raise ValueError("Total weight must be greater than 0")
+
+        allocations = []
+        remainders = []
+        for weight in weights:
+            share, remainder = divmod(amount_cents * weight, total_weight)
+            allocations.append(share)
+            remainders.append(remainder)
+
+        leftover = amount_cents - sum(allocations)
+        by_remainder = sorted(range(len(weights)), key=lambda i: (-remainders[i], i))
+        for i in by_remainder[:leftover]:
+            allocations[i] += 1
+        return allocations
+
+    @staticmethod
+    def allocate_many(
+        amounts: Sequence[int], weight_lists: Sequence[Sequence[int]]
+    ) -> List[List[int]]:
+        """
+        Allocate many amounts at once, each across its own list of weights.
+        Vectorized with NumPy over all participants of all amounts together.
+        """
+        if len(amounts) != len(weight_lists):
+            raise ValueError("Each amount needs a list of weights")
+        if not amounts:
+            return []
+
+        sizes = np.fromiter(
+            (len(weights) for weights in weight_lists), dtype=np.int64, count=len(amounts)
+        )
+        if sizes.min() == 0:
+            raise ValueError("At least one participant required")
+        weights = np.concatenate([np.asarray(w, dtype=np.int64) for w in weight_lists])
+        if weights.min() < 0:
+            raise ValueError("Weights must not be negative")
+        amount_array = np.asarray(amounts, dtype=np.int64)
+
+        offsets = np.zeros(len(amounts), dtype=np.int64)
+        np.cumsum(sizes[:-1], out=offsets[1:])
+        total_weights = np.add.reduceat(weights, offsets)
+        if total_weights.min() == 0:
+            raise ValueError("Total weight must be greater than 0")
+        if int(np.abs(amount_array).max()) * int(total_weights.max()) >= _INT64_SAFE:
+            return [SplitAllocator.allocate(a, w) for a, w in zip(amounts, weight_lists)]
+
+        segment = np.repeat(np.arange(len(amounts)), sizes)
+        products = amount_array[segment] * weights
+        allocations, remainders = np.divmod(products, total_weights[segment])
+        leftovers = amount_array - np.add.reduceat(allocations, offsets)
+
+        # Rank participants within each amount by remainder (desc), then position
+        position = np.arange(len(weights))
+        order = np.lexsort((position, -remainders, segment))
+        rank = np.empty(len(weights), dtype=np.int64)
+        rank[order] = position - offsets[segment[order]]
+        allocations += rank < leftovers[segment]
+
+        return [part.tolist() for part in np.split(allocations, offsets[1:])]
@@ -4,12 +4,16 @@ SQLAlchemy database models for SplitDumb.
 from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
-    Column, Integer, String, BigInteger, ForeignKey, DateTime, Boolean, Enum as SQLEnum, JSON, Text
+    Column, Integer, String, BigInteger, ForeignKey, ForeignKeyConstraint, DateTime, Date, Boolean,
+    Numeric, Enum as SQLEnum, JSON, Text, Index, event
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
 import enum
 
+from app.infrastructure.db.partitioning import create_activity_partitions, create_hash_partitions
+
 Base = declarative_base()
 
 
@@ -23,6 +27,16 @@ class Currency(Base):
     precision = Column(Integer, default=2)  # Decimal places (typically 2)
 
 
+class FxRate(Base):
+    """Exchange rate: 1 unit of base currency = `rate` units of quote currency."""
+    __tablename__ = "fx_rates"
+
+    base_code = Column(String(3), ForeignKey("currencies.code"), primary_key=True)
+    quote_code = Column(String(3), ForeignKey("currencies.code"), primary_key=True)
+    effective_date = Column(Date, primary_key=True)
+    rate = Column(Numeric(20, 10), nullable=False)
+
+
 class User(Base):
     """User account model."""
     __tablename__ = "users"
@@ -53,6 +67,8 @@ class Group(Base):
     default_currency = Column(String(3), ForeignKey("currencies.code"), default="USD")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     archived_at = Column(DateTime(timezone=True), nullable=True)
+    # Bumped in every transaction that changes what group reads return; their ETag
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     # Relationships
     members = relationship("GroupMember", back_populates="group", cascade="all, delete-orphan")
@@ -73,10 +89,12 @@ class GroupMember(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     role = Column(SQLEnum(GroupMemberRole), default=GroupMemberRole.MEMBER)
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (Index("ix_group_members_group_id_user_id", group_id, user_id),)
+
     # Relationships
     group = relationship("Group", back_populates="members")
     user = relationship("User", back_populates="groups")
@@ -95,11 +113,11 @@ class ExpenseSource(str, enum.Enum):
 
 
 class Expense(Base):
-    """Expense model."""
+    """Expense model, hash-partitioned by group_id (see partitioning.py)."""
     __tablename__ = "expenses"
 
-    id = Column(Integer, primary_key=True, index=True)
-    group_id = Column(Integer, ForeignKey("groups.id"), nullable=True)  # Nullable for personal expenses
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    group_id = Column(Integer, ForeignKey("groups.id"), primary_key=True)  # Partition key
     created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     payer_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     amount_cents = Column(BigInteger, nullable=False)  # Integer representation of money
@@ -114,6 +132,21 @@ class Expense(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     deleted_at = Column(DateTime(timezone=True), nullable=True)  # Soft delete
 
+    __table_args__ = (
+        # Live expense listing (keyset on occurred_at, id) and balance windows
+        Index(
+            "ix_expenses_group_id_occurred_at", group_id, occurred_at.desc(), id.desc(),
+            postgresql_where=deleted_at.is_(None),
+        ),
+        # Soft-deleted expenses waiting to be archived
+        Index("ix_expenses_deleted_at", deleted_at, postgresql_where=deleted_at.isnot(None)),
+        # Delta sync: expenses created, updated or deleted since a point in time
+        Index("ix_expenses_group_id_changed_at", group_id, func.greatest(created_at, updated_at, deleted_at)),
+        {"postgresql_partition_by": "HASH (group_id)"},
+    )
+    # The database key includes the partition key; ids alone are unique
+    __mapper_args__ = {"primary_key": [id]}
+
     # Relationships
     group = relationship("Group", back_populates="expenses")
     payer = relationship("User", foreign_keys=[payer_user_id], back_populates="expenses_paid")
@@ -127,11 +160,16 @@ class ExpenseItem(Base):
     __tablename__ = "expense_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    expense_id = Column(Integer, ForeignKey("expenses.id"), nullable=False)
+    expense_id = Column(Integer, nullable=False, index=True)
+    group_id = Column(Integer, nullable=False)  # Copied from the expense, to reference it by (id, group_id)
     description = Column(String(500), nullable=False)
     amount_cents = Column(BigInteger, nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
 
+    __table_args__ = (
+        ForeignKeyConstraint([expense_id, group_id], ["expenses.id", "expenses.group_id"]),
+    )
+
     # Relationships
     expense = relationship("Expense", back_populates="items")
     splits = relationship("ExpenseSplit", back_populates="item")
@@ -147,23 +185,57 @@ class SplitType(str, enum.Enum):
 
 
 class ExpenseSplit(Base):
-    """Represents how much each participant owes for an expense (or item)."""
+    """Represents how much each participant owes for an expense (or item); hash-partitioned by group_id."""
     __tablename__ = "expense_splits"
 
-    id = Column(Integer, primary_key=True, index=True)
-    expense_id = Column(Integer, ForeignKey("expenses.id"), nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    expense_id = Column(Integer, nullable=False, index=True)
+    group_id = Column(Integer, primary_key=True)  # Partition key, copied from the expense
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     item_id = Column(Integer, ForeignKey("expense_items.id"), nullable=True)  # Null for whole-expense splits
     amount_cents = Column(BigInteger, nullable=False)  # Amount this user owes
     share_type = Column(SQLEnum(SplitType), nullable=False)
     share_value = Column(String(50), nullable=True)  # e.g., share count or percent for auditing
 
+    __table_args__ = (
+        ForeignKeyConstraint([expense_id, group_id], ["expenses.id", "expenses.group_id"]),
+        Index("ix_expense_splits_item_id", item_id, postgresql_where=item_id.isnot(None)),
+        {"postgresql_partition_by": "HASH (group_id)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
     # Relationships
     expense = relationship("Expense", back_populates="splits")
     user = relationship("User", back_populates="splits_owed")
     item = relationship("ExpenseItem", back_populates="splits")
 
 
+class ArchivedExpense(Base):
+    """Cold copy of a soft-deleted expense, or of any expense of an archived group.
+
+    `data` holds the expense, item and split rows exactly as they were
+    ({"expense": {...}, "items": [...], "splits": [...]}), so the expense can be
+    restored. The columns copied out of it are the ones balance queries and
+    listings filter or sum on; see ArchiveRepository.
+    """
+    __tablename__ = "archived_expenses"
+
+    id = Column(Integer, primary_key=True)  # Original expense id
+    group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
+    payer_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    amount_cents = Column(BigInteger, nullable=False)
+    currency_code = Column(String(3), ForeignKey("currencies.code"), nullable=False)
+    occurred_at = Column(DateTime(timezone=True), nullable=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # Null for live expenses of archived groups
+    archived_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    data = Column(JSONB, nullable=False)
+
+    __table_args__ = (
+        # Archive listing (keyset on occurred_at, id) and balance windows
+        Index("ix_archived_expenses_group_id_occurred_at", group_id, occurred_at.desc(), id.desc()),
+    )
+
+
 class Settlement(Base):
     """Manual settle-up payment between users within a group."""
     __tablename__ = "settlements"
@@ -178,12 +250,43 @@ class Settlement(Base):
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (Index("ix_settlements_group_id_created_at", group_id, created_at),)
+
     # Relationships
     group = relationship("Group", back_populates="settlements")
     from_user = relationship("User", foreign_keys=[from_user_id], back_populates="settlements_sent")
     to_user = relationship("User", foreign_keys=[to_user_id], back_populates="settlements_received")
 
 
+class GroupBalance(Base):
+    """Materialized net balance per user per currency within a group.
+
+    Maintained by delta in the same transaction as every expense and settlement
+    write, so balance reads never have to replay group history.
+    """
+    __tablename__ = "group_balances"
+
+    group_id = Column(Integer, ForeignKey("groups.id"), primary_key=True)
+    currency_code = Column(String(3), ForeignKey("currencies.code"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True, index=True)
+    balance_cents = Column(BigInteger, nullable=False, default=0)  # positive = owed to user
+
+
+class BalanceCheckpoint(Base):
+    """Snapshot of group balances at a period boundary, for point-in-time balance queries.
+
+    Holds the net balance from every expense (by occurred_at) and settlement
+    (by created_at) at or before period_start.
+    """
+    __tablename__ = "balance_checkpoints"
+
+    group_id = Column(Integer, ForeignKey("groups.id"), primary_key=True)
+    period_start = Column(DateTime(timezone=True), primary_key=True)
+    currency_code = Column(String(3), ForeignKey("currencies.code"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    balance_cents = Column(BigInteger, nullable=False)
+
+
 class ActivityEventType(str, enum.Enum):
     """Activity event types."""
     EXPENSE_CREATED = "expense_created"
@@ -195,21 +298,59 @@ class ActivityEventType(str, enum.Enum):
 
 
 class ActivityEvent(Base):
-    """Generic activity feed event for timeline/history."""
+    """Generic activity feed event for timeline/history; range-partitioned by month on created_at."""
     __tablename__ = "activity_events"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=True)  # Nullable for user-level events
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     type = Column(SQLEnum(ActivityEventType), nullable=False)
     payload = Column(JSON, nullable=True)  # Flexible JSON for event-specific data
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())  # Partition key
+
+    __table_args__ = (
+        # Activity feed (keyset on created_at, id)
+        Index("ix_activity_events_group_id_created_at", group_id, created_at.desc(), id.desc()),
+        # Events after an id (sync and stream resume), whatever their month
+        Index("ix_activity_events_group_id_id", group_id, id),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
 
     # Relationships
     group = relationship("Group", back_populates="activity_events")
     user = relationship("User", back_populates="activity_events")
 
 
+class OutboxEvent(Base):
+    """Activity event appended in a business transaction, waiting to be delivered.
+
+    The outbox worker moves batches of these into activity_events (and any
+    other registered consumer) and deletes them in the same transaction, so
+    the table only holds undelivered events.
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)  # Delivery order
+    group_id = Column(Integer, ForeignKey("groups.id"), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    type = Column(SQLEnum(ActivityEventType), nullable=False)
+    payload = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # Kept on delivery
+
+
+class IdempotencyKey(Base):
+    """A client-chosen key of a replayed mutation (POST /sync/mutations), so each applies once."""
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    result = Column(JSON, nullable=True)  # Returned again on replay; null until the mutation committed
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (Index("ix_idempotency_keys_created_at", created_at),)
+
+
 class Category(Base):
     """Expense category (optional in P0, placeholder for budgeting features)."""
     __tablename__ = "categories"
@@ -224,3 +365,48 @@ class Category(Base):
     # Relationships
     expenses = relationship("Expense", back_populates="category")
     expense_items = relationship("ExpenseItem", back_populates="category")
+
+
+class BankImportStatus(str, enum.Enum):
+    """Bank statement import status."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class BankImport(Base):
+    """Progress of a bank statement import running in the background."""
+    __tablename__ = "bank_imports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Uploader, recorded as payer
+    filename = Column(String(255), nullable=False)
+    status = Column(SQLEnum(BankImportStatus), nullable=False, default=BankImportStatus.PENDING)
+    rows_read = Column(Integer, nullable=False, default=0)
+    rows_imported = Column(Integer, nullable=False, default=0)
+    rows_skipped = Column(Integer, nullable=False, default=0)  # Credits, which are not expenses
+    rows_failed = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=True)  # First row errors, e.g. [{"line": 12, "error": "..."}]
+    upload_path = Column(String(1024), nullable=True)  # Spooled statement; cleared once the import finishes
+    claimed_at = Column(DateTime(timezone=True), nullable=True)  # Runner's heartbeat, renewed with each chunk
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_bank_imports_pending_created_at", created_at,
+            postgresql_where=status == BankImportStatus.PENDING,
+        ),
+        Index(
+            "ix_bank_imports_running_claimed_at", claimed_at,
+            postgresql_where=status == BankImportStatus.RUNNING,
+        ),
+    )
+
+
+# Partitions for tables created by create_all; existing databases are converted by migration 008
+event.listen(Expense.__table__, "after_create", create_hash_partitions)
+event.listen(ExpenseSplit.__table__, "after_create", create_hash_partitions)
+event.listen(ActivityEvent.__table__, "after_create", create_activity_partitions)
@@ -0,0 +1,315 @@
+"""
+Postgres declarative partitioning for the tables that grow without bound.
+
+expenses and expense_splits are hash-partitioned by group_id, so everything a
+group reads or writes lands in one partition of each. activity_events is
+range-partitioned by month on created_at, with a default partition catching
+rows outside the months that exist, so old months can be detached whole.
+
+Fresh databases get their partitions from `create_all` through the table
+hooks registered in models.py. Existing databases are converted by migration
+008, or ahead of it by scripts/partition_tables.py on large databases.
+"""
+from datetime import date, datetime, timezone
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Hash partitions per table; fixed once a table has been partitioned
+EXPENSE_HASH_PARTITIONS = 16
+# Monthly activity partitions kept ready beyond the current month
+ACTIVITY_MONTHS_AHEAD = 3
+
+ACTIVITY_DEFAULT_PARTITION = "activity_events_default"
+
+Log = Callable[[str], None]
+
+
+def _no_log(message: str) -> None:
+    pass
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    """Whether `table` exists as a partitioned table."""
+    return conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"),
+        {"table": table},
+    ).scalar()
+
+
+def hash_partition_ddl(table: str, modulus: int = EXPENSE_HASH_PARTITIONS) -> List[str]:
+    """CREATE TABLE statements for every hash partition of `table`."""
+    return [
+        f"CREATE TABLE {table}_p{remainder} PARTITION OF {table} "
+        f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+        for remainder in range(modulus)
+    ]
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _month_bound(month: date) -> str:
+    """Partition bound for midnight UTC on the first of `month`, independent of the session time zone."""
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def activity_partition_name(month: date) -> str:
+    """Name of the activity_events partition holding `month`."""
+    return f"activity_events_{month:%Y_%m}"
+
+
+def ensure_activity_partitions(
+    conn: Connection, since: Optional[date] = None, months_ahead: int = ACTIVITY_MONTHS_AHEAD,
+    log: Log = _no_log,
+) -> List[str]:
+    """
+    Create the missing monthly activity_events partitions from the month of
+    `since` (default: this month) through `months_ahead` months from now.
+
+    Rows that already landed in the default partition for a new month are moved
+    into it before it is attached, since Postgres refuses to attach a partition
+    whose range the default partition still holds rows for. Returns the names
+    of the partitions created.
+    """
+    existing = set(conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'activity_events'::regclass"
+    )).scalars())
+    has_default = ACTIVITY_DEFAULT_PARTITION in existing
+
+    today = datetime.now(timezone.utc).date()
+    month = _month_start(since or today)
+    last = _month_start(today)
+    for _ in range(months_ahead):
+        last = _next_month(last)
+
+    created = []
+    while month <= last:
+        name = activity_partition_name(month)
+        if name not in existing:
+            lower, upper = _month_bound(month), _month_bound(_next_month(month))
+            if has_default:
+                # Create detached, move the month out of the default partition, then attach
+                conn.execute(text(f"CREATE TABLE {name} (LIKE activity_events INCLUDING DEFAULTS)"))
+                moved = conn.execute(text(
+                    f"WITH moved AS (DELETE FROM {ACTIVITY_DEFAULT_PARTITION} "
+                    f"WHERE created_at >= {lower} AND created_at < {upper} RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                )).rowcount
+                conn.execute(text(
+                    f"ALTER TABLE activity_events ATTACH PARTITION {name} FOR VALUES FROM ({lower}) TO ({upper})"
+                ))
+                if moved:
+                    log(f"Moved {moved} rows from {ACTIVITY_DEFAULT_PARTITION} into {name}")
+            else:
+                conn.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF activity_events FOR VALUES FROM ({lower}) TO ({upper})"
+                ))
+            created.append(name)
+        month = _next_month(month)
+    return created
+
+
+def _create_hash_partitions(conn: Connection, table: str, modulus: int = EXPENSE_HASH_PARTITIONS) -> None:
+    for ddl in hash_partition_ddl(table, modulus):
+        conn.execute(text(ddl))
+
+
+def create_hash_partitions(table, connection: Connection, **kw) -> None:
+    """after_create hook: create the hash partitions of a freshly created table."""
+    _create_hash_partitions(connection, table.name)
+
+
+def create_activity_partitions(table, connection: Connection, **kw) -> None:
+    """after_create hook: create the monthly and default partitions of a fresh activity_events."""
+    ensure_activity_partitions(connection)
+    connection.execute(text(f"CREATE TABLE {ACTIVITY_DEFAULT_PARTITION} PARTITION OF activity_events DEFAULT"))
+
+
+def _swap_table(
+    conn: Connection, table: str, layout: str, create_partitions: Callable[[], None],
+    extra_columns: str = "", select: Optional[str] = None, log: Log = _no_log,
+) -> int:
+    """
+    Replace `table` by a copy with a different layout: rename the old table
+    away, create the new one with the same columns (plus `extra_columns`) and
+    `layout` (a PARTITION BY clause, or empty for a plain table), copy the rows
+    with `select` (default: every column of the old table), then drop the old
+    table. The id sequence is handed over to the new table.
+
+    Primary key, indexes and foreign keys are left to the caller, so they are
+    built once over the copied rows. Returns the number of rows copied.
+    """
+    old = f"{table}_old"
+    conn.execute(text(f"ALTER TABLE {table} RENAME TO {old}"))
+    conn.execute(text(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE"))
+    conn.execute(text(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS{extra_columns}) {layout}"))
+    create_partitions()
+    copied = conn.execute(text(f"INSERT INTO {table} {select or f'SELECT * FROM {old}'}")).rowcount
+    log(f"Copied {copied} rows into {table}")
+    conn.execute(text(f"DROP TABLE {old} CASCADE"))
+    conn.execute(text(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id"))
+    return copied
+
+
+def _id_index(table: str) -> List[str]:
+    """The standalone id index of the unpartitioned layout; partitioned tables use their primary key."""
+    return [f"CREATE INDEX ix_{table}_id ON {table} (id)"]
+
+
+def _add_constraints(
+    conn: Connection, table: str, primary_key: str, indexes: List[str], foreign_keys: List[str]
+) -> None:
+    conn.execute(text(f"ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})"))
+    for index in indexes:
+        conn.execute(text(index))
+    for foreign_key in foreign_keys:
+        conn.execute(text(f"ALTER TABLE {table} ADD FOREIGN KEY {foreign_key}"))
+
+
+_EXPENSE_INDEXES = [
+    # Live expense listing (keyset on occurred_at, id) and balance windows
+    "CREATE INDEX ix_expenses_group_id_occurred_at ON expenses "
+    "(group_id, occurred_at DESC, id DESC) WHERE deleted_at IS NULL",
+]
+_EXPENSE_FOREIGN_KEYS = [
+    "(group_id) REFERENCES groups (id)",
+    "(created_by_user_id) REFERENCES users (id)",
+    "(payer_user_id) REFERENCES users (id)",
+    "(currency_code) REFERENCES currencies (code)",
+    "(category_id) REFERENCES categories (id)",
+]
+_SPLIT_INDEXES = [
+    "CREATE INDEX ix_expense_splits_expense_id ON expense_splits (expense_id)",
+    "CREATE INDEX ix_expense_splits_item_id ON expense_splits (item_id) WHERE item_id IS NOT NULL",
+]
+_SPLIT_FOREIGN_KEYS = [
+    "(user_id) REFERENCES users (id)",
+    "(item_id) REFERENCES expense_items (id)",
+]
+_ACTIVITY_INDEXES = [
+    # Activity feed (keyset on created_at, id)
+    "CREATE INDEX ix_activity_events_group_id_created_at ON activity_events "
+    "(group_id, created_at DESC, id DESC)",
+]
+_ACTIVITY_FOREIGN_KEYS = [
+    "(group_id) REFERENCES groups (id)",
+    "(user_id) REFERENCES users (id)",
+]
+
+
+def partition_expense_tables(
+    conn: Connection, modulus: int = EXPENSE_HASH_PARTITIONS, log: Log = _no_log
+) -> bool:
+    """
+    Convert expenses and expense_splits into tables hash-partitioned by
+    group_id, copying every row. expense_splits and expense_items gain a
+    group_id column copied from their expense, so they can reference the
+    partitioned expenses table by (id, group_id).
+
+    Run inside one transaction; both tables are locked for the duration of the
+    copy. Returns False without changes if expenses is already partitioned.
+    """
+    if is_partitioned(conn, "expenses"):
+        return False
+
+    ungrouped = conn.execute(text("SELECT count(*) FROM expenses WHERE group_id IS NULL")).scalar()
+    if ungrouped:
+        raise ValueError(f"{ungrouped} expenses have no group_id; they cannot be partitioned by group")
+
+    conn.execute(text("ALTER TABLE expense_items ADD COLUMN group_id INTEGER"))
+    conn.execute(text(
+        "UPDATE expense_items i SET group_id = e.group_id FROM expenses e WHERE e.id = i.expense_id"
+    ))
+    conn.execute(text("ALTER TABLE expense_items ALTER COLUMN group_id SET NOT NULL"))
+
+    _swap_table(
+        conn, "expenses", "PARTITION BY HASH (group_id)",
+        lambda: _create_hash_partitions(conn, "expenses", modulus),
+        log=log,
+    )
+    _add_constraints(conn, "expenses", "id, group_id", _EXPENSE_INDEXES, _EXPENSE_FOREIGN_KEYS)
+
+    _swap_table(
+        conn, "expense_splits", "PARTITION BY HASH (group_id)",
+        lambda: _create_hash_partitions(conn, "expense_splits", modulus),
+        extra_columns=", group_id INTEGER NOT NULL",
+        select="SELECT s.*, e.group_id FROM expense_splits_old s JOIN expenses e ON e.id = s.expense_id",
+        log=log,
+    )
+    _add_constraints(
+        conn, "expense_splits", "id, group_id", _SPLIT_INDEXES,
+        _SPLIT_FOREIGN_KEYS + ["(expense_id, group_id) REFERENCES expenses (id, group_id)"],
+    )
+
+    conn.execute(text(
+        "ALTER TABLE expense_items ADD FOREIGN KEY (expense_id, group_id) REFERENCES expenses (id, group_id)"
+    ))
+    return True
+
+
+def partition_activity_events(conn: Connection, log: Log = _no_log) -> bool:
+    """
+    Convert activity_events into a table range-partitioned by month on
+    created_at, with a partition per month from the oldest event through
+    ACTIVITY_MONTHS_AHEAD months from now, plus the default partition.
+
+    Run inside one transaction. Returns False without changes if
+    activity_events is already partitioned.
+    """
+    if is_partitioned(conn, "activity_events"):
+        return False
+
+    undated = conn.execute(text("SELECT count(*) FROM activity_events WHERE created_at IS NULL")).scalar()
+    if undated:
+        raise ValueError(f"{undated} activity events have no created_at; they cannot be partitioned by month")
+    oldest = conn.execute(text("SELECT min(created_at) FROM activity_events")).scalar()
+
+    def create_partitions():
+        ensure_activity_partitions(conn, since=oldest.astimezone(timezone.utc).date() if oldest else None)
+        conn.execute(text(f"CREATE TABLE {ACTIVITY_DEFAULT_PARTITION} PARTITION OF activity_events DEFAULT"))
+
+    _swap_table(conn, "activity_events", "PARTITION BY RANGE (created_at)", create_partitions, log=log)
+    _add_constraints(conn, "activity_events", "id, created_at", _ACTIVITY_INDEXES, _ACTIVITY_FOREIGN_KEYS)
+    return True
+
+
+def unpartition_expense_tables(conn: Connection, log: Log = _no_log) -> bool:
+    """Reverse partition_expense_tables: plain expenses and expense_splits, no group_id on splits or items."""
+    if not is_partitioned(conn, "expenses"):
+        return False
+
+    _swap_table(conn, "expense_splits", "", lambda: None, log=log)
+    conn.execute(text("ALTER TABLE expense_splits DROP COLUMN group_id"))
+
+    _swap_table(conn, "expenses", "", lambda: None, log=log)
+    conn.execute(text("ALTER TABLE expenses ALTER COLUMN group_id DROP NOT NULL"))
+    _add_constraints(conn, "expenses", "id", _EXPENSE_INDEXES + _id_index("expenses"), _EXPENSE_FOREIGN_KEYS)
+    _add_constraints(
+        conn, "expense_splits", "id", _SPLIT_INDEXES + _id_index("expense_splits"),
+        _SPLIT_FOREIGN_KEYS + ["(expense_id) REFERENCES expenses (id)"],
+    )
+
+    conn.execute(text("ALTER TABLE expense_items DROP COLUMN group_id"))
+    conn.execute(text("ALTER TABLE expense_items ADD FOREIGN KEY (expense_id) REFERENCES expenses (id)"))
+    return True
+
+
+def unpartition_activity_events(conn: Connection, log: Log = _no_log) -> bool:
+    """Reverse partition_activity_events: a plain activity_events table."""
+    if not is_partitioned(conn, "activity_events"):
+        return False
+
+    _swap_table(conn, "activity_events", "", lambda: None, log=log)
+    conn.execute(text("ALTER TABLE activity_events ALTER COLUMN created_at DROP NOT NULL"))
+    _add_constraints(
+        conn, "activity_events", "id", _ACTIVITY_INDEXES + _id_index("activity_events"), _ACTIVITY_FOREIGN_KEYS
+    )
+    return True
@@ -1,32 +1,138 @@
 """
 Activity repository for database operations.
 """
-from typing import List
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
 from app.infrastructure.db.models import ActivityEvent
 
 
+# Ids per NOTIFY payload: 20-digit ids and commas stay well under 8000 bytes
+_NOTIFY_IDS_PER_PAYLOAD = 350
+
+
+def _group_activity_query(group_id: int, limit: int, before: Optional[Tuple[datetime, int]]):
+    """
+    Select one page of a group's activity events, newest first, seeking past `before`.
+    Users are joined in, since async sessions cannot lazy-load them during serialization.
+    """
+    query = (
+        select(ActivityEvent)
+        .options(joinedload(ActivityEvent.user))
+        .where(ActivityEvent.group_id == group_id)
+    )
+    if before is not None:
+        # The plain bound on created_at lets the planner skip later monthly partitions
+        query = query.where(
+            tuple_(ActivityEvent.created_at, ActivityEvent.id) < tuple_(*before),
+            ActivityEvent.created_at <= before[0],
+        )
+    return query.order_by(ActivityEvent.created_at.desc(), ActivityEvent.id.desc()).limit(limit)
+
+
 class ActivityRepository:
     """Repository for activity feed operations."""
 
     def __init__(self, db: Session):
         self.db = db
 
-    def get_group_activity(self, group_id: int, limit: int = 50, offset: int = 0) -> List[ActivityEvent]:
-        """Get paginated activity events for a group."""
+    def get_group_activity(
+        self, group_id: int, limit: int = 50, before: Optional[Tuple[datetime, int]] = None
+    ) -> List[ActivityEvent]:
+        """
+        Get a page of a group's activity events, newest first.
+        `before` is the (created_at, id) of the last event on the previous page.
+        """
+        return self.db.execute(_group_activity_query(group_id, limit, before)).scalars().all()
+
+    def get_events_after(self, group_ids: List[int], after_id: int, limit: int) -> List[ActivityEvent]:
+        """
+        Get up to `limit` events of the given groups with ids above `after_id`,
+        oldest first, for delta sync. Outbox delivery commits ids in increasing
+        order, so this misses nothing committed after `after_id` was read,
+        however late it was delivered.
+        """
+        if not group_ids:
+            return []
         return (
-            self.db.query(ActivityEvent)
-            .filter(ActivityEvent.group_id == group_id)
-            .order_by(ActivityEvent.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+            self.db.execute(
+                select(ActivityEvent)
+                .options(joinedload(ActivityEvent.user))
+                .where(ActivityEvent.group_id.in_(group_ids), ActivityEvent.id > after_id)
+                .order_by(ActivityEvent.id)
+                .limit(limit)
+            )
+            .scalars()
             .all()
         )
 
-    def create(self, event: ActivityEvent) -> ActivityEvent:
-        """Create a new activity event."""
-        self.db.add(event)
-        self.db.commit()
-        self.db.refresh(event)
-        return event
+    def get_max_id(self) -> int:
+        """The id of the newest delivered event, or 0; one index probe per partition."""
+        return self.db.scalar(select(func.max(ActivityEvent.id))) or 0
+
+    def get_by_ids(self, event_ids: List[int]) -> List[Row]:
+        """Get events by id, oldest first, as rows of their columns."""
+        if not event_ids:
+            return []
+        return self.db.execute(
+            select(*ActivityEvent.__table__.c).where(ActivityEvent.id.in_(event_ids)).order_by(ActivityEvent.id)
+        ).all()
+
+    def notify_delivered(self, event_ids: List[int], channel: str) -> None:
+        """
+        NOTIFY `channel` with the ids of delivered events, comma-separated in
+        payloads under Postgres's 8000-byte limit. Sent when the transaction commits.
+        """
+        payloads, chunk = [], []
+        for event_id in event_ids:
+            chunk.append(str(event_id))
+            if len(chunk) == _NOTIFY_IDS_PER_PAYLOAD:
+                payloads.append(",".join(chunk))
+                chunk = []
+        if chunk:
+            payloads.append(",".join(chunk))
+        for payload in payloads:
+            self.db.execute(select(func.pg_notify(channel, payload)))
+
+    def create_many(self, events: List[Dict]) -> List[Row]:
+        """
+        Insert activity events (column dicts) in one multi-row INSERT, without committing.
+        Returns the inserted rows. Events are written by the outbox worker; services
+        append to the outbox instead.
+        """
+        if not events:
+            return []
+        return self.db.execute(
+            insert(ActivityEvent).values(events).returning(*ActivityEvent.__table__.c)
+        ).all()
+
+
+class AsyncActivityRepository:
+    """Async repository for reading the activity feed."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_group_activity(
+        self, group_id: int, limit: int = 50, before: Optional[Tuple[datetime, int]] = None
+    ) -> List[ActivityEvent]:
+        """Get a page of a group's activity events, newest first."""
+        result = await self.db.execute(_group_activity_query(group_id, limit, before))
+        return result.scalars().all()
+
+    async def get_events_after(self, group_id: int, after_id: int, limit: int) -> List[Row]:
+        """
+        Get up to `limit` of a group's events with ids above `after_id`, oldest first.
+        Complete for resuming: outbox delivery commits event ids in increasing order.
+        """
+        result = await self.db.execute(
+            select(*ActivityEvent.__table__.c)
+            .where(ActivityEvent.group_id == group_id, ActivityEvent.id > after_id)
+            .order_by(ActivityEvent.id)
+            .limit(limit)
+        )
+        return result.all()
@@ -0,0 +1,246 @@
+"""
+Archive repository: moves cold expenses out of the hot tables, back again, and reads them.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, literal_column, select, true, tuple_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.models import (
+    ArchivedExpense, Expense, ExpenseItem, ExpenseSplit, Group, SplitType, User
+)
+from app.infrastructure.repositories.group_repository import GroupRepository
+from app.infrastructure.repositories.views import (
+    USER_VIEW_COLUMNS, ExpenseItemView, ExpenseSplitView, ExpenseView, UserView
+)
+
+# (expense id, group id): the key of the partitioned expenses table
+ExpenseKey = Tuple[int, int]
+
+_expenses = Expense.__table__
+_items = ExpenseItem.__table__
+_splits = ExpenseSplit.__table__
+
+# Archive columns copied out of the expense row, in insert order
+_ARCHIVE_COLUMNS = (
+    "id", "group_id", "payer_user_id", "amount_cents", "currency_code", "occurred_at", "deleted_at",
+)
+
+
+@dataclass(slots=True)
+class ArchivedExpenseView(ExpenseView):
+    """Read-only archived expense, rebuilt from its archived JSON."""
+    deleted_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None
+
+
+def _children_json(table):
+    """The rows of `table` belonging to the outer expense, as a JSON array ordered by id."""
+    return (
+        select(func.coalesce(
+            func.jsonb_agg(aggregate_order_by(func.to_jsonb(table.table_valued()), table.c.id)),
+            func.jsonb_build_array(),
+        ))
+        .where(table.c.expense_id == _expenses.c.id, table.c.group_id == _expenses.c.group_id)
+        .scalar_subquery()
+    )
+
+
+def _restored_rows(table, document, many: bool):
+    """Rows of `table` rebuilt from archived JSON: one record, or a set from a JSON array."""
+    populate = func.jsonb_populate_recordset if many else func.jsonb_populate_record
+    return populate(literal_column(f"NULL::{table.name}"), document).table_valued(*table.c.keys())
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _archived_view(data: Dict[str, Any], archived_at: datetime, payer: UserView) -> ArchivedExpenseView:
+    """Build a view from an archived document (rows as serialized by Postgres to_jsonb)."""
+    expense = data["expense"]
+    return ArchivedExpenseView(
+        id=expense["id"],
+        group_id=expense["group_id"],
+        payer_user_id=expense["payer_user_id"],
+        amount_cents=expense["amount_cents"],
+        currency_code=expense["currency_code"],
+        description=expense["description"],
+        notes=expense["notes"],
+        category_id=expense["category_id"],
+        occurred_at=_timestamp(expense["occurred_at"]),
+        created_at=_timestamp(expense["created_at"]),
+        payer=payer,
+        splits=[
+            ExpenseSplitView(
+                split["id"], split["user_id"], split["amount_cents"],
+                SplitType[split["share_type"]], split["share_value"],
+            )
+            for split in data["splits"]
+        ],
+        items=[
+            ExpenseItemView(item["id"], item["description"], item["amount_cents"], item["category_id"])
+            for item in data["items"]
+        ],
+        deleted_at=_timestamp(expense["deleted_at"]),
+        archived_at=archived_at,
+    )
+
+
+def _archived_views(rows) -> List[ArchivedExpenseView]:
+    """Build views from rows of (data, archived_at, *payer columns)."""
+    return [_archived_view(data, archived_at, UserView(*payer)) for data, archived_at, *payer in rows]
+
+
+def _archived_query(*conditions):
+    """Select archived expenses joined to their payers."""
+    return (
+        select(ArchivedExpense.data, ArchivedExpense.archived_at, *USER_VIEW_COLUMNS)
+        .join(User, User.id == ArchivedExpense.payer_user_id)
+        .where(*conditions)
+    )
+
+
+def _archived_page_query(group_id: int, limit: Optional[int], before: Optional[Tuple[datetime, int]]):
+    """Select one page of a group's archived expenses, newest first, seeking past `before`."""
+    query = _archived_query(ArchivedExpense.group_id == group_id)
+    if before is not None:
+        query = query.where(tuple_(ArchivedExpense.occurred_at, ArchivedExpense.id) < tuple_(*before))
+    return query.order_by(ArchivedExpense.occurred_at.desc(), ArchivedExpense.id.desc()).limit(limit)
+
+
+class ArchiveRepository:
+    """Repository for the expense archive."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_deleted_expense_keys(self, deleted_before: datetime, limit: int) -> List[ExpenseKey]:
+        """Lock and return up to `limit` expenses soft-deleted before `deleted_before`."""
+        return self.db.execute(
+            select(Expense.id, Expense.group_id)
+            .where(Expense.deleted_at.isnot(None), Expense.deleted_at < deleted_before)
+            .order_by(Expense.deleted_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+
+    def get_archived_group_expense_keys(self, archived_before: datetime, limit: int) -> List[ExpenseKey]:
+        """Lock and return up to `limit` live expenses of groups archived before `archived_before`."""
+        return self.db.execute(
+            select(Expense.id, Expense.group_id)
+            .join(Group, Group.id == Expense.group_id)
+            .where(
+                Group.archived_at.isnot(None),
+                Group.archived_at < archived_before,
+                Expense.deleted_at.is_(None),
+            )
+            .limit(limit)
+            .with_for_update(of=Expense, skip_locked=True)
+        ).all()
+
+    def archive(self, keys: List[ExpenseKey]) -> int:
+        """
+        Move expenses, with their items and splits, into archived_expenses.
+
+        Each expense becomes one row whose `data` holds the expense, item and
+        split rows serialized by the database. Does not commit. Returns the
+        number of expenses archived.
+        """
+        if not keys:
+            return 0
+        group_ids = {group_id for _, group_id in keys}
+        GroupRepository(self.db).bump_versions(group_ids)
+        document = func.jsonb_build_object(
+            "expense", func.to_jsonb(_expenses.table_valued()),
+            "items", _children_json(_items),
+            "splits", _children_json(_splits),
+        )
+        self.db.execute(
+            insert(ArchivedExpense).from_select(
+                [*_ARCHIVE_COLUMNS, "data"],
+                select(*(_expenses.c[name] for name in _ARCHIVE_COLUMNS), document)
+                .where(tuple_(_expenses.c.id, _expenses.c.group_id).in_(keys)),
+            )
+        )
+        # Splits reference items, items reference expenses
+        for table in (_splits, _items):
+            self.db.execute(
+                delete(table).where(
+                    table.c.group_id.in_(group_ids),
+                    tuple_(table.c.expense_id, table.c.group_id).in_(keys),
+                )
+            )
+        return self.db.execute(
+            delete(_expenses).where(tuple_(_expenses.c.id, _expenses.c.group_id).in_(keys))
+        ).rowcount
+
+    def _restore(self, condition) -> int:
+        """
+        Move the archived expenses matching `condition` back into the hot tables.
+        Restored expenses get a fresh updated_at, so delta sync sends them again.
+        """
+        for table, key, many in (
+            (_expenses, "expense", False), (_items, "items", True), (_splits, "splits", True)
+        ):
+            rows = _restored_rows(table, ArchivedExpense.data[key], many)
+            columns = [func.now() if table is _expenses and c.key == "updated_at" else c for c in rows.c]
+            self.db.execute(
+                insert(table).from_select(
+                    table.c.keys(),
+                    select(*columns).select_from(ArchivedExpense).join(rows, true()).where(condition),
+                )
+            )
+        return self.db.execute(delete(ArchivedExpense).where(condition)).rowcount
+
+    def restore_expense(self, expense_id: int) -> int:
+        """Restore one archived expense, still soft-deleted if it was. Does not commit."""
+        group_id = self.db.scalar(select(ArchivedExpense.group_id).where(ArchivedExpense.id == expense_id))
+        if group_id is None:
+            return 0
+        GroupRepository(self.db).bump_version(group_id)
+        return self._restore(ArchivedExpense.id == expense_id)
+
+    def restore_group(self, group_id: int) -> int:
+        """
+        Unarchive a group and restore all of its archived expenses, soft-deleted
+        ones included. Does not commit. Returns the number of expenses restored.
+        """
+        self.db.execute(
+            update(Group).where(Group.id == group_id).values(archived_at=None, version=Group.version + 1)
+        )
+        return self._restore(ArchivedExpense.group_id == group_id)
+
+    def get_group_expenses(
+        self, group_id: int, limit: Optional[int] = None, before: Optional[Tuple[datetime, int]] = None
+    ) -> List[ArchivedExpenseView]:
+        """Get a group's archived expenses, newest first; all of them when no limit is given."""
+        return _archived_views(self.db.execute(_archived_page_query(group_id, limit, before)))
+
+
+class AsyncArchiveRepository:
+    """Async repository for the read-only archive lookup API."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_group_expenses(
+        self, group_id: int, limit: int = 50, before: Optional[Tuple[datetime, int]] = None
+    ) -> List[ArchivedExpenseView]:
+        """
+        Get a page of a group's archived expenses, newest first.
+        `before` is the (occurred_at, id) of the last expense on the previous page.
+        """
+        result = await self.db.execute(_archived_page_query(group_id, limit, before))
+        return _archived_views(result)
+
+    async def get_by_id(self, group_id: int, expense_id: int) -> Optional[ArchivedExpenseView]:
+        """Get one archived expense of a group."""
+        result = await self.db.execute(
+            _archived_query(ArchivedExpense.id == expense_id, ArchivedExpense.group_id == group_id)
+        )
+        views = _archived_views(result)
+        return views[0] if views else None
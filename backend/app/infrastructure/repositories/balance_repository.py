@@ -0,0 +1,347 @@
+"""
+Balance ledger repository for database operations.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import BigInteger, Integer, and_, column, func, select, true, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+from app.infrastructure.db.models import (
+    ArchivedExpense, BalanceCheckpoint, Expense, ExpenseSplit, Group, GroupBalance, GroupMember, Settlement
+)
+
+
+# Splits join their expense on the full partitioned key, so a group filter on
+# expenses prunes expense_splits to the same partition
+_split_expense_join = and_(Expense.id == ExpenseSplit.expense_id, Expense.group_id == ExpenseSplit.group_id)
+
+
+def _archived_splits():
+    """The (user_id, amount_cents) splits inside each archived expense's JSON."""
+    return (
+        func.jsonb_to_recordset(ArchivedExpense.data["splits"])
+        .table_valued(column("user_id", Integer), column("amount_cents", BigInteger))
+        .render_derived(with_types=True)
+    )
+
+
+def _to_balance_map(rows: Iterable[Tuple[str, int, int]]) -> Dict[str, Dict[int, int]]:
+    """Fold (currency_code, user_id, balance_cents) tuples into {currency: {user_id: cents}}."""
+    balances: Dict[str, Dict[int, int]] = {}
+    for currency, user_id, balance_cents in rows:
+        balances.setdefault(currency, {})[user_id] = int(balance_cents)
+    return balances
+
+
+class BalanceRepository:
+    """Repository for the materialized group balance ledger."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_group_balances(self, group_id: int) -> Dict[str, Dict[int, int]]:
+        """Get net balances per currency per user for a group from the ledger."""
+        rows = (
+            self.db.query(GroupBalance.currency_code, GroupBalance.user_id, GroupBalance.balance_cents)
+            .filter(GroupBalance.group_id == group_id)
+            .all()
+        )
+        return _to_balance_map(rows)
+
+    def get_user_balances(self, user_id: int) -> List[Tuple[int, str, str, int]]:
+        """
+        Get a user's ledger rows across every group they currently belong to.
+        Returns (group_id, group_name, currency_code, balance_cents) tuples from one query.
+        """
+        return [
+            (group_id, group_name, currency, int(balance_cents))
+            for group_id, group_name, currency, balance_cents in self.db.execute(
+                select(Group.id, Group.name, GroupBalance.currency_code, GroupBalance.balance_cents)
+                .join(Group, Group.id == GroupBalance.group_id)
+                .join(
+                    GroupMember,
+                    and_(
+                        GroupMember.group_id == GroupBalance.group_id,
+                        GroupMember.user_id == GroupBalance.user_id,
+                    ),
+                )
+                .where(GroupBalance.user_id == user_id)
+                .order_by(Group.id, GroupBalance.currency_code)
+            )
+        ]
+
+    def compute_group_balances(
+        self,
+        group_id: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Dict[str, Dict[int, int]]:
+        """
+        Compute net balances for a group from its history with SQL aggregates.
+
+        Same semantics as BalanceService.calculate_group_balances, but summed with
+        GROUP BY in the database instead of replaying hydrated ORM objects.
+        When given, only expenses (by occurred_at) and settlements (by created_at)
+        in the window (since, until] are counted. Live expenses of an archived
+        group are read from the archive.
+        """
+        expense_filter = [Expense.group_id == group_id, Expense.deleted_at.is_(None)]
+        archived_filter = [ArchivedExpense.group_id == group_id, ArchivedExpense.deleted_at.is_(None)]
+        settlement_filter = [Settlement.group_id == group_id]
+        if since is not None:
+            expense_filter.append(Expense.occurred_at > since)
+            archived_filter.append(ArchivedExpense.occurred_at > since)
+            settlement_filter.append(Settlement.created_at > since)
+        if until is not None:
+            expense_filter.append(Expense.occurred_at <= until)
+            archived_filter.append(ArchivedExpense.occurred_at <= until)
+            settlement_filter.append(Settlement.created_at <= until)
+        live_expense = and_(*expense_filter)
+        archived_expense = and_(*archived_filter)
+        group_settlement = and_(*settlement_filter)
+
+        paid = (
+            select(
+                Expense.currency_code.label("currency_code"),
+                Expense.payer_user_id.label("user_id"),
+                func.sum(Expense.amount_cents).label("delta"),
+            )
+            .where(live_expense)
+            .group_by(Expense.currency_code, Expense.payer_user_id)
+        )
+        owed = (
+            select(Expense.currency_code, ExpenseSplit.user_id, -func.sum(ExpenseSplit.amount_cents))
+            .join(Expense, _split_expense_join)
+            .where(live_expense)
+            .group_by(Expense.currency_code, ExpenseSplit.user_id)
+        )
+        archived_paid = (
+            select(
+                ArchivedExpense.currency_code,
+                ArchivedExpense.payer_user_id,
+                func.sum(ArchivedExpense.amount_cents),
+            )
+            .where(archived_expense)
+            .group_by(ArchivedExpense.currency_code, ArchivedExpense.payer_user_id)
+        )
+        archived_splits = _archived_splits()
+        archived_owed = (
+            select(
+                ArchivedExpense.currency_code,
+                archived_splits.c.user_id,
+                -func.sum(archived_splits.c.amount_cents),
+            )
+            .select_from(ArchivedExpense)
+            .join(archived_splits, true())
+            .where(archived_expense)
+            .group_by(ArchivedExpense.currency_code, archived_splits.c.user_id)
+        )
+        sent = (
+            select(Settlement.currency_code, Settlement.from_user_id, func.sum(Settlement.amount_cents))
+            .where(group_settlement)
+            .group_by(Settlement.currency_code, Settlement.from_user_id)
+        )
+        received = (
+            select(Settlement.currency_code, Settlement.to_user_id, -func.sum(Settlement.amount_cents))
+            .where(group_settlement)
+            .group_by(Settlement.currency_code, Settlement.to_user_id)
+        )
+
+        deltas = union_all(paid, owed, archived_paid, archived_owed, sent, received).subquery()
+        rows = self.db.execute(
+            select(deltas.c.currency_code, deltas.c.user_id, func.sum(deltas.c.delta))
+            .group_by(deltas.c.currency_code, deltas.c.user_id)
+        ).all()
+        return _to_balance_map(rows)
+
+    def stream_balance_deltas(
+        self, shard: int = 0, shard_count: int = 1, chunk_size: int = 100_000
+    ) -> Iterator[List[Tuple[int, str, int, int]]]:
+        """
+        Stream raw (group_id, currency_code, user_id, delta) rows for every group
+        with group_id % shard_count == shard, in chunks of up to `chunk_size`.
+
+        One row per expense payer, expense split and settlement side, unaggregated,
+        read through a server-side cursor so memory stays bounded. Live expenses
+        of archived groups are read from the archive.
+        """
+        live_expense = and_(
+            Expense.group_id % shard_count == shard,
+            Expense.deleted_at.is_(None),
+        )
+        archived_expense = and_(
+            ArchivedExpense.group_id % shard_count == shard,
+            ArchivedExpense.deleted_at.is_(None),
+        )
+        archived_splits = _archived_splits()
+        group_settlement = Settlement.group_id % shard_count == shard
+
+        deltas = union_all(
+            select(
+                Expense.group_id, Expense.currency_code, Expense.payer_user_id, Expense.amount_cents
+            ).where(live_expense),
+            select(
+                Expense.group_id, Expense.currency_code, ExpenseSplit.user_id, -ExpenseSplit.amount_cents
+            )
+            .join(Expense, _split_expense_join)
+            .where(live_expense),
+            select(
+                ArchivedExpense.group_id,
+                ArchivedExpense.currency_code,
+                ArchivedExpense.payer_user_id,
+                ArchivedExpense.amount_cents,
+            ).where(archived_expense),
+            select(
+                ArchivedExpense.group_id,
+                ArchivedExpense.currency_code,
+                archived_splits.c.user_id,
+                -archived_splits.c.amount_cents,
+            )
+            .select_from(ArchivedExpense)
+            .join(archived_splits, true())
+            .where(archived_expense),
+            select(
+                Settlement.group_id,
+                Settlement.currency_code,
+                Settlement.from_user_id,
+                Settlement.amount_cents,
+            ).where(group_settlement),
+            select(
+                Settlement.group_id,
+                Settlement.currency_code,
+                Settlement.to_user_id,
+                -Settlement.amount_cents,
+            ).where(group_settlement),
+        )
+        result = self.db.execute(deltas.execution_options(yield_per=chunk_size))
+        for partition in result.partitions():
+            yield partition
+
+    def stream_ledger_rows(
+        self, shard: int = 0, shard_count: int = 1, chunk_size: int = 100_000
+    ) -> Iterator[List[Tuple[int, str, int, int]]]:
+        """Stream (group_id, currency_code, user_id, balance_cents) ledger rows of a shard."""
+        rows = select(
+            GroupBalance.group_id,
+            GroupBalance.currency_code,
+            GroupBalance.user_id,
+            GroupBalance.balance_cents,
+        ).where(GroupBalance.group_id % shard_count == shard)
+        result = self.db.execute(rows.execution_options(yield_per=chunk_size))
+        for partition in result.partitions():
+            yield partition
+
+    def get_history_start(self, group_id: int) -> Optional[datetime]:
+        """Get the timestamp of the earliest expense (archived included) or settlement in a group."""
+        first_expense = (
+            select(func.min(Expense.occurred_at))
+            .where(Expense.group_id == group_id, Expense.deleted_at.is_(None))
+            .scalar_subquery()
+        )
+        first_archived_expense = (
+            select(func.min(ArchivedExpense.occurred_at))
+            .where(ArchivedExpense.group_id == group_id, ArchivedExpense.deleted_at.is_(None))
+            .scalar_subquery()
+        )
+        first_settlement = (
+            select(func.min(Settlement.created_at))
+            .where(Settlement.group_id == group_id)
+            .scalar_subquery()
+        )
+        return self.db.execute(select(func.least(first_expense, first_archived_expense, first_settlement))).scalar()
+
+    def get_latest_checkpoint(
+        self, group_id: int, as_of: Optional[datetime] = None
+    ) -> Tuple[Optional[datetime], Dict[str, Dict[int, int]]]:
+        """
+        Get the most recent balance checkpoint of a group at or before `as_of`.
+        Returns (period_start, balances), or (None, {}) when there is none.
+        """
+        latest = select(func.max(BalanceCheckpoint.period_start)).where(
+            BalanceCheckpoint.group_id == group_id
+        )
+        if as_of is not None:
+            latest = latest.where(BalanceCheckpoint.period_start <= as_of)
+        period_start = self.db.execute(latest).scalar()
+        if period_start is None:
+            return None, {}
+
+        rows = (
+            self.db.query(
+                BalanceCheckpoint.currency_code,
+                BalanceCheckpoint.user_id,
+                BalanceCheckpoint.balance_cents,
+            )
+            .filter(
+                BalanceCheckpoint.group_id == group_id,
+                BalanceCheckpoint.period_start == period_start,
+            )
+            .all()
+        )
+        return period_start, _to_balance_map(rows)
+
+    def save_checkpoint(
+        self, group_id: int, period_start: datetime, balances: Dict[str, Dict[int, int]]
+    ) -> None:
+        """Store balances at a period boundary. Zero balances are kept so the period is recorded."""
+        self.db.add_all(
+            BalanceCheckpoint(
+                group_id=group_id,
+                period_start=period_start,
+                currency_code=currency,
+                user_id=user_id,
+                balance_cents=balance_cents,
+            )
+            for currency, user_balances in balances.items()
+            for user_id, balance_cents in user_balances.items()
+        )
+
+    def invalidate_checkpoints(self, group_id: int, changed_at: Optional[datetime]) -> None:
+        """
+        Drop checkpoints of a group taken after a backdated change at `changed_at`.
+
+        Does not commit: called inside the transaction of the write that rewrote history.
+        """
+        if changed_at is None:
+            return
+        self.db.query(BalanceCheckpoint).filter(
+            BalanceCheckpoint.group_id == group_id,
+            BalanceCheckpoint.period_start >= changed_at,
+        ).delete(synchronize_session=False)
+
+    def apply_deltas(self, group_id: int, deltas: Dict[str, Dict[int, int]]) -> None:
+        """
+        Add balance deltas to the ledger rows of a group.
+
+        Does not commit: callers apply deltas inside the transaction of the write
+        that caused them. Rows are upserted in key order so concurrent writers
+        lock them in the same order.
+        """
+        rows = [
+            {
+                "group_id": group_id,
+                "currency_code": currency,
+                "user_id": user_id,
+                "balance_cents": delta,
+            }
+            for currency, user_deltas in sorted(deltas.items())
+            for user_id, delta in sorted(user_deltas.items())
+            if delta != 0
+        ]
+        if not rows:
+            return
+
+        stmt = insert(GroupBalance).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[GroupBalance.group_id, GroupBalance.currency_code, GroupBalance.user_id],
+            set_={"balance_cents": GroupBalance.balance_cents + stmt.excluded.balance_cents},
+        )
+        self.db.execute(stmt)
+
+    def replace_group_balances(self, group_id: int, balances: Dict[str, Dict[int, int]]) -> None:
+        """Overwrite all ledger rows of a group (used when rebuilding from history)."""
+        self.db.query(GroupBalance).filter(GroupBalance.group_id == group_id).delete(
+            synchronize_session=False
+        )
+        self.apply_deltas(group_id, balances)
@@ -0,0 +1,70 @@
+"""
+Bank import repository for database operations.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, func, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.models import BankImport, BankImportStatus
+
+
+class BankImportRepository:
+    """Repository for bank statement import tracking."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_id(self, import_id: int) -> Optional[BankImport]:
+        """Get a bank import by ID."""
+        return self.db.query(BankImport).filter(BankImport.id == import_id).first()
+
+    def create(self, bank_import: BankImport) -> BankImport:
+        """Create a new bank import record."""
+        self.db.add(bank_import)
+        self.db.flush()
+        return bank_import
+
+    def claim(self, import_id: int, claimed_at: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Claim an import for this runner; returns the new claim time, or None if
+        another runner got it first. Without `claimed_at`, only a pending import
+        is claimed; with it, a running import whose claim has not moved since.
+        """
+        if claimed_at is None:
+            claimable = BankImport.status == BankImportStatus.PENDING
+        else:
+            claimable = and_(
+                BankImport.status == BankImportStatus.RUNNING, BankImport.claimed_at == claimed_at
+            )
+        return self.db.scalar(
+            update(BankImport)
+            .where(BankImport.id == import_id, claimable)
+            .values(status=BankImportStatus.RUNNING, claimed_at=func.clock_timestamp())
+            .returning(BankImport.claimed_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    def heartbeat(self, import_id: int, claimed_at: datetime) -> Optional[datetime]:
+        """Renew this runner's claim; returns the new claim time, or None if another runner took it over."""
+        return self.claim(import_id, claimed_at)
+
+    def get_stale(self, older_than: timedelta, limit: int = 100) -> List[Tuple[int, Optional[datetime]]]:
+        """
+        Get (id, claimed_at) of imports pending, or running without a heartbeat,
+        for longer than `older_than`, oldest first.
+        """
+        cutoff = func.now() - older_than
+        pending = (
+            select(BankImport.id, BankImport.claimed_at, BankImport.created_at.label("since"))
+            .where(BankImport.status == BankImportStatus.PENDING, BankImport.created_at < cutoff)
+        )
+        running = (
+            select(BankImport.id, BankImport.claimed_at, BankImport.claimed_at.label("since"))
+            .where(BankImport.status == BankImportStatus.RUNNING, BankImport.claimed_at < cutoff)
+        )
+        stale = union_all(pending, running).subquery()
+        rows = self.db.execute(
+            select(stale.c.id, stale.c.claimed_at).order_by(stale.c.since).limit(limit)
+        )
+        return [(import_id, claimed_at) for import_id, claimed_at in rows]
@@ -1,12 +1,63 @@
 """
 Expense repository for database operations.
 """
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy import func, select, tuple_
 
-from app.infrastructure.db.models import Expense, ExpenseSplit, ExpenseItem
+from app.infrastructure.db.models import (
+    Expense, ExpenseSplit, ExpenseItem, Currency, Category, User
+)
+from app.infrastructure.repositories.views import (
+    EXPENSE_VIEW_COLUMNS, ITEM_VIEW_COLUMNS, SPLIT_VIEW_COLUMNS, USER_VIEW_COLUMNS,
+    ExpenseItemView, ExpenseSplitView, ExpenseView, UserView,
+)
+
+
+def _expense_page_query(group_id: int, limit: int, before: Optional[Tuple[datetime, int]]):
+    """Select one page of a group's expenses joined to their payers, newest first."""
+    query = (
+        select(*EXPENSE_VIEW_COLUMNS, *USER_VIEW_COLUMNS)
+        .join(User, User.id == Expense.payer_user_id)
+        .where(Expense.group_id == group_id, Expense.deleted_at.is_(None))
+    )
+    if before is not None:
+        query = query.where(tuple_(Expense.occurred_at, Expense.id) < tuple_(*before))
+    return query.order_by(Expense.occurred_at.desc(), Expense.id.desc()).limit(limit)
+
+
+def _split_views_query(group_id: int, expense_ids: Iterable[int]):
+    """Select the splits of the given expenses; the group_id predicate prunes to one partition."""
+    return (
+        select(ExpenseSplit.expense_id, *SPLIT_VIEW_COLUMNS)
+        .where(ExpenseSplit.group_id == group_id, ExpenseSplit.expense_id.in_(expense_ids))
+        .order_by(ExpenseSplit.id)
+    )
+
+
+def _item_views_query(expense_ids: Iterable[int]):
+    """Select the items of the given expenses."""
+    return (
+        select(ExpenseItem.expense_id, *ITEM_VIEW_COLUMNS)
+        .where(ExpenseItem.expense_id.in_(expense_ids))
+        .order_by(ExpenseItem.id)
+    )
+
+
+def _expense_views(rows) -> List[ExpenseView]:
+    """Build expense views from rows of _expense_page_query."""
+    payer_fields = len(EXPENSE_VIEW_COLUMNS)
+    return [ExpenseView(*row[:payer_fields], payer=UserView(*row[payer_fields:])) for row in rows]
+
+
+def _attach_children(by_id: Dict[int, ExpenseView], split_rows, item_rows) -> None:
+    """Attach split and item rows to their expense views."""
+    for expense_id, *split in split_rows:
+        by_id[expense_id].splits.append(ExpenseSplitView(*split))
+    for expense_id, *item in item_rows:
+        by_id[expense_id].items.append(ExpenseItemView(*item))
 
 
 class ExpenseRepository:
@@ -27,37 +78,118 @@ class ExpenseRepository:
             .first()
         )
 
-    def get_group_expenses(self, group_id: int, limit: int = 50, offset: int = 0) -> List[Expense]:
-        """Get paginated expenses for a group."""
-        return (
-            self.db.query(Expense)
-            .options(joinedload(Expense.splits), joinedload(Expense.payer))
-            .filter(
-                and_(Expense.group_id == group_id, Expense.deleted_at.is_(None))
-            )
-            .order_by(Expense.occurred_at.desc())
-            .limit(limit)
-            .offset(offset)
-            .all()
+    def get_group_expenses(
+        self, group_id: int, limit: int = 50, before: Optional[Tuple[datetime, int]] = None
+    ) -> List[ExpenseView]:
+        """
+        Get a page of a group's expenses, newest first, as read-only views.
+        `before` is the (occurred_at, id) of the last expense on the previous page;
+        the row comparison lets the database seek straight to the next page.
+
+        Three narrow queries: the page of expenses joined to their payers, then
+        all their splits and all their items by expense id. Nothing is loaded
+        into the session.
+        """
+        expenses = _expense_views(self.db.execute(_expense_page_query(group_id, limit, before)))
+        if not expenses:
+            return expenses
+
+        by_id = {expense.id: expense for expense in expenses}
+        _attach_children(
+            by_id,
+            self.db.execute(_split_views_query(group_id, by_id)),
+            self.db.execute(_item_views_query(by_id)),
         )
+        return expenses
 
     def create(self, expense: Expense) -> Expense:
-        """Create a new expense."""
+        """Create a new expense with its items and splits; flushed so its id is available."""
         self.db.add(expense)
-        self.db.commit()
-        self.db.refresh(expense)
+        self.db.flush()
         return expense
 
+    def create_many(self, expenses: List[Expense]) -> List[Expense]:
+        """
+        Insert many expenses with their items and splits without committing.
+        One flush batches the INSERTs per table, and ids come back via RETURNING.
+        """
+        self.db.add_all(expenses)
+        self.db.flush()
+        return expenses
+
+    def get_existing_currency_codes(self, codes: Iterable[str]) -> Set[str]:
+        """Return the subset of currency codes that exist."""
+        codes = set(codes)
+        if not codes:
+            return set()
+        return {code for (code,) in self.db.query(Currency.code).filter(Currency.code.in_(codes))}
+
+    def get_existing_category_ids(self, category_ids: Iterable[int]) -> Set[int]:
+        """Return the subset of category ids that exist."""
+        category_ids = set(category_ids)
+        if not category_ids:
+            return set()
+        return {
+            category_id
+            for (category_id,) in self.db.query(Category.id).filter(Category.id.in_(category_ids))
+        }
+
+    def get_changed_expenses(self, group_id: int, since: datetime) -> Tuple[List[ExpenseView], List[int]]:
+        """
+        Get a group's expenses created, updated or deleted at or after `since`,
+        for delta sync: the live ones as views and the ids of the deleted ones.
+        Seeks on the (group_id, greatest(created_at, updated_at, deleted_at)) index.
+        """
+        rows = self.db.execute(
+            select(*EXPENSE_VIEW_COLUMNS, *USER_VIEW_COLUMNS, Expense.deleted_at)
+            .join(User, User.id == Expense.payer_user_id)
+            .where(
+                Expense.group_id == group_id,
+                func.greatest(Expense.created_at, Expense.updated_at, Expense.deleted_at) >= since,
+            )
+            .order_by(Expense.id)
+        ).all()
+        deleted_ids = [row.id for row in rows if row.deleted_at is not None]
+        expenses = _expense_views(row[:-1] for row in rows if row.deleted_at is None)
+        if expenses:
+            by_id = {expense.id: expense for expense in expenses}
+            _attach_children(
+                by_id,
+                self.db.execute(_split_views_query(group_id, by_id)),
+                self.db.execute(_item_views_query(by_id)),
+            )
+        return expenses, deleted_ids
+
     def update(self, expense: Expense) -> Expense:
-        """Update an expense."""
-        expense.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(expense)
+        """Update an expense; stamped with the database clock, which sync tokens are compared against."""
+        expense.updated_at = func.now()
         return expense
 
     def soft_delete(self, expense_id: int) -> None:
         """Soft delete an expense."""
-        expense = self.db.query(Expense).filter(Expense.id == expense_id).first()
+        expense = self.db.get(Expense, expense_id)
         if expense:
-            expense.deleted_at = datetime.utcnow()
-            self.db.commit()
+            expense.deleted_at = func.now()
+
+
+class AsyncExpenseRepository:
+    """Async repository for expense listings on the request path."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_group_expenses(
+        self, group_id: int, limit: int = 50, before: Optional[Tuple[datetime, int]] = None
+    ) -> List[ExpenseView]:
+        """Get a page of a group's expenses, newest first; same queries as ExpenseRepository."""
+        expenses = _expense_views(await self.db.execute(_expense_page_query(group_id, limit, before)))
+        if not expenses:
+            return expenses
+
+        by_id = {expense.id: expense for expense in expenses}
+        _attach_children(
+            by_id,
+            await self.db.execute(_split_views_query(group_id, by_id)),
+            await self.db.execute(_item_views_query(by_id)),
+        )
+        return expenses
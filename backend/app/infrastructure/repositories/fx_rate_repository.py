@@ -0,0 +1,51 @@
+"""
+FX rate repository for database operations.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+from app.infrastructure.db.models import Currency, FxRate
+
+
+class FxRateRepository:
+    """Repository for exchange rates and currency metadata."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_latest_rates(self) -> Dict[Tuple[str, str], Decimal]:
+        """Get the most recent rate of every currency pair: {(base, quote): rate}."""
+        rows = (
+            self.db.query(FxRate.base_code, FxRate.quote_code, FxRate.rate)
+            .distinct(FxRate.base_code, FxRate.quote_code)
+            .order_by(FxRate.base_code, FxRate.quote_code, FxRate.effective_date.desc())
+            .all()
+        )
+        return {(base, quote): rate for base, quote, rate in rows}
+
+    def get_precisions(self) -> Dict[str, int]:
+        """Get the number of minor-unit decimal places of every currency."""
+        return {
+            code: precision if precision is not None else 2
+            for code, precision in self.db.query(Currency.code, Currency.precision)
+        }
+
+    def upsert_rates(self, rates: Iterable[Tuple[str, str, date, Decimal]]) -> int:
+        """Insert or overwrite (base, quote, effective_date, rate) rows. Returns the row count."""
+        rows = [
+            {"base_code": base, "quote_code": quote, "effective_date": day, "rate": rate}
+            for base, quote, day, rate in rates
+        ]
+        if not rows:
+            return 0
+
+        stmt = insert(FxRate).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FxRate.base_code, FxRate.quote_code, FxRate.effective_date],
+            set_={"rate": stmt.excluded.rate},
+        )
+        self.db.execute(stmt)
+        return len(rows)
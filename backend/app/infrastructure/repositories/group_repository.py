@@ -1,11 +1,33 @@
 """
 Group repository for database operations.
 """
-from typing import List, Optional
+from typing import Dict, FrozenSet, Iterable, List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
 from app.infrastructure.db.models import Group, GroupMember, User
 
+# Session.info key for the membership cache. A session lives for one request,
+# so every service and repository in that request shares the cache. An
+# AsyncSession shares `info` with its sync session, so async repositories and
+# sync services run through run_sync share it too.
+MEMBER_IDS_CACHE_KEY = "group_member_ids"
+
+
+def _member_ids_query(group_id: int):
+    """Select the user ids of a group's members."""
+    return select(GroupMember.user_id).where(GroupMember.group_id == group_id)
+
+
+def _member_version_query(group_id: int, user_id: int):
+    """Select a group's version, only if the user is a member."""
+    return (
+        select(Group.version)
+        .join(GroupMember, GroupMember.group_id == Group.id)
+        .where(Group.id == group_id, GroupMember.user_id == user_id)
+    )
+
 
 class GroupRepository:
     """Repository for group operations."""
@@ -22,6 +44,10 @@ class GroupRepository:
             .first()
         )
 
+    def get_default_currency(self, group_id: int) -> Optional[str]:
+        """Get a group's default currency without loading its members."""
+        return self.db.query(Group.default_currency).filter(Group.id == group_id).scalar()
+
     def get_user_groups(self, user_id: int) -> List[Group]:
         """Get all groups a user belongs to."""
         return (
@@ -32,40 +58,104 @@ class GroupRepository:
             .all()
         )
 
+    def get_by_ids(self, group_ids: Iterable[int]) -> List[Group]:
+        """Get groups by ID with members loaded, in id order."""
+        return (
+            self.db.query(Group)
+            .options(joinedload(Group.members).joinedload(GroupMember.user))
+            .filter(Group.id.in_(list(group_ids)))
+            .order_by(Group.id)
+            .all()
+        )
+
+    def get_member_version(self, group_id: int, user_id: int) -> Optional[int]:
+        """Get a group's version if the user is a member, else None; two primary-key lookups."""
+        return self.db.scalar(_member_version_query(group_id, user_id))
+
+    def get_user_group_versions(self, user_id: int) -> Dict[int, int]:
+        """Get the version of every group a user belongs to, by group id."""
+        return dict(
+            self.db.execute(
+                select(Group.id, Group.version)
+                .join(GroupMember, GroupMember.group_id == Group.id)
+                .where(GroupMember.user_id == user_id)
+            ).all()
+        )
+
     def create(self, name: str, created_by_user_id: int, default_currency: str = "USD") -> Group:
         """Create a new group and add creator as owner."""
         group = Group(
             name=name,
             created_by_user_id=created_by_user_id,
             default_currency=default_currency,
+            # Add creator as owner
+            members=[GroupMember(user_id=created_by_user_id, role="owner")],
         )
         self.db.add(group)
         self.db.flush()
-
-        # Add creator as owner
-        member = GroupMember(
-            group_id=group.id,
-            user_id=created_by_user_id,
-            role="owner",
-        )
-        self.db.add(member)
-        self.db.commit()
-        self.db.refresh(group)
+        self._invalidate_member_ids(group.id)
         return group
 
     def add_member(self, group_id: int, user_id: int) -> GroupMember:
-        """Add a user to a group."""
-        member = GroupMember(group_id=group_id, user_id=user_id, role="member")
+        """Add a user to a group; a loaded `Group.members` picks the new member up."""
+        member = GroupMember(group=self.db.get(Group, group_id), user_id=user_id, role="member")
         self.db.add(member)
-        self.db.commit()
-        self.db.refresh(member)
+        self.db.flush()
+        self._invalidate_member_ids(group_id)
         return member
 
+    def get_member_ids(self, group_id: int) -> FrozenSet[int]:
+        """
+        Get the ids of all members of a group in one query.
+        Cached on the session, so repeated checks within a request are free.
+        """
+        cache = self.db.info.setdefault(MEMBER_IDS_CACHE_KEY, {})
+        if group_id not in cache:
+            cache[group_id] = frozenset(self.db.execute(_member_ids_query(group_id)).scalars())
+        return cache[group_id]
+
     def is_member(self, group_id: int, user_id: int) -> bool:
         """Check if user is a member of the group."""
-        return (
-            self.db.query(GroupMember)
-            .filter(GroupMember.group_id == group_id, GroupMember.user_id == user_id)
-            .first()
-            is not None
-        )
+        return user_id in self.get_member_ids(group_id)
+
+    def bump_version(self, group_id: int) -> None:
+        """Bump a group's version, invalidating clients' ETags. Call first in the transaction."""
+        self.bump_versions([group_id])
+
+    def bump_versions(self, group_ids: Iterable[int]) -> None:
+        """Bump several groups' versions; rows are locked in id order, so concurrent bumps cannot deadlock."""
+        for group_id in sorted(set(group_ids)):
+            self.db.execute(
+                update(Group)
+                .where(Group.id == group_id)
+                .values(version=Group.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+
+    def _invalidate_member_ids(self, group_id: int) -> None:
+        """Drop the cached member ids of a group after its membership changes."""
+        self.db.info.get(MEMBER_IDS_CACHE_KEY, {}).pop(group_id, None)
+
+
+class AsyncGroupRepository:
+    """Async repository for group membership checks on the request path."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_member_ids(self, group_id: int) -> FrozenSet[int]:
+        """Get the ids of all members of a group; shares GroupRepository's session cache."""
+        cache = self.db.info.setdefault(MEMBER_IDS_CACHE_KEY, {})
+        if group_id not in cache:
+            result = await self.db.execute(_member_ids_query(group_id))
+            cache[group_id] = frozenset(result.scalars())
+        return cache[group_id]
+
+    async def is_member(self, group_id: int, user_id: int) -> bool:
+        """Check if user is a member of the group."""
+        return user_id in await self.get_member_ids(group_id)
+
+    async def get_member_version(self, group_id: int, user_id: int) -> Optional[int]:
+        """Get a group's version if the user is a member, else None; two primary-key lookups."""
+        result = await self.db.execute(_member_version_query(group_id, user_id))
+        return result.scalar()
@@ -0,0 +1,49 @@
+"""
+Idempotency key repository for database operations.
+"""
+from typing import Any, Dict, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.models import IdempotencyKey
+
+
+class IdempotencyRepository:
+    """Repository for the keys of replayed client mutations."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def claim(self, user_id: int, key: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Claim a user's key for a mutation about to be applied, without committing.
+
+        Returns (True, None) if the key is new: the claim commits or rolls back
+        with the mutation. Otherwise returns (False, stored result). A concurrent
+        claim of the same key waits for the first transaction to finish.
+        """
+        claimed = self.db.execute(
+            insert(IdempotencyKey)
+            .values(user_id=user_id, key=key)
+            .on_conflict_do_nothing()
+            .returning(IdempotencyKey.key)
+        ).first()
+        if claimed is not None:
+            return True, None
+        return False, self.db.scalar(
+            select(IdempotencyKey.result).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        )
+
+    def save_result(self, user_id: int, key: str, result: Dict[str, Any]) -> None:
+        """Store the result returned when the key is replayed."""
+        self.db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .values(result=result)
+        )
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+        """Delete keys claimed before `cutoff`; their mutations can no longer be replayed. Does not commit."""
+        return self.db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff)).rowcount
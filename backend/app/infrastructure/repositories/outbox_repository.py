@@ -0,0 +1,71 @@
+"""
+Outbox repository for database operations.
+"""
+from typing import Dict, List
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.models import OutboxEvent
+
+# Session.info flag set when a session appends events, so the worker can wake on commit
+OUTBOX_WRITTEN = "outbox_written"
+
+# pg advisory lock key held by the transaction delivering a batch ("outbox" in ASCII)
+DELIVERY_LOCK_KEY = 0x6F7574626F78
+
+
+class OutboxRepository:
+    """Repository for the activity event outbox."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add(self, event: OutboxEvent) -> OutboxEvent:
+        """Append an event; it is inserted when the unit of work commits."""
+        self.db.add(event)
+        self.db.info[OUTBOX_WRITTEN] = True
+        return event
+
+    def add_many(self, events: List[Dict]) -> None:
+        """Bulk append events (column dicts) in one executemany, without committing."""
+        if events:
+            self.db.execute(insert(OutboxEvent), events)
+            self.db.info[OUTBOX_WRITTEN] = True
+
+    def lock_delivery(self) -> None:
+        """
+        Wait for the delivery lock, held until the transaction ends. Batches from
+        different workers then commit one after another, so activity event ids
+        become visible in increasing order.
+        """
+        self.db.execute(select(func.pg_advisory_xact_lock(DELIVERY_LOCK_KEY)))
+
+    def take_batch(self, limit: int) -> List[Row]:
+        """
+        Delete and return up to `limit` of the oldest events, in id order.
+
+        Rows locked by another worker are skipped. The deletion only sticks if
+        the caller commits, so a batch whose delivery fails is rolled back into
+        the outbox and taken again later.
+        """
+        batch = (
+            select(OutboxEvent.id)
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+            .correlate(None)
+        )
+        rows = self.db.execute(
+            delete(OutboxEvent).where(OutboxEvent.id.in_(batch)).returning(*OutboxEvent.__table__.c)
+        ).all()
+        return sorted(rows, key=lambda row: row.id)
+
+    def get_backlog(self) -> Dict:
+        """Undelivered events: how many, and how long the oldest has waited in seconds."""
+        oldest = select(OutboxEvent.created_at).order_by(OutboxEvent.id).limit(1).scalar_subquery().correlate(None)
+        pending, oldest_age = self.db.execute(
+            select(func.count(OutboxEvent.id), func.extract("epoch", func.now() - oldest))
+        ).one()
+        return {"pending": pending, "oldest_age_seconds": float(oldest_age or 0)}
@@ -2,6 +2,7 @@
 Settlement repository for database operations.
 """
 from typing import List
+from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app.infrastructure.db.models import Settlement
@@ -22,9 +23,17 @@ class SettlementRepository:
             .all()
         )
 
+    def get_created_since(self, group_id: int, since: datetime) -> List[Settlement]:
+        """Get a group's settlements created at or after `since`, oldest first, for delta sync."""
+        return (
+            self.db.query(Settlement)
+            .filter(Settlement.group_id == group_id, Settlement.created_at >= since)
+            .order_by(Settlement.created_at, Settlement.id)
+            .all()
+        )
+
     def create(self, settlement: Settlement) -> Settlement:
         """Create a new settlement."""
         self.db.add(settlement)
-        self.db.commit()
-        self.db.refresh(settlement)
+        self.db.flush()
         return settlement
@@ -2,9 +2,46 @@
 User repository for database operations.
 """
 from typing import Optional
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.infrastructure.db.models import User
+from app.infrastructure.repositories.views import UserView
+
+# Authenticated users by id, as detached views. In-process: a user updated through
+# another process is served stale from this one for up to USER_CACHE_TTL_SECONDS.
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+# Session.info key for the ids of users updated in the session's transaction
+UPDATED_USER_IDS = "updated_user_ids"
+
+
+def _user_view(user: User) -> UserView:
+    return UserView(user.id, user.email, user.name, user.default_currency, user.created_at)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target: User) -> None:
+    """Drop an updated user from the cache now, and again once the update commits."""
+    user_cache.invalidate(target.id)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(UPDATED_USER_IDS, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_updated_users(session: Session) -> None:
+    # A request that read the old row before the commit may have cached it again
+    for user_id in session.info.pop(UPDATED_USER_IDS, ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_updated_users(session: Session) -> None:
+    session.info.pop(UPDATED_USER_IDS, None)
 
 
 class UserRepository:
@@ -30,6 +67,28 @@ class UserRepository:
             default_currency=default_currency,
         )
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self.db.flush()
         return user
+
+
+class AsyncUserRepository:
+    """Async repository for user lookups on the request path."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        """Get user by ID."""
+        result = await self.db.execute(select(User).where(User.id == user_id))
+        return result.scalars().first()
+
+    async def get_cached(self, user_id: int) -> Optional[UserView]:
+        """Get a user's public fields through the in-process user cache; queries only on a miss."""
+        view = user_cache.get(user_id)
+        if view is None:
+            user = await self.get_by_id(user_id)
+            if user is None:
+                return None
+            view = _user_view(user)
+            user_cache.set(user_id, view)
+        return view
@@ -0,0 +1,72 @@
+"""
+Read-only views shared by repositories: plain dataclasses built from selected
+columns, not tracked by the session, and the columns each one is selected from.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from app.infrastructure.db.models import Expense, ExpenseItem, ExpenseSplit, SplitType, User
+
+
+@dataclass(slots=True)
+class UserView:
+    """Public user fields, without the password hash."""
+    id: int
+    email: str
+    name: str
+    default_currency: str
+    created_at: datetime
+
+
+@dataclass(slots=True)
+class ExpenseSplitView:
+    """Read-only split row for expense listings."""
+    id: int
+    user_id: int
+    amount_cents: int
+    share_type: SplitType
+    share_value: Optional[str]
+
+
+@dataclass(slots=True)
+class ExpenseItemView:
+    """Read-only item row for expense listings."""
+    id: int
+    description: str
+    amount_cents: int
+    category_id: Optional[int]
+
+
+@dataclass(slots=True)
+class ExpenseView:
+    """Read-only expense for listings: only the columns the API returns, not tracked by the session."""
+    id: int
+    group_id: Optional[int]
+    payer_user_id: int
+    amount_cents: int
+    currency_code: str
+    description: str
+    notes: Optional[str]
+    category_id: Optional[int]
+    occurred_at: datetime
+    created_at: datetime
+    payer: UserView
+    splits: List[ExpenseSplitView] = field(default_factory=list)
+    items: List[ExpenseItemView] = field(default_factory=list)
+
+
+# Columns selected for each view, in field order
+EXPENSE_VIEW_COLUMNS = (
+    Expense.id, Expense.group_id, Expense.payer_user_id, Expense.amount_cents,
+    Expense.currency_code, Expense.description, Expense.notes, Expense.category_id,
+    Expense.occurred_at, Expense.created_at,
+)
+USER_VIEW_COLUMNS = (User.id, User.email, User.name, User.default_currency, User.created_at)
+SPLIT_VIEW_COLUMNS = (
+    ExpenseSplit.id, ExpenseSplit.user_id, ExpenseSplit.amount_cents,
+    ExpenseSplit.share_type, ExpenseSplit.share_value,
+)
+ITEM_VIEW_COLUMNS = (
+    ExpenseItem.id, ExpenseItem.description, ExpenseItem.amount_cents, ExpenseItem.category_id,
+)
@@ -0,0 +1,58 @@
+"""
+Unit of work: one transaction per application-service call.
+"""
+from sqlalchemy.orm import Session
+
+from app.infrastructure.repositories.activity_repository import ActivityRepository
+from app.infrastructure.repositories.balance_repository import BalanceRepository
+from app.infrastructure.repositories.bank_import_repository import BankImportRepository
+from app.infrastructure.repositories.expense_repository import ExpenseRepository
+from app.infrastructure.repositories.group_repository import GroupRepository
+from app.infrastructure.repositories.idempotency_repository import IdempotencyRepository
+from app.infrastructure.repositories.outbox_repository import OutboxRepository
+from app.infrastructure.repositories.settlement_repository import SettlementRepository
+from app.infrastructure.repositories.user_repository import UserRepository
+
+# Session.info key: how many units of work are open on the session
+_DEPTH_KEY = "unit_of_work_depth"
+
+
+class UnitOfWork:
+    """
+    Transaction boundary over the repositories of one session.
+
+    Repositories add, flush and execute but never commit. A service wraps each
+    write in `with self.uow:`, which commits once if the block succeeds and
+    rolls back if it raises. Sessions keep objects loaded after commit, so the
+    service can return them without reloading.
+
+    Units of work nest per session: a block opened inside another (e.g. a
+    service called by SyncService) neither commits nor rolls back, and the
+    outermost block does, so the caller's own writes share the transaction.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.users = UserRepository(db)
+        self.groups = GroupRepository(db)
+        self.expenses = ExpenseRepository(db)
+        self.settlements = SettlementRepository(db)
+        self.activity = ActivityRepository(db)
+        self.outbox = OutboxRepository(db)
+        self.balances = BalanceRepository(db)
+        self.bank_imports = BankImportRepository(db)
+        self.idempotency_keys = IdempotencyRepository(db)
+
+    def __enter__(self) -> "UnitOfWork":
+        self.db.info[_DEPTH_KEY] = self.db.info.get(_DEPTH_KEY, 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.db.info[_DEPTH_KEY] -= 1
+        if self.db.info[_DEPTH_KEY]:
+            # The enclosing unit of work commits or rolls back
+            return
+        if exc_type is None:
+            self.db.commit()
+        else:
+            self.db.rollback()
@@ -4,7 +4,10 @@ SplitDumb FastAPI application entry point.
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import auth, users, groups, expenses, balances, settlements, activity
+from app.api import auth, users, groups, expenses, balances, settlements, activity, imports, sync, internal
+from app.application.bank_import_service import bank_import_sweeper
+from app.application.group_event_listener import group_event_listener
+from app.application.outbox_worker import outbox_worker
 from app.core.config import settings
 from app.core.database import engine
 from app.infrastructure.db.models import Base
@@ -35,6 +38,41 @@ app.include_router(expenses.router, prefix="/groups", tags=["expenses"])
 app.include_router(balances.router, prefix="/groups", tags=["balances"])
 app.include_router(settlements.router, prefix="/groups", tags=["settlements"])
 app.include_router(activity.router, prefix="/groups", tags=["activity"])
+app.include_router(imports.router, prefix="/groups", tags=["imports"])
+app.include_router(sync.router, prefix="/sync", tags=["sync"])
+# Internal metrics; require INTERNAL_API_TOKEN
+app.include_router(internal.router, prefix="/health")
+
+
+@app.on_event("startup")
+def start_outbox_worker():
+    if settings.OUTBOX_WORKER_ENABLED:
+        outbox_worker.start()
+
+
+@app.on_event("startup")
+def start_group_event_listener():
+    group_event_listener.start()
+
+
+@app.on_event("startup")
+def start_bank_import_sweeper():
+    bank_import_sweeper.start()
+
+
+@app.on_event("shutdown")
+def stop_outbox_worker():
+    outbox_worker.stop()
+
+
+@app.on_event("shutdown")
+def stop_group_event_listener():
+    group_event_listener.stop()
+
+
+@app.on_event("shutdown")
+def stop_bank_import_sweeper():
+    bank_import_sweeper.stop()
 
 
 @app.get("/")
@@ -0,0 +1,111 @@
+"""
+Move cold expenses out of the hot tables into archived_expenses, or restore them.
+
+Usage: python scripts/archive_expenses.py archive [--deleted-days N] [--group-days N] [--batch-size N]
+                                                  [--idempotency-days N]
+       python scripts/archive_expenses.py restore (--expense ID | --group ID)
+
+`archive` moves expenses soft-deleted more than --deleted-days ago (default 30),
+and every expense of groups archived more than --group-days ago (default 30),
+with their items and splits. Each expense becomes one archive row; the hot
+tables and their indexes then only hold live data. Batches are committed one
+at a time, so the job can be stopped and rerun; run it nightly. Balances do not
+change: balance queries read the live expenses of archived groups from the archive.
+It also purges sync idempotency keys older than --idempotency-days (default
+IDEMPOTENCY_KEY_RETENTION_DAYS); mutations replayed after that apply again.
+
+`restore` moves one expense, or every archived expense of a group, back into the
+hot tables. Restoring a group also clears its archived_at, so it is not archived
+again by the next run. Archived expenses can be looked up read-only through
+`GET /groups/{group_id}/archived-expenses`.
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.infrastructure.repositories.archive_repository import ArchiveRepository
+from app.infrastructure.repositories.idempotency_repository import IdempotencyRepository
+
+# Create engine and session
+engine = create_engine(settings.DATABASE_URL)
+SessionLocal = sessionmaker(bind=engine)
+
+
+def _archive_batches(db, find_keys, batch_size):
+    """Archive batches of expenses selected by `find_keys` until none are left; returns how many."""
+    archive_repo = ArchiveRepository(db)
+    archived = 0
+    while True:
+        keys = find_keys(batch_size)
+        if not keys:
+            return archived
+        archived += archive_repo.archive(keys)
+        db.commit()
+
+
+def archive_expenses(
+    deleted_days=30, group_days=30, batch_size=1000, idempotency_days=settings.IDEMPOTENCY_KEY_RETENTION_DAYS
+):
+    """Archive soft-deleted expenses and the expenses of archived groups, and purge old idempotency keys."""
+    db = SessionLocal()
+    try:
+        archive_repo = ArchiveRepository(db)
+        now = datetime.now(timezone.utc)
+        deleted = _archive_batches(
+            db,
+            lambda limit: archive_repo.get_deleted_expense_keys(now - timedelta(days=deleted_days), limit),
+            batch_size,
+        )
+        grouped = _archive_batches(
+            db,
+            lambda limit: archive_repo.get_archived_group_expense_keys(now - timedelta(days=group_days), limit),
+            batch_size,
+        )
+        purged = IdempotencyRepository(db).delete_older_than(now - timedelta(days=idempotency_days))
+        db.commit()
+        print(f"Archived {deleted} deleted expenses and {grouped} expenses of archived groups.")
+        print(f"Purged {purged} idempotency keys.")
+    finally:
+        db.close()
+
+
+def restore(expense_id=None, group_id=None):
+    """Restore one archived expense, or a whole archived group."""
+    db = SessionLocal()
+    try:
+        archive_repo = ArchiveRepository(db)
+        if group_id is not None:
+            restored = archive_repo.restore_group(group_id)
+        else:
+            restored = archive_repo.restore_expense(expense_id)
+        db.commit()
+        print(f"Restored {restored} expenses.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive_parser = commands.add_parser("archive", help="Archive cold expenses")
+    archive_parser.add_argument("--deleted-days", type=int, default=30)
+    archive_parser.add_argument("--group-days", type=int, default=30)
+    archive_parser.add_argument("--batch-size", type=int, default=1000)
+    archive_parser.add_argument("--idempotency-days", type=int, default=settings.IDEMPOTENCY_KEY_RETENTION_DAYS)
+    restore_parser = commands.add_parser("restore", help="Restore archived expenses")
+    target = restore_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--expense", type=int)
+    target.add_argument("--group", type=int)
+    args = parser.parse_args()
+
+    if args.command == "archive":
+        archive_expenses(args.deleted_days, args.group_days, args.batch_size, args.idempotency_days)
+    else:
+        restore(args.expense, args.group)
@@ -0,0 +1,67 @@
+"""
+Benchmark the bulk balance engine on synthetic delta rows.
+
+Usage: python scripts/bench_bulk_balances.py [ROWS] [CHUNK_SIZE]
+Defaults to 10,000,000 split rows in 1,000,000-row chunks, spread over
+100,000 groups of 10 users with 3 currencies.
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from app.domain.bulk_balance_engine import BulkBalanceEngine
+
+GROUPS = 100_000
+USERS_PER_GROUP = 10
+CURRENCIES = np.array(["USD", "EUR", "GBP"])
+
+
+def make_chunk(rng, rows):
+    """Random (group_id, currency, user_id, delta) arrays for one chunk."""
+    group_ids = rng.integers(1, GROUPS + 1, rows)
+    user_ids = group_ids * USERS_PER_GROUP + rng.integers(0, USERS_PER_GROUP, rows)
+    currencies = CURRENCIES[rng.integers(0, len(CURRENCIES), rows)]
+    deltas = rng.integers(-100_000, 100_000, rows)
+    return group_ids, currencies, user_ids, deltas
+
+
+def bench_arrays(total_rows, chunk_size):
+    """Time the engine on pre-built NumPy chunks (the reduction alone)."""
+    rng = np.random.default_rng(0)
+    chunks = [make_chunk(rng, min(chunk_size, total_rows - start)) for start in range(0, total_rows, chunk_size)]
+
+    bulk = BulkBalanceEngine()
+    started = time.perf_counter()
+    for chunk in chunks:
+        bulk.add_arrays(*chunk)
+    keys = len(bulk.result_arrays()[3])
+    return time.perf_counter() - started, keys
+
+
+def bench_rows(total_rows, chunk_size):
+    """Time the engine on tuples, as streamed from the database driver."""
+    rng = np.random.default_rng(1)
+    group_ids, currencies, user_ids, deltas = make_chunk(rng, chunk_size)
+    chunk = list(zip(group_ids.tolist(), currencies.tolist(), user_ids.tolist(), deltas.tolist()))
+
+    bulk = BulkBalanceEngine()
+    started = time.perf_counter()
+    for _ in range(total_rows // chunk_size):
+        bulk.add_rows(chunk)
+    bulk.result_arrays()
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    total_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+
+    seconds, keys = bench_arrays(total_rows, chunk_size)
+    print(f"arrays: {total_rows:,} rows -> {keys:,} balances in {seconds:.2f}s ({total_rows / seconds:,.0f} rows/s)")
+
+    seconds = bench_rows(total_rows, chunk_size)
+    print(f"tuples: {total_rows:,} rows in {seconds:.2f}s ({total_rows / seconds:,.0f} rows/s)")
@@ -0,0 +1,104 @@
+"""
+Benchmark concurrent read throughput of a running API server.
+
+Usage: python scripts/bench_concurrent_requests.py [--url URL] [--concurrency N]
+                                                   [--duration SECONDS] [--expenses N]
+
+Registers a throwaway user, creates a group with `--expenses` expenses, then
+keeps `--concurrency` clients busy for `--duration` seconds cycling through the
+group's read endpoints (expense list, activity, balances, point-in-time
+balances). Prints requests/second and latency percentiles.
+
+Start the server separately, e.g. `uvicorn app.main:app --workers 1`, so the
+numbers reflect one event loop.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+async def setup(client, expenses):
+    """Create a user and a group with some history; returns (auth headers, group paths)."""
+    response = await client.post(
+        "/auth/register",
+        json={"email": f"bench-{uuid.uuid4().hex}@example.com", "password": "benchpass", "name": "Bench"},
+    )
+    response.raise_for_status()
+    body = response.json()
+    headers = {"Authorization": f"Bearer {body['access_token']}"}
+    user_id = body["user"]["id"]
+
+    response = await client.post("/groups", json={"name": "Bench"}, headers=headers)
+    response.raise_for_status()
+    group_id = response.json()["id"]
+
+    expense = {
+        "payer_id": user_id, "amount_cents": 1234, "currency_code": "USD",
+        "description": "Bench", "split_data": {"participants": [user_id]},
+    }
+    for start in range(0, expenses, 1000):
+        batch = [expense] * min(1000, expenses - start)
+        response = await client.post(
+            f"/groups/{group_id}/expenses:batch", json={"expenses": batch}, headers=headers
+        )
+        response.raise_for_status()
+
+    paths = [
+        f"/groups/{group_id}/expenses",
+        f"/groups/{group_id}/activity",
+        f"/groups/{group_id}/balances",
+        f"/groups/{group_id}/balances?as_of=2100-01-01T00:00:00Z",
+        "/users/me",
+    ]
+    return headers, paths
+
+
+async def worker(client, headers, paths, deadline, latencies, errors):
+    """Issue requests back to back until the deadline."""
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+
+async def bench(url, concurrency, duration, expenses):
+    """Run the benchmark and print a summary."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        headers, paths = await setup(client, expenses)
+
+        latencies, errors = [], []
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            worker(client, headers, paths, deadline, latencies, errors) for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{len(latencies)} requests in {elapsed:.1f}s with {concurrency} concurrent clients: "
+        f"{len(latencies) / elapsed:,.0f} req/s, "
+        f"p50 {quantiles[49] * 1000:.1f} ms, p95 {quantiles[94] * 1000:.1f} ms, "
+        f"max {latencies[-1] * 1000:.1f} ms, {len(errors)} errors"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--expenses", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(bench(args.url, args.concurrency, args.duration, args.expenses))
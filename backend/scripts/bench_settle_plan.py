@@ -0,0 +1,75 @@
+"""
+Benchmark the settle-up planner on synthetic groups.
+
+Usage: python scripts/bench_settle_plan.py [MEMBERS ...]
+Defaults to 10, 100, 1000, 2000 and 5000 members.
+
+`compute ms` is a plan computed from balances, as on the first request after a
+write; `cached ms` is a repeat request served from the plan cache, which the
+service reaches after one indexed group version lookup (not measured here).
+Every write bumps the group version, so the first request after each write
+always pays `compute ms`: only cache hits are sub-millisecond at every size.
+Sizes whose computed plan misses the 1 ms budget are flagged.
+"""
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.application.balance_service import settle_plan_cache
+from app.domain.debt_simplification import DebtSimplificationService
+
+
+def make_balances(members, seed=0):
+    """Random net balances in cents for a group, summing to zero."""
+    rng = random.Random(seed)
+    balances = {user_id: rng.randint(-50_000, 50_000) for user_id in range(1, members)}
+    balances[members] = -sum(balances.values())
+    return balances
+
+
+def bench(members, repeat=7):
+    """Return (best seconds computed, best seconds cached, transfer count) for a group of the given size."""
+    balances = make_balances(members)
+    number = max(1, 2000 // members)
+    timings = timeit.repeat(
+        lambda: DebtSimplificationService.simplify_debts(balances), number=number, repeat=repeat
+    )
+    transfers = DebtSimplificationService.simplify_debts(balances)
+
+    # Keyed as BalanceServiceApp.get_settle_plan keys it: (group_id, version, as_of, convert)
+    key = (members, 1, None, False)
+    settle_plan_cache.set(key, {"transfers": {"USD": transfers}})
+    cached_timings = timeit.repeat(lambda: settle_plan_cache.get(key), number=1000, repeat=repeat)
+
+    # Sanity check: applying the plan settles everyone
+    settled = dict(balances)
+    for t in transfers:
+        settled[t["from_user_id"]] += t["amount_cents"]
+        settled[t["to_user_id"]] -= t["amount_cents"]
+    assert not any(settled.values()), "plan does not settle the group"
+
+    return min(timings) / number, min(cached_timings) / 1000, len(transfers)
+
+
+# Latency target for a settle-plan request, excluding the database
+BUDGET_MS = 1.0
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000, 2000, 5000]
+    print(f"{'members':>8} {'transfers':>10} {'compute ms':>11} {'cached ms':>10}")
+    over_budget = []
+    for members in sizes:
+        seconds, cached_seconds, transfers = bench(members)
+        flag = " over budget" if seconds * 1000 > BUDGET_MS else ""
+        print(f"{members:>8} {transfers:>10} {seconds * 1000:>11.3f} {cached_seconds * 1000:>10.4f}{flag}")
+        if flag:
+            over_budget.append(members)
+    if over_budget:
+        print(
+            f"Only cache hits are under {BUDGET_MS:g} ms at {', '.join(map(str, over_budget))} members: "
+            "the first request after each write computes the plan."
+        )
@@ -0,0 +1,82 @@
+"""
+Benchmark split allocation against the previous Decimal-based implementation.
+
+Usage: python scripts/bench_split_allocator.py [PARTICIPANTS] [EXPENSES]
+Defaults to one 10,000-participant shares split, then 10,000 expenses of
+10 participants each allocated one by one and in a single vectorized batch.
+"""
+import sys
+import time
+from decimal import Decimal, ROUND_HALF_UP
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from app.domain.split_allocator import SplitAllocator
+
+
+def legacy_allocate(amount_cents, weights):
+    """The Decimal loop shares splits used before, last participant takes the remainder."""
+    total = sum(weights)
+    result = []
+    allocated = 0
+    for i, weight in enumerate(weights):
+        if i == len(weights) - 1:
+            amount = amount_cents - allocated
+        else:
+            amount_decimal = Decimal(weight) / Decimal(total) * Decimal(amount_cents)
+            amount = int(amount_decimal.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+            allocated += amount
+        result.append(amount)
+    return result
+
+
+def timed(fn, *args, repeat=5):
+    """Best wall time over `repeat` runs, and the last result."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def bench_single(participants):
+    """One large split."""
+    rng = np.random.default_rng(0)
+    weights = rng.integers(1, 10, participants).tolist()
+    amount = 123_456_789
+
+    legacy_time, legacy = timed(legacy_allocate, amount, weights)
+    new_time, allocations = timed(SplitAllocator.allocate, amount, weights)
+    assert sum(allocations) == amount
+    print(f"Single split, {participants:,} participants:")
+    print(f"  legacy Decimal loop: {legacy_time * 1000:8.2f} ms (last share {legacy[-1]})")
+    print(f"  largest remainder:   {new_time * 1000:8.2f} ms (max share error < 1 cent)")
+
+
+def bench_batch(expenses, participants=10):
+    """Many small splits, per expense and vectorized."""
+    rng = np.random.default_rng(1)
+    amounts = rng.integers(1, 1_000_000, expenses).tolist()
+    weight_lists = rng.integers(1, 10, (expenses, participants)).tolist()
+
+    legacy_time, _ = timed(lambda: [legacy_allocate(a, w) for a, w in zip(amounts, weight_lists)], repeat=3)
+    loop_time, looped = timed(
+        lambda: [SplitAllocator.allocate(a, w) for a, w in zip(amounts, weight_lists)], repeat=3
+    )
+    batch_time, batched = timed(SplitAllocator.allocate_many, amounts, weight_lists, repeat=3)
+    assert batched == looped
+    print(f"Batch of {expenses:,} expenses x {participants} participants:")
+    print(f"  legacy Decimal loop: {legacy_time * 1000:8.2f} ms")
+    print(f"  allocate per item:   {loop_time * 1000:8.2f} ms")
+    print(f"  allocate_many:       {batch_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    participants = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    expenses = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    bench_single(participants)
+    bench_batch(expenses)
@@ -0,0 +1,82 @@
+"""
+Build monthly balance checkpoints used by point-in-time (`as_of`) balance queries.
+
+Usage: python scripts/build_balance_checkpoints.py [GROUP_ID ...]
+Processes every group when no ids are given. Safe to run repeatedly (e.g. nightly):
+each group continues from its latest checkpoint, and checkpoints dropped after a
+backdated edit are rebuilt.
+"""
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.domain.balance_service import BalanceService
+from app.infrastructure.db.models import Group
+from app.infrastructure.repositories.balance_repository import BalanceRepository
+
+# Create engine and session
+engine = create_engine(settings.DATABASE_URL)
+SessionLocal = sessionmaker(bind=engine)
+
+
+def _next_month_start(moment):
+    """First instant of the month following `moment`, in UTC."""
+    moment = moment.astimezone(timezone.utc)
+    if moment.month == 12:
+        return datetime(moment.year + 1, 1, 1, tzinfo=timezone.utc)
+    return datetime(moment.year, moment.month + 1, 1, tzinfo=timezone.utc)
+
+
+def build_group_checkpoints(balance_repo, group_id, now):
+    """Add every missing monthly checkpoint of a group up to `now`. Returns how many were added."""
+    period_start, balances = balance_repo.get_latest_checkpoint(group_id)
+    if period_start is None:
+        history_start = balance_repo.get_history_start(group_id)
+        if history_start is None:
+            return 0
+        next_period = _next_month_start(history_start)
+    else:
+        next_period = _next_month_start(period_start)
+
+    added = 0
+    while next_period <= now:
+        # Each step scans one month of history on top of the previous checkpoint
+        delta = balance_repo.compute_group_balances(group_id, since=period_start, until=next_period)
+        balances = BalanceService.add_balances(balances, delta)
+        balance_repo.save_checkpoint(group_id, next_period, balances)
+        period_start, next_period = next_period, _next_month_start(next_period)
+        added += 1
+    return added
+
+
+def build_balance_checkpoints(group_ids=None):
+    """Build missing checkpoints for the given groups (all groups by default)."""
+    db = SessionLocal()
+    try:
+        if not group_ids:
+            group_ids = [group_id for (group_id,) in db.query(Group.id).order_by(Group.id)]
+
+        balance_repo = BalanceRepository(db)
+        now = datetime.now(timezone.utc)
+        added = 0
+        for group_id in group_ids:
+            added += build_group_checkpoints(balance_repo, group_id, now)
+            db.commit()
+
+        print(f"Added {added} checkpoints across {len(group_ids)} groups.")
+    except Exception as e:
+        db.rollback()
+        print(f"Error building checkpoints: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    build_balance_checkpoints([int(arg) for arg in sys.argv[1:]])
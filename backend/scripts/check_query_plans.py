@@ -0,0 +1,291 @@
+"""
+Query plan regression check for the hot repository queries.
+
+Usage: python scripts/check_query_plans.py [--groups N] [--expenses-per-group N] [--verbose]
+
+Seeds a synthetic dataset (N groups of 5 members, with expenses, splits,
+archived expenses, settlements, activity events and ledger rows) inside one transaction, runs
+ANALYZE, then calls each hot repository method and EXPLAINs every statement
+it issues. Exits non-zero if any plan falls back to a sequential scan on a
+hot table. For partitioned tables it also reports how many partitions each
+query touches, so a lost partition-pruning predicate shows up as N/N.
+Everything is rolled back at the end, so it is safe to point at a
+development database; run `alembic upgrade head` first so the indexes exist.
+"""
+import argparse
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.infrastructure.repositories.activity_repository import ActivityRepository
+from app.infrastructure.repositories.balance_repository import BalanceRepository
+from app.infrastructure.repositories.expense_repository import ExpenseRepository
+from app.infrastructure.repositories.group_repository import GroupRepository
+from app.infrastructure.repositories.settlement_repository import SettlementRepository
+
+MEMBERS_PER_GROUP = 5
+
+# Tables that grow with usage; a sequential scan on any of them is a regression
+HOT_TABLES = {
+    "expenses", "expense_splits", "expense_items", "group_members", "settlements",
+    "activity_events", "group_balances", "balance_checkpoints", "groups", "users", "archived_expenses",
+}
+
+SEED_SQL = [
+    # Users, then groups owned by the first member of each
+    """
+    WITH inserted AS (
+        INSERT INTO users (email, password_hash, name, default_currency)
+        SELECT 'plan-check-' || n || '@example.invalid', 'x', 'Plan check ' || n, 'USD'
+        FROM generate_series(1, :groups * {members}) AS n
+        RETURNING id
+    )
+    SELECT min(id) FROM inserted
+    """,
+    """
+    WITH inserted AS (
+        INSERT INTO groups (name, created_by_user_id, default_currency)
+        SELECT 'Plan check ' || i, :first_user + i * {members}, 'USD'
+        FROM generate_series(0, :groups - 1) AS i
+        RETURNING id
+    )
+    SELECT min(id) FROM inserted
+    """,
+    """
+    INSERT INTO group_members (group_id, user_id, role)
+    SELECT :first_group + i, :first_user + i * {members} + j, 'MEMBER'
+    FROM generate_series(0, :groups - 1) AS i, generate_series(0, {members} - 1) AS j
+    """,
+    # One in twenty expenses is soft-deleted
+    """
+    WITH inserted AS (
+        INSERT INTO expenses (
+            group_id, created_by_user_id, payer_user_id, amount_cents, currency_code,
+            description, expense_type, source, occurred_at, created_at, deleted_at
+        )
+        SELECT :first_group + i, :first_user + i * {members} + e % {members},
+               :first_user + i * {members} + e % {members}, 1000 + e, 'USD', 'Plan check',
+               'GROUP', 'MANUAL', now() - e * interval '1 hour', now(),
+               CASE WHEN e % 20 = 0 THEN now() END
+        FROM generate_series(0, :groups - 1) AS i, generate_series(1, :per_group) AS e
+        RETURNING id
+    )
+    SELECT min(id) FROM inserted
+    """,
+    """
+    INSERT INTO expense_splits (expense_id, group_id, user_id, amount_cents, share_type)
+    SELECT e.id, e.group_id, :first_user + (e.group_id - :first_group) * {members} + j,
+           e.amount_cents / {members}, 'EQUAL'
+    FROM expenses e, generate_series(0, {members} - 1) AS j
+    WHERE e.id >= :first_expense
+    """,
+    # Every tenth expense is itemized
+    """
+    INSERT INTO expense_items (expense_id, group_id, description, amount_cents)
+    SELECT e.id, e.group_id, 'Plan check item', e.amount_cents / 2
+    FROM expenses e, generate_series(1, 2)
+    WHERE e.id >= :first_expense AND e.id % 10 = 0
+    """,
+    # Archived copies of the soft-deleted ones
+    """
+    INSERT INTO archived_expenses (
+        id, group_id, payer_user_id, amount_cents, currency_code, occurred_at, deleted_at, data
+    )
+    SELECT id, group_id, payer_user_id, amount_cents, currency_code, occurred_at, deleted_at,
+           jsonb_build_object('expense', to_jsonb(e), 'items', '[]'::jsonb, 'splits', '[]'::jsonb)
+    FROM expenses e WHERE id >= :first_expense AND deleted_at IS NOT NULL
+    """,
+    """
+    INSERT INTO settlements (
+        group_id, from_user_id, to_user_id, amount_cents, currency_code, created_by_user_id, created_at
+    )
+    SELECT :first_group + i, :first_user + i * {members} + 1, :first_user + i * {members},
+           100 + s, 'USD', :first_user + i * {members} + 1, now() - s * interval '1 day'
+    FROM generate_series(0, :groups - 1) AS i, generate_series(1, greatest(:per_group / 10, 1)) AS s
+    """,
+    """
+    INSERT INTO activity_events (group_id, user_id, type, created_at)
+    SELECT group_id, payer_user_id, 'EXPENSE_CREATED', occurred_at
+    FROM expenses WHERE id >= :first_expense
+    """,
+    """
+    INSERT INTO group_balances (group_id, currency_code, user_id, balance_cents)
+    SELECT group_id, 'USD', user_id, 0 FROM group_members WHERE group_id >= :first_group
+    """,
+    # A year of monthly checkpoints per group
+    """
+    INSERT INTO balance_checkpoints (group_id, period_start, currency_code, user_id, balance_cents)
+    SELECT m.group_id, date_trunc('month', now()) - month * interval '1 month', 'USD', m.user_id, 0
+    FROM group_members m, generate_series(0, 11) AS month
+    WHERE m.group_id >= :first_group
+    """,
+]
+
+
+def seed(db, groups, per_group):
+    """Insert the synthetic dataset and refresh planner statistics."""
+    params = {"groups": groups, "per_group": per_group}
+    statements = [sql.format(members=MEMBERS_PER_GROUP) for sql in SEED_SQL]
+
+    params["first_user"] = db.execute(text(statements[0]), params).scalar()
+    params["first_group"] = db.execute(text(statements[1]), params).scalar()
+    db.execute(text(statements[2]), params)
+    params["first_expense"] = db.execute(text(statements[3]), params).scalar()
+    for sql in statements[4:]:
+        db.execute(text(sql), params)
+
+    for table in sorted(HOT_TABLES):
+        db.execute(text(f"ANALYZE {table}"))
+    return params
+
+
+def hot_queries(db, group_id, user_id):
+    """(name, callable) pairs for the repository calls on request hot paths."""
+    expense_repo = ExpenseRepository(db)
+    activity_repo = ActivityRepository(db)
+    balance_repo = BalanceRepository(db)
+    group_repo = GroupRepository(db)
+    settlement_repo = SettlementRepository(db)
+
+    first_expenses = expense_repo.get_group_expenses(group_id, 50)
+    first_events = activity_repo.get_group_activity(group_id, 50)
+    expense_cursor = (first_expenses[-1].occurred_at, first_expenses[-1].id)
+    event_cursor = (first_events[-1].created_at, first_events[-1].id)
+    expense_id = first_expenses[0].id
+    now = datetime.now(timezone.utc)
+
+    return [
+        ("ExpenseRepository.get_group_expenses", lambda: expense_repo.get_group_expenses(group_id, 51)),
+        ("ExpenseRepository.get_group_expenses (next page)",
+         lambda: expense_repo.get_group_expenses(group_id, 51, expense_cursor)),
+        ("ExpenseRepository.get_by_id", lambda: expense_repo.get_by_id(expense_id)),
+        ("ActivityRepository.get_group_activity", lambda: activity_repo.get_group_activity(group_id, 51)),
+        ("ActivityRepository.get_group_activity (next page)",
+         lambda: activity_repo.get_group_activity(group_id, 51, event_cursor)),
+        ("SettlementRepository.get_group_settlements", lambda: settlement_repo.get_group_settlements(group_id)),
+        ("GroupRepository.get_by_id", lambda: group_repo.get_by_id(group_id)),
+        ("GroupRepository.get_user_groups", lambda: group_repo.get_user_groups(user_id)),
+        ("GroupRepository.is_member", lambda: group_repo.is_member(group_id, user_id)),
+        ("GroupRepository.get_member_ids", lambda: group_repo.get_member_ids(group_id)),
+        ("BalanceRepository.get_group_balances", lambda: balance_repo.get_group_balances(group_id)),
+        ("BalanceRepository.get_user_balances", lambda: balance_repo.get_user_balances(user_id)),
+        ("BalanceRepository.compute_group_balances", lambda: balance_repo.compute_group_balances(group_id)),
+        ("BalanceRepository.compute_group_balances (window)",
+         lambda: balance_repo.compute_group_balances(group_id, since=now - timedelta(days=2), until=now)),
+        ("BalanceRepository.get_latest_checkpoint", lambda: balance_repo.get_latest_checkpoint(group_id, now)),
+        ("ExpenseRepository.get_changed_expenses",
+         lambda: expense_repo.get_changed_expenses(group_id, now - timedelta(days=1))),
+        ("SettlementRepository.get_created_since",
+         lambda: settlement_repo.get_created_since(group_id, now - timedelta(days=1))),
+        ("ActivityRepository.get_events_after",
+         lambda: activity_repo.get_events_after([group_id], event_cursor[1], 1001)),
+        ("ActivityRepository.get_max_id", activity_repo.get_max_id),
+        ("GroupRepository.get_user_group_versions", lambda: group_repo.get_user_group_versions(user_id)),
+    ]
+
+
+def plan_nodes(plan):
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan tree."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def partitions_of(connection):
+    """Map each table partition to its partitioned parent; also return the empty partitions."""
+    rows = connection.exec_driver_sql(
+        "SELECT c.relname, p.relname, c.reltuples = 0 FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relkind = 'p'"
+    ).all()
+    return {child: parent for child, parent, _ in rows}, {child for child, _, empty in rows if empty}
+
+
+def check_query_plans(groups=5000, per_group=40, verbose=False):
+    """Seed, EXPLAIN every hot query, roll back; returns the number of failing queries."""
+    engine = create_engine(settings.DATABASE_URL)
+    db = sessionmaker(bind=engine)()
+    try:
+        started = time.perf_counter()
+        params = seed(db, groups, per_group)
+        print(
+            f"Seeded {groups} groups x {per_group} expenses in {time.perf_counter() - started:.1f}s"
+        )
+
+        # Check a group in the middle of the seeded range
+        group_id = params["first_group"] + groups // 2
+        user_id = params["first_user"] + (groups // 2) * MEMBERS_PER_GROUP
+        queries = hot_queries(db, group_id, user_id)
+
+        captured = []
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        failures = 0
+        connection = db.connection()
+        parents, empty_partitions = partitions_of(connection)
+        partition_counts = Counter(parents.values())
+        for name, run in queries:
+            captured.clear()
+            event.listen(engine, "before_cursor_execute", capture)
+            try:
+                run()
+            finally:
+                event.remove(engine, "before_cursor_execute", capture)
+
+            seq_scans = set()
+            scans = []
+            partitions = defaultdict(set)
+            for statement, parameters in captured:
+                plan = connection.exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + statement, parameters
+                ).scalar()[0]["Plan"]
+                for node in plan_nodes(plan):
+                    relation = node.get("Relation Name")
+                    if not relation:
+                        continue
+                    scans.append(f"{node['Node Type']} on {relation} {node.get('Index Name', '')}".rstrip())
+                    table = parents.get(relation, relation)
+                    if table != relation:
+                        partitions[table].add(relation)
+                    # Scanning an empty partition (a future month) sequentially is the right plan
+                    if node["Node Type"] == "Seq Scan" and table in HOT_TABLES and relation not in empty_partitions:
+                        seq_scans.add(table)
+
+            pruning = ", ".join(
+                f"{table} {len(names)}/{partition_counts[table]}" for table, names in sorted(partitions.items())
+            )
+            pruning = f" [partitions: {pruning}]" if pruning else ""
+            if seq_scans:
+                failures += 1
+                print(f"FAIL {name}: sequential scan on {', '.join(sorted(seq_scans))}{pruning}")
+            else:
+                print(f"ok   {name}{pruning}")
+            if verbose or seq_scans:
+                for scan in scans:
+                    print(f"       {scan}")
+
+        print(f"{len(queries) - failures}/{len(queries)} hot queries use indexes.")
+        return failures
+    finally:
+        # Never keep the synthetic data
+        db.rollback()
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=5000)
+    parser.add_argument("--expenses-per-group", type=int, default=40)
+    parser.add_argument("--verbose", action="store_true", help="Print every scan, not just failures")
+    args = parser.parse_args()
+    sys.exit(1 if check_query_plans(args.groups, args.expenses_per_group, args.verbose) else 0)
@@ -0,0 +1,71 @@
+"""
+Import exchange rates from a local CSV file.
+
+Usage: python scripts/import_fx_rates.py RATES_FILE
+
+The file needs a header row with base,quote,rate,date columns, e.g.
+    base,quote,rate,date
+    EUR,USD,1.0842,2026-10-16
+meaning 1 EUR = 1.0842 USD on that date. Re-importing a pair and date
+overwrites its rate. Running API processes pick up new rates once their
+FX_RATE_CACHE_TTL_SECONDS cache expires.
+"""
+import csv
+import sys
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.infrastructure.repositories.fx_rate_repository import FxRateRepository
+
+# Create engine and session
+engine = create_engine(settings.DATABASE_URL)
+SessionLocal = sessionmaker(bind=engine)
+
+
+def read_rates(path):
+    """Parse and validate (base, quote, date, rate) rows from a CSV rates file."""
+    rates = []
+    with open(path, newline="") as f:
+        for line_number, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                rate = Decimal(row["rate"])
+                if rate <= 0:
+                    raise ValueError("rate must be positive")
+                rates.append((
+                    row["base"].strip().upper(),
+                    row["quote"].strip().upper(),
+                    date.fromisoformat(row["date"].strip()),
+                    rate,
+                ))
+            except (KeyError, ValueError, InvalidOperation) as e:
+                raise ValueError(f"{path}:{line_number}: invalid rate row {row}: {e}")
+    return rates
+
+
+def import_fx_rates(path):
+    """Upsert every rate in the file."""
+    db = SessionLocal()
+    try:
+        count = FxRateRepository(db).upsert_rates(read_rates(path))
+        db.commit()
+        print(f"Imported {count} FX rates.")
+    except Exception as e:
+        db.rollback()
+        print(f"Error importing FX rates: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(2)
+    import_fx_rates(sys.argv[1])
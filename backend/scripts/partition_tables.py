@@ -0,0 +1,99 @@
+"""
+Convert an existing database to partitioned storage, and keep the monthly
+activity partitions ahead of time.
+
+Usage: python scripts/partition_tables.py convert [--partitions N] [--dry-run]
+       python scripts/partition_tables.py extend [--months-ahead N]
+
+`convert` rebuilds expenses and expense_splits hash-partitioned by group_id
+(N partitions, default 16) in one transaction, then activity_events
+range-partitioned by month in a second one. Each copy holds an exclusive lock
+on its tables, so run it in a maintenance window; tables that are already
+partitioned are skipped, and `alembic upgrade head` afterwards only records
+revision 008. Row counts are checked before each commit. With --dry-run every
+step runs and is timed, then rolled back.
+
+`extend` creates the monthly activity_events partitions through N months from
+now (default 3), moving any rows the default partition already holds for them.
+Run it monthly, e.g. from cron.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.infrastructure.db import partitioning
+
+# Create engine
+engine = create_engine(settings.DATABASE_URL)
+
+
+def _row_counts(conn, tables):
+    return {table: conn.execute(text(f"SELECT count(*) FROM {table}")).scalar() for table in tables}
+
+
+def _convert_step(convert, tables, dry_run, **kwargs):
+    """Run one conversion in its own transaction, verifying row counts before commit."""
+    with engine.connect() as conn:
+        with conn.begin() as transaction:
+            # A long copy must not trip a server-side statement timeout
+            conn.execute(text("SET LOCAL statement_timeout = 0"))
+            before = _row_counts(conn, tables)
+            started = time.perf_counter()
+            if not convert(conn, log=lambda message: print(f"  {message}"), **kwargs):
+                print(f"{', '.join(tables)}: already partitioned, skipped")
+                return
+            after = _row_counts(conn, tables)
+            if after != before:
+                raise RuntimeError(f"Row counts changed during conversion: {before} -> {after}")
+
+            for table in tables:
+                conn.execute(text(f"ANALYZE {table}"))
+            elapsed = time.perf_counter() - started
+            if dry_run:
+                transaction.rollback()
+                print(f"{', '.join(tables)}: converted in {elapsed:.1f}s, rolled back (dry run)")
+            else:
+                print(f"{', '.join(tables)}: converted in {elapsed:.1f}s")
+
+
+def convert(partitions, dry_run=False):
+    """Partition the expense tables, then activity events."""
+    _convert_step(
+        partitioning.partition_expense_tables, ["expenses", "expense_splits", "expense_items"], dry_run,
+        modulus=partitions,
+    )
+    _convert_step(partitioning.partition_activity_events, ["activity_events"], dry_run)
+
+
+def extend(months_ahead):
+    """Create the upcoming monthly activity partitions."""
+    with engine.begin() as conn:
+        if not partitioning.is_partitioned(conn, "activity_events"):
+            print("activity_events is not partitioned; run `convert` first")
+            return
+        created = partitioning.ensure_activity_partitions(
+            conn, months_ahead=months_ahead, log=lambda message: print(f"  {message}")
+        )
+    print(f"Created {len(created)} partitions{': ' + ', '.join(created) if created else ''}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert_parser = commands.add_parser("convert", help="Convert unpartitioned tables")
+    convert_parser.add_argument("--partitions", type=int, default=partitioning.EXPENSE_HASH_PARTITIONS)
+    convert_parser.add_argument("--dry-run", action="store_true", help="Time the conversion, then roll back")
+    extend_parser = commands.add_parser("extend", help="Create upcoming monthly activity partitions")
+    extend_parser.add_argument("--months-ahead", type=int, default=partitioning.ACTIVITY_MONTHS_AHEAD)
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        convert(args.partitions, args.dry_run)
+    else:
+        extend(args.months_ahead)
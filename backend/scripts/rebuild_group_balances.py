@@ -0,0 +1,100 @@
+"""
+Rebuild the group balance ledger from expense and settlement history.
+
+Usage:
+    python scripts/rebuild_group_balances.py [GROUP_ID ...]
+    python scripts/rebuild_group_balances.py --verify [GROUP_ID ...]
+
+Processes every group when no ids are given. With --verify nothing is written;
+the ledger, the SQL aggregate and the pure-Python domain replay are compared
+and any group where they disagree is reported.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, selectinload
+
+from app.core.config import settings
+from app.domain.balance_service import BalanceService
+from app.infrastructure.db.models import Expense, Group
+from app.infrastructure.repositories.archive_repository import ArchiveRepository
+from app.infrastructure.repositories.balance_repository import BalanceRepository
+from app.infrastructure.repositories.group_repository import GroupRepository
+from app.infrastructure.repositories.settlement_repository import SettlementRepository
+
+# Create engine and session
+engine = create_engine(settings.DATABASE_URL)
+SessionLocal = sessionmaker(bind=engine)
+
+
+def _non_zero(balances):
+    """Drop zero entries so ledgers with and without settled-up rows compare equal."""
+    return {
+        currency: {user_id: cents for user_id, cents in user_balances.items() if cents}
+        for currency, user_balances in balances.items()
+        if any(user_balances.values())
+    }
+
+
+def _replay_group_balances(db, group_id):
+    """Recompute balances with the domain service over fully loaded history, archive included."""
+    expenses = (
+        db.query(Expense)
+        .options(selectinload(Expense.splits))
+        .filter(Expense.group_id == group_id, Expense.deleted_at.is_(None))
+        .all()
+    )
+    # The domain service skips the deleted ones
+    expenses += ArchiveRepository(db).get_group_expenses(group_id)
+    settlements = SettlementRepository(db).get_group_settlements(group_id)
+    return BalanceService.calculate_group_balances(expenses, settlements)
+
+
+def rebuild_group_balances(group_ids=None, verify=False):
+    """Recompute ledger rows for the given groups, or only check them when verify is set."""
+    db = SessionLocal()
+    try:
+        if not group_ids:
+            group_ids = [group_id for (group_id,) in db.query(Group.id).order_by(Group.id)]
+
+        balance_repo = BalanceRepository(db)
+        group_repo = GroupRepository(db)
+        mismatches = 0
+        for group_id in group_ids:
+            aggregated = balance_repo.compute_group_balances(group_id)
+            if not verify:
+                group_repo.bump_version(group_id)
+                balance_repo.replace_group_balances(group_id, aggregated)
+                db.commit()
+                continue
+
+            ledger = _non_zero(balance_repo.get_group_balances(group_id))
+            replayed = _non_zero(_replay_group_balances(db, group_id))
+            if not (ledger == _non_zero(aggregated) == replayed):
+                mismatches += 1
+                print(f"Group {group_id}: ledger={ledger} aggregate={_non_zero(aggregated)} replay={replayed}")
+            db.expunge_all()
+
+        if verify:
+            print(f"Verified {len(group_ids)} groups, {mismatches} mismatched.")
+            return mismatches
+        print(f"Rebuilt balances for {len(group_ids)} groups.")
+        return 0
+    except Exception as e:
+        db.rollback()
+        print(f"Error rebuilding balances: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("group_ids", nargs="*", type=int)
+    parser.add_argument("--verify", action="store_true", help="compare without writing")
+    args = parser.parse_args()
+    sys.exit(1 if rebuild_group_balances(args.group_ids, verify=args.verify) else 0)
@@ -0,0 +1,86 @@
+"""
+Nightly reconciliation: recompute every group's balances in bulk and compare
+them against the group_balances ledger.
+
+Usage: python scripts/reconcile_balances.py [--workers N] [--chunk-size ROWS]
+
+Groups are sharded by group_id across a process pool. Each worker streams its
+shard's raw deltas from the database into a BulkBalanceEngine, subtracts the
+ledger rows, and reports every key that does not net to zero. Both are read in
+one REPEATABLE READ transaction, so writes committed meanwhile cannot show up
+in one and not the other as false drift. Exits non-zero
+when mismatches are found; repair them with scripts/rebuild_group_balances.py.
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.domain.bulk_balance_engine import BulkBalanceEngine
+from app.infrastructure.repositories.balance_repository import BalanceRepository
+
+
+def reconcile_shard(shard, shard_count, chunk_size):
+    """Recompute one shard and return (rows_processed, seconds, mismatches)."""
+    started = time.perf_counter()
+    # Each worker process opens its own connection pool. Deltas and ledger are
+    # read in one transaction from the same snapshot
+    engine = create_engine(settings.DATABASE_URL, isolation_level="REPEATABLE READ")
+    db = sessionmaker(bind=engine)()
+    try:
+        balance_repo = BalanceRepository(db)
+        bulk = BulkBalanceEngine()
+
+        for chunk in balance_repo.stream_balance_deltas(shard, shard_count, chunk_size):
+            bulk.add_rows(chunk)
+        rows_processed = bulk.rows_processed
+
+        # Subtracting the ledger leaves only the keys where it disagrees with history
+        for chunk in balance_repo.stream_ledger_rows(shard, shard_count, chunk_size):
+            bulk.add_rows((g, c, u, -cents) for g, c, u, cents in chunk)
+
+        return rows_processed, time.perf_counter() - started, bulk.nonzero_balances()
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def reconcile_balances(workers=4, chunk_size=100_000):
+    """Reconcile all groups across `workers` shards; returns the number of mismatched keys."""
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(reconcile_shard, shard, workers, chunk_size) for shard in range(workers)
+        ]
+        results = [future.result() for future in futures]
+
+    total_rows = sum(rows for rows, _, _ in results)
+    mismatches = sorted(m for _, _, shard_mismatches in results for m in shard_mismatches)
+    for group_id, currency, user_id, drift in mismatches:
+        print(f"Group {group_id} {currency} user {user_id}: history - ledger = {drift}")
+
+    elapsed = time.perf_counter() - started
+    groups = sorted({group_id for group_id, _, _, _ in mismatches})
+    print(
+        f"Reconciled {total_rows} delta rows in {elapsed:.1f}s "
+        f"({total_rows / max(elapsed, 1e-9):,.0f} rows/s) with {workers} workers; "
+        f"{len(mismatches)} mismatched balances in {len(groups)} groups."
+    )
+    if groups:
+        print("Repair with: python scripts/rebuild_group_balances.py " + " ".join(map(str, groups)))
+    return len(mismatches)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+    sys.exit(1 if reconcile_balances(args.workers, args.chunk_size) else 0)
@@ -0,0 +1,46 @@
+"""
+Deliver activity events from the outbox outside the API processes.
+
+Usage: python scripts/run_outbox_worker.py [--batch-size N] [--once]
+
+Runs the same worker the API starts in each process when OUTBOX_WORKER_ENABLED
+is true; set it to false to deliver only from here. Several workers can run at
+once: each batch is claimed with SKIP LOCKED. With --once, the outbox is drained
+and the script exits, e.g. before a downgrade or after an outage. Otherwise it
+delivers until interrupted and prints its lag counters every minute.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.application.outbox_worker import OutboxWorker
+from app.core.config import settings
+
+
+def main(batch_size, once=False):
+    worker = OutboxWorker(batch_size=batch_size)
+    if once:
+        print(f"Delivered {worker.drain()} events.")
+        return
+
+    worker.start()
+    try:
+        while True:
+            time.sleep(60)
+            print(worker.stats.snapshot(), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    parser.add_argument("--once", action="store_true", help="Drain the outbox, then exit")
+    args = parser.parse_args()
+
+    main(args.batch_size, args.once)
@@ -29,7 +29,7 @@ class _ActivityListScreenState extends ConsumerState<ActivityListScreen> {
       final response = await apiClient.get('/groups/${widget.groupId}/activity');
       if (response.statusCode == 200) {
         setState(() {
-          _activities = response.data;
+          _activities = response.data['items'];
           _isLoading = false;
         });
       }